@@ -0,0 +1,259 @@
+import io
+import os
+import math
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import contextlib
+import statistics
+import subprocess
+
+from pyMDA.parts.core import QUALITIES, quality, component_cache
+from pyMDA.parts import Assembly, Cube, BezierCurve, CamProfile, SpeakerGrill
+from pyMDA.test import (build_geometry, build_curved, build_pts, build_plates, build_holes, build_gears,
+                        build_features, build_enclosures, build_stock_materials, build_stock_magnets,
+                        build_stock_motors, build_stock_bearings, build_stock_fixtures,
+                        build_stock_electronics, build_stock_robots)
+
+#
+# Benchmarks
+#
+# Times the build_* demos (building and assembling each demo assembly) and
+# the core assembly operations. Each run is cold: the component cache is
+# cleared and the setup (building the inputs) isn't timed. Results are
+# appended to a JSON history and compared against a baseline taken at the
+# same --quality, any benchmark more than --threshold slower than the baseline
+# median is reported as a regression and makes the run fail, as do pyMDA's
+# own modules taking more than --import-budget to import.
+#
+#   python -m pyMDA.benchmark                   # run all, compare with the baseline
+#   python -m pyMDA.benchmark --save-baseline   # run all, store as the new baseline
+#   python -m pyMDA.benchmark -k stack          # only benchmarks matching 'stack'
+#
+
+BUILDS = [build_geometry, build_curved, build_pts, build_plates, build_holes, build_gears,
+          build_features, build_enclosures, build_stock_materials, build_stock_magnets,
+          build_stock_motors, build_stock_bearings, build_stock_fixtures,
+          build_stock_electronics, build_stock_robots]
+
+BENCHMARKS = []
+
+def benchmark(name, setup = None):
+    """Register func as a benchmark, setup() returns its arguments and isn't timed."""
+    def register(func):
+        BENCHMARKS.append((name, func, setup))
+        return func
+    return register
+
+def _quiet(func, *args):
+    # the demos print as they build
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+_config = None
+
+def demo_config():
+    """The config of all the demos, as some build_* functions use entries set by earlier ones."""
+    global _config
+    if _config is None:
+        _config = {}
+        for build in BUILDS:
+            _quiet(build, _config)
+    return dict(_config)
+
+def _build_and_assemble(build):
+    def run(config):
+        _quiet(build, config).assemble()
+    return run
+
+for _build in BUILDS:
+    benchmark(_build.__name__, setup = lambda: (demo_config(),)) (_build_and_assemble(_build))
+
+def _demo_assembly():
+    return _quiet(build_features, demo_config())
+
+@benchmark("assemble", setup = lambda: (_demo_assembly(),))
+def bench_assemble(assembly):
+    assembly.assemble()
+
+@benchmark("export_scad", setup = lambda: (_demo_assembly(), tempfile.mkdtemp()))
+def bench_export_scad(assembly, out_dir):
+    _quiet(assembly.export_scad, os.path.join(out_dir, "benchmark.scad"))
+
+def synthetic_assembly(count):
+    """count cubes of assorted sizes, unplaced."""
+    assembly = Assembly()
+    for i in range(count):
+        assembly.add('cube_%d' % i, Cube(1 + i % 7, 1 + i % 5, 1 + i % 3))
+    return assembly
+
+for _count in (1000, 10000):
+    benchmark("stack_x_%d" % _count, setup = lambda count = _count: (synthetic_assembly(count),)) (
+        lambda assembly: assembly.stack_x(1.0))
+
+@benchmark("BezierCurve.create")
+def bench_bezier_curve():
+    BezierCurve(None, (0, 0, 0), (0, 0, 100), (0, 100, 0), (100, 100, 100)).create()
+
+@benchmark("CamProfile.create")
+def bench_cam_profile():
+    CamProfile({
+        "height": 20,
+        "start_radius": 5.0,
+        "start_angle": math.radians(180.0),
+        "end_radius": 5.5,
+        "end_angle": math.radians(360.0),
+        "is_center": True
+    }).create()
+
+@benchmark("SpeakerGrill.create")
+def bench_speaker_grill():
+    SpeakerGrill({'dia': 50, 'pitch': 5, 'hole_dia': 3, 'wall_thickness': 2}).create()
+
+#
+# Import time, measured in a fresh interpreter as CI runs one per export job.
+# The totals are dominated by SolidPython and vary by tens of ms between
+# runs, so the budget is on the self time of pyMDA's own modules as
+# reported by -X importtime (about 3 ms on the machine the default was set
+# on, 13 ms when core still imported hashlib, json and subprocess).
+#
+
+IMPORT_STATEMENT = "import pyMDA.parts; pyMDA.parts.Cube"
+SOLID_IMPORT_STATEMENT = "import solid, solid.utils"
+
+def import_time(statement = IMPORT_STATEMENT):
+    """Seconds a new interpreter takes to run statement, interpreter startup excluded."""
+    code = "import time; t = time.perf_counter(); %s; print(time.perf_counter() - t)" % statement
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+    out = subprocess.run([sys.executable, "-c", code], capture_output = True, text = True, check = True, env = env)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def own_import_time(statement = IMPORT_STATEMENT, repeat = 5):
+    """Median over repeat new interpreters of the seconds spent in pyMDA's own modules running statement."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+    # without bytecode every run would time compiling the modules
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    times = []
+    for i in range(repeat + 1):
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                             capture_output = True, text = True, check = True, env = env)
+        # lines are "import time: self [us] | cumulative | name"
+        own = sum(int(line.split("|")[0].split(":")[1]) for line in out.stderr.splitlines()
+                  if line.startswith("import time:") and line.split("|")[-1].strip().startswith("pyMDA"))
+        if i:
+            times.append(own / 1e6)
+    return statistics.median(times)
+
+benchmark("import") (lambda: import_time())
+benchmark("import_solid") (lambda: import_time(SOLID_IMPORT_STATEMENT))
+benchmark("import_own") (lambda: own_import_time(repeat = 1))
+
+def run_benchmark(func, setup = None, repeat = 5):
+    """Seconds taken by each of repeat cold calls of func, or the seconds func returns if it times itself."""
+    times = []
+    for _ in range(repeat):
+        component_cache.clear()
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        elapsed = func(*args)
+        times.append(time.perf_counter() - start if elapsed is None else elapsed)
+    return times
+
+def run_all(pattern = None, repeat = 5):
+    results = {}
+    for name, func, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        times = run_benchmark(func, setup, repeat)
+        results[name] = {"min": min(times), "median": statistics.median(times), "runs": len(times)}
+        print("%-28s %10.4f %10.4f" % (name, results[name]["min"], results[name]["median"]))
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True,
+                              cwd = os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def load_json(filename, default):
+    if not os.path.exists(filename):
+        return default
+    with open(filename) as f:
+        return json.load(f)
+
+def save_json(filename, data):
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok = True)
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent = 2)
+
+def compare(results, baseline, threshold):
+    """(name, baseline median, median) of the benchmarks more than threshold slower than the baseline."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base and r["median"] > base["median"] * (1.0 + threshold):
+            regressions.append((name, base["median"], r["median"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pyMDA demos and assembly operations")
+    parser.add_argument('-k', dest='pattern', help='Only run the benchmarks whose name contains PATTERN')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per benchmark')
+    parser.add_argument('--quality', choices=sorted(QUALITIES), default='preview', help='Render quality profile')
+    parser.add_argument('--history', default='.benchmarks/history.json', help='JSON file the results are appended to')
+    parser.add_argument('--baseline', default='.benchmarks/baseline.json', help='JSON file of the results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--import-budget', type=float, default=0.015, metavar='SECONDS', help="Fail if pyMDA's own modules take longer to import (median self time)")
+    parser.add_argument('--threshold', type=float, default=0.2, help='Slowdown over the baseline reported as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print("%-28s %10s %10s" % ("benchmark", "min", "median"))
+    with quality(args.quality):
+        results = run_all(args.pattern, args.repeat)
+
+    run = {
+        "date": datetime.datetime.now().isoformat(timespec = "seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "quality": args.quality,
+        "repeat": args.repeat,
+        "results": results
+    }
+    history = load_json(args.history, [])
+    history.append(run)
+    save_json(args.history, history)
+
+    failed = False
+    if "import_own" in results:
+        own = results["import_own"]["median"]
+        if own > args.import_budget:
+            print(f"Import time of pyMDA's modules {own:.3f}s, above the budget of {args.import_budget:.3f}s")
+            failed = True
+
+    if args.save_baseline:
+        save_json(args.baseline, run)
+        print(f"Baseline written to {args.baseline}")
+        return 1 if failed else 0
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return 1 if failed else 0
+    if baseline.get("quality") != args.quality:
+        print(f"Baseline at {args.baseline} was taken at quality {baseline.get('quality')!r}, not {args.quality!r}, not comparing")
+        return 1 if failed else 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f"Regression: {name} {before:.4f}s -> {after:.4f}s ({after / before - 1.0:+.0%})")
+    print(f"{len(regressions)} regressions against {baseline.get('commit') or args.baseline}")
+    return 1 if failed or regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import importlib
+
+#
+# Parts registry
+#
+# Every part class by name, with the module defining it. The modules are
+# only imported when one of their parts is first used, so
+#
+#   from pyMDA.parts import Cube
+#
+# loads core and geometry but not the gears library or the stock parts.
+# Only Component subclasses are listed, not the unported stubs left in
+# some modules (e.g. button_tact in stock_electronics).
+#
+
+PARTS = {
+    # core
+    'Component': 'core',
+    'Assembly': 'core',
+
+    'BezierCurve': 'bezier_curve',
+    'CamProfile': 'cam_profile',
+    'Collar': 'collar',
+    'ScotchYoke': 'scotch_yoke',
+
+    'CubeCurvedSides': 'curved',
+    'CubeCurvedEdges': 'curved',
+    'BarCurvedEdges': 'curved',
+    'CylinderCurvedEdges': 'curved',
+    'LineRoundViaHull': 'curved',
+    'PolylineRound': 'curved',
+
+    'Boss': 'enclosures',
+    'BossPlate': 'enclosures',
+    'BossPlateDual': 'enclosures',
+    'RubberButton': 'enclosures',
+    'LightpipeStraight': 'enclosures',
+
+    'GearSpur': 'gears',
+    'GearHerringbone': 'gears',
+
+    'Cube': 'geometry',
+    'Cylinder': 'geometry',
+    'Sphere': 'geometry',
+    'Pyramid': 'geometry',
+    'Cone': 'geometry',
+    'Tetrahedron': 'geometry',
+    'Torus': 'geometry',
+    'TriangularPrism': 'geometry',
+    'HexagonalPrism': 'geometry',
+
+    'Slot': 'holes',
+    'SlotCurve': 'holes',
+    'SlotArray': 'holes',
+    'SpeakerGrill': 'holes',
+    'Funnel': 'holes',
+
+    'PlateWithMountingHoles': 'plates',
+    'PlateWithMountingHolesEdges': 'plates',
+    'PlateWithFillets': 'plates',
+    'PlummerBlock': 'plates',
+    'Pulley': 'plates',
+
+    'Bearing': 'stock_bearings',
+    'BearingPillowBlockUCP201': 'stock_bearings',
+    'BearingPillowBlockUCP204': 'stock_bearings',
+    'Bearing2BoltFlangeUCFL204': 'stock_bearings',
+
+    'PCBHeader': 'stock_electronics',
+    'PCBHeaderDual': 'stock_electronics',
+    'POTSide': 'stock_electronics',
+    'FuseMini': 'stock_electronics',
+    'FuseHolderMini': 'stock_electronics',
+    'FuseMiniAndHolder': 'stock_electronics',
+    'RPI': 'stock_electronics',
+    'RPIDisplay': 'stock_electronics',
+    'NVidiaJetsonNano': 'stock_electronics',
+    'PCBCamera': 'stock_electronics',
+    'LED': 'stock_electronics',
+
+    'FixtureCounterSunk': 'stock_fixtures',
+    'FixtureSocket': 'stock_fixtures',
+    'Washer': 'stock_fixtures',
+
+    'MagnetCoin': 'stock_magnets',
+
+    'SHS': 'stock_materials',
+    'CS': 'stock_materials',
+    'LS': 'stock_materials',
+    'SB': 'stock_materials',
+    'Rod': 'stock_materials',
+    'Tube': 'stock_materials',
+    'Sheet': 'stock_materials',
+    'Wedge': 'stock_materials',
+    'Hinge': 'stock_materials',
+    'Door': 'stock_materials',
+
+    'ShaftKey': 'stock_motors',
+    'MotorDC': 'stock_motors',
+    'GearboxWorm': 'stock_motors',
+    'MotorDCwGearboxWorm': 'stock_motors',
+    'ServoRDS3225': 'stock_motors',
+    'StepperDriver': 'stock_motors',
+    'Stepper': 'stock_motors',
+    'TeethedPulley': 'stock_motors',
+    'StepperAndTeethedPulley': 'stock_motors',
+    'LinearActuatorPA14P': 'stock_motors',
+    'LinearActuatorMountingBracketBRK14': 'stock_motors',
+    'LinearActuatorMountingBracketBRK03': 'stock_motors',
+    'LinearActuatorPA12T': 'stock_motors',
+    'LinearActuatorAndBracket': 'stock_motors',
+
+    'RobotCartesianGantryThreeAxis': 'stock_robots',
+}
+
+__all__ = list(PARTS)
+
+def part_module(name):
+    """The module defining the part name, imported if it wasn't yet."""
+    if name not in PARTS:
+        raise KeyError("Unknown part '%s'" % name)
+    return importlib.import_module("." + PARTS[name], __name__)
+
+def __getattr__(name):
+    if name not in PARTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(part_module(name), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(PARTS))
@@ -9,15 +9,19 @@ class BezierCurve:
 
     def __init__(self, t_step, p0, p1, p2, p3):
         super().__init__()
-        self.t_step = t_step
+        self.t_step = t_step # None to follow the quality profile
         self.p0 = p0
         self.p1 = p1
         self.p2 = p2
         self.p3 = p3
         
+    def get_t_step(self):
+        return self.t_step or get_quality().bezier_step
+
     def create(self):
         pts = []
-        for t in np.arange(0, self.t_step + 1, self.t_step):
+        t_step = self.get_t_step()
+        for t in np.arange(0, t_step + 1, t_step):
             pts.append(self.point(t, self.p0, self.p1, self.p2, self.p3))
         return pts
 
@@ -26,7 +30,8 @@ class BezierCurve:
         p += color(Red) (translate(self.p1) (sphere(r = 10)))
         p += color(Red) (translate(self.p2) (sphere(r = 10)))
         p += color(Red) (translate(self.p3) (sphere(r = 10)))
-        for t in np.arange(0, self.t_step + 1, self.t_step):
+        t_step = self.get_t_step()
+        for t in np.arange(0, t_step + 1, t_step):
             p += self.point_debug(t, self.p0, self.p1, self.p2, self.p3)
         return p
             
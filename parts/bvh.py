@@ -0,0 +1,155 @@
+import numpy as np
+
+#
+# Bounding volume hierarchy over axis aligned boxes
+#
+# Nodes live in flat NumPy arrays. Leaves hold up to leaf_size items, stored
+# as a contiguous range of self.order. Moving items only refits the boxes
+# of their leaf and its ancestors, the tree itself is rebuilt by the owner
+# when items are added or removed, or after many refits.
+#
+
+class BVH:
+
+    def __init__(self, mins, maxs, leaf_size = 8):
+        self.leaf_size = leaf_size
+        self.item_min = np.array(mins, dtype = float).reshape(-1, 3)
+        self.item_max = np.array(maxs, dtype = float).reshape(-1, 3)
+        self.refit_count = 0
+        self._build()
+
+    def __len__(self):
+        return len(self.item_min)
+
+    def _build(self):
+        n = len(self.item_min)
+        self.order = np.arange(n)
+        centers = (self.item_min + self.item_max) / 2.0
+
+        node_min, node_max, left, right, start, count, parent = [], [], [], [], [], [], []
+        self.leaf_of = np.zeros(n, dtype = int)
+
+        def new_node(lo, hi, p):
+            node_min.append(self.item_min[self.order[lo:hi]].min(axis = 0) if hi > lo else np.zeros(3))
+            node_max.append(self.item_max[self.order[lo:hi]].max(axis = 0) if hi > lo else np.zeros(3))
+            left.append(-1)
+            right.append(-1)
+            start.append(lo)
+            count.append(hi - lo)
+            parent.append(p)
+            return len(node_min) - 1
+
+        stack = [(new_node(0, n, -1), 0, n)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo <= self.leaf_size:
+                self.leaf_of[self.order[lo:hi]] = node
+                continue
+
+            # median split along the longest axis of the item centers
+            idx = self.order[lo:hi]
+            c = centers[idx]
+            axis = int(np.argmax(c.max(axis = 0) - c.min(axis = 0)))
+            mid = (hi - lo) // 2
+            self.order[lo:hi] = idx[np.argpartition(c[:, axis], mid)]
+
+            l = new_node(lo, lo + mid, node)
+            r = new_node(lo + mid, hi, node)
+            left[node] = l
+            right[node] = r
+            count[node] = 0
+            stack.append((l, lo, lo + mid))
+            stack.append((r, lo + mid, hi))
+
+        self.node_min = np.array(node_min).reshape(-1, 3)
+        self.node_max = np.array(node_max).reshape(-1, 3)
+        self.left = np.array(left)
+        self.right = np.array(right)
+        self.start = np.array(start)
+        self.count = np.array(count)
+        self.parent = np.array(parent)
+
+    def refit(self, indices, mins, maxs):
+        """Update the boxes of some items and of the nodes above them."""
+        indices = np.asarray(indices, dtype = int)
+        if len(indices) == 0:
+            return
+        self.item_min[indices] = mins
+        self.item_max[indices] = maxs
+        self.refit_count += len(indices)
+
+        nodes = set(self.leaf_of[indices].tolist())
+        for node in nodes:
+            items = self.order[self.start[node]:self.start[node] + self.count[node]]
+            self.node_min[node] = self.item_min[items].min(axis = 0)
+            self.node_max[node] = self.item_max[items].max(axis = 0)
+
+        # refit parents level by level, each one once
+        nodes = set(self.parent[list(nodes)].tolist()) - {-1}
+        while nodes:
+            nodes_list = list(nodes)
+            l = self.left[nodes_list]
+            r = self.right[nodes_list]
+            self.node_min[nodes_list] = np.minimum(self.node_min[l], self.node_min[r])
+            self.node_max[nodes_list] = np.maximum(self.node_max[l], self.node_max[r])
+            nodes = set(self.parent[nodes_list].tolist()) - {-1}
+
+    def _query(self, node_test, item_test):
+        if len(self) == 0:
+            return []
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not node_test(self.node_min[node], self.node_max[node]):
+                continue
+            if self.left[node] < 0:
+                items = self.order[self.start[node]:self.start[node] + self.count[node]]
+                hit = item_test(self.item_min[items], self.item_max[items])
+                found.extend(items[hit].tolist())
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        return sorted(found)
+
+    def query_box(self, lo, hi):
+        """Indices of the items whose boxes overlap the box (lo, hi)."""
+        lo = np.asarray(lo, dtype = float)
+        hi = np.asarray(hi, dtype = float)
+        return self._query(lambda a, b: np.all(a <= hi) and np.all(b >= lo),
+                           lambda a, b: np.all((a <= hi) & (b >= lo), axis = -1))
+
+    def query_plane(self, normal, offset, thickness = 0.0):
+        """Indices of the items whose boxes touch the plane dot(normal, p) = offset, or a slab of thickness around it."""
+        normal = np.asarray(normal, dtype = float)
+
+        def straddles(a, b):
+            center = (a + b) / 2.0
+            radius = ((b - a) / 2.0) @ np.abs(normal) + thickness / 2.0
+            return np.abs(center @ normal - offset) <= radius
+
+        return self._query(straddles, straddles)
+
+#
+# Sweep and prune - all overlapping pairs among a set of boxes, sorting the
+# boxes along X and only comparing each box with the ones starting before
+# it ends
+#
+
+def overlapping_pairs(mins, maxs, tolerance = 0.0):
+    """Pairs (i, j), i < j, of boxes that overlap (or come within tolerance)."""
+    mins = np.asarray(mins, dtype = float).reshape(-1, 3) - tolerance / 2.0
+    maxs = np.asarray(maxs, dtype = float).reshape(-1, 3) + tolerance / 2.0
+    order = np.argsort(mins[:, 0], kind = 'stable')
+    starts = mins[order, 0]
+    ends = np.searchsorted(starts, maxs[order, 0], side = 'right')
+
+    pairs = []
+    for k, i in enumerate(order.tolist()):
+        candidates = order[k + 1:ends[k]]
+        if len(candidates) == 0:
+            continue
+        hit = np.all((mins[candidates, 1:] <= maxs[i, 1:]) & (maxs[candidates, 1:] >= mins[i, 1:]), axis = 1)
+        for j in candidates[hit].tolist():
+            pairs.append((min(i, j), max(i, j)))
+    return sorted(pairs)
@@ -0,0 +1,166 @@
+import os
+import atexit
+from collections import OrderedDict
+from types import SimpleNamespace
+from solid.solidpython import parse_scad_callables, new_openscad_class_str, _get_version
+
+#
+# On-disk cache
+#
+# Results that are slow to compute from a file (parsed SCAD libraries, and
+# later meshes) are stored under cache_dir(), keyed on a hash of the file
+# contents so an edited file is simply a cache miss. Entries can be deleted
+# at any time, the cache directory can be set with PYMDA_CACHE_DIR.
+#
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def package_path(*parts):
+    """Path of a file shipped with pyMDA, e.g. package_path("cots", "gears", "gears.scad")."""
+    return os.path.join(PACKAGE_DIR, *parts)
+
+def cache_dir(*parts):
+    """Directory of the on-disk cache (or of one of its sections), created if needed."""
+    path = os.path.join(os.environ.get("PYMDA_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "pyMDA"), *parts)
+    os.makedirs(path, exist_ok = True)
+    return path
+
+#
+# In-process caches
+#
+
+class _LRU(OrderedDict):
+
+    def __init__(self, max_size):
+        super().__init__()
+        self.max_size = max_size
+
+    def get(self, key, default = None):
+        if key is None or key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def put(self, key, value):
+        if key is None:
+            return value
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last = False)
+        return value
+
+_file_hashes = None
+# hashes computed since the index was last written
+_new_hashes = {}
+
+def _hash_index_path():
+    return os.path.join(cache_dir(), "hashes.json")
+
+def _load_hash_index():
+    global _file_hashes
+    if _file_hashes is None:
+        _file_hashes = _read_hash_index()
+    return _file_hashes
+
+def _write_json(path, value):
+    # write then rename, so a concurrent build never reads half a file
+    import json
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, 'w') as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+def _read_hash_index():
+    import json
+    try:
+        with open(_hash_index_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def flush_file_hashes():
+    """Add the hashes computed since the last call to the index on disk.
+
+    The index is read again and merged, so processes sharing the cache
+    keep each other's entries.
+    """
+    global _file_hashes
+    if not _new_hashes:
+        return
+    index = _read_hash_index()
+    index.update(_new_hashes)
+    _write_json(_hash_index_path(), index)
+    _new_hashes.clear()
+    _file_hashes = index
+
+atexit.register(flush_file_hashes)
+
+def file_hash(filename):
+    """SHA-256 of a file's contents.
+
+    Hashes are kept in an index on disk by path, size and mtime, so a file
+    is only read again once it changes. New hashes are written to the index
+    by flush_file_hashes(), at the latest when the process exits.
+    """
+    import hashlib
+    index = _load_hash_index()
+    path = os.path.abspath(filename)
+    st = os.stat(path)
+    entry = index.get(path)
+    if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        entry = index[path] = _new_hashes[path] = [st.st_mtime_ns, st.st_size, h.hexdigest()]
+    return entry[2]
+
+def cached_json(section, key, compute):
+    """compute(), or the JSON stored for key by an earlier call."""
+    import json
+    path = os.path.join(cache_dir(section), key + ".json")
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    value = compute()
+    _write_json(path, value)
+    return value
+
+#
+# SCAD libraries
+#
+
+def scad_callables(filename):
+    """Modules and functions of a SCAD file, as parse_scad_callables() returns them, cached on disk."""
+    import hashlib
+    key = hashlib.sha256(("%s:%s" % (file_hash(filename), _get_version())).encode()).hexdigest()
+    return cached_json("scad", key, lambda: parse_scad_callables(filename))
+
+class ScadLibrary:
+    """import_scad() of one SCAD file, parsed on first use instead of when it is created.
+
+    Relative paths are relative to the pyMDA package.
+    """
+
+    def __init__(self, *path):
+        self.path = os.path.normpath(package_path(*path))
+        self._namespace = None
+
+    def load(self):
+        if self._namespace is None:
+            if not os.path.isfile(self.path):
+                raise ValueError(f"Could not find SCAD library {self.path}")
+            namespace = SimpleNamespace()
+            for sd in scad_callables(self.path):
+                # same classes as solid.use() creates
+                exec(new_openscad_class_str(sd['name'], sd['args'], sd['kwargs'], self.path, True), namespace.__dict__)
+            self._namespace = namespace
+        return self._namespace
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
@@ -12,12 +12,17 @@ class CamProfile(Component):
         super().__init__()
         self.config = config
         
+    def get_increment(self):
+        """Angle step, the config's "increment" or else the quality profile's curve step."""
+        return self.config.get("increment") or get_quality().curve_step
+
     def create(self):
         points = []
+        increment = self.get_increment()
         angle_range = self.config["end_angle"] - self.config["start_angle"]
-        radius_step = (self.config["end_radius"] - self.config["start_radius"]) / (angle_range / self.config["increment"])
+        radius_step = (self.config["end_radius"] - self.config["start_radius"]) / (angle_range / increment)
         radius = self.config["start_radius"]
-        for i in np.arange(self.config["start_angle"], self.config["end_angle"], self.config["increment"]):
+        for i in np.arange(self.config["start_angle"], self.config["end_angle"], increment):
             x = radius * math.cos(i)
             y = radius * math.sin(i)
             pt = [x, y]
@@ -31,11 +36,11 @@ class CamProfile(Component):
         
         angle_range = self.config["end_angle"] - self.config["start_angle"]
         
-        radius_step = (self.config["end_radius"] - self.config["start_radius"]) / (angle_range / self.config["increment"])
+        radius_step = (self.config["end_radius"] - self.config["start_radius"]) / (angle_range / self.get_increment())
         
         # self.config["end_angle"] + 1deg is required to complete the loop
         radius = self.config["start_radius"]
-        for i in np.arange(self.config["start_angle"], self.config["end_angle"] + math.radians(1.0), self.config["increment"]):
+        for i in np.arange(self.config["start_angle"], self.config["end_angle"] + math.radians(1.0), self.get_increment()):
             #print ("i=%f(%fdeg) radius_step=%f self.config["start_angle"]=%f(%fdeg) self.config["end_angle"]=%f(%fdeg) target_angle=%f(%fdeg) radius=%f" % \
                 #       (i, math.degrees(i), radius_step, self.config["start_angle"], math.degrees(self.config["start_angle"]), self.config["end_angle"], math.degrees(self.config["end_angle"]), target_angle, math.degrees(target_angle), radius))
             if round(math.degrees(i)) == round(math.degrees(target_angle)):
@@ -1,44 +1,371 @@
+import os
 import math
+import copy
+import weakref
+import functools
+import re
+from collections import OrderedDict
 from solid import *
 from solid.utils import *
 from solid.solidpython import scad_render_to_file
 
+from pyMDA.parts.tree import *
+from pyMDA.parts.export import *
+from pyMDA.parts.quality import *
+from pyMDA.parts.profiler import *
+from pyMDA.parts.trace import *
+from pyMDA.parts.cache import _LRU
+
+# NOTE: the NumPy based modules (transforms, bvh, mesh, hull, render_cost,
+# lod) are imported by the methods using them, so importing a part doesn't
+# load NumPy until an assembly is placed, measured or checked. The same goes
+# for hashlib, json, subprocess and the like in core's own imports, which
+# together take longer to import than pyMDA's modules.
+
+#
+# Component cache
+#
+# Components are rebuilt from the same few configs over and over (the
+# same bearing, stepper or fixture added many times), so create() results
+# are memoized on a fingerprint of the component's class and parameters.
+#
+# NOTE: cached trees are shared between components - wrap them (translate,
+# color, ...) rather than modifying them in place.
+#
+
+class _Unhashable(Exception):
+    pass
+
+def _fingerprint_value(value):
+    """Reduce a parameter value to a stable string, raising _Unhashable for unknown objects."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return repr(value)
+    if isinstance(value, float):
+        return float.hex(value)
+    if hasattr(value, 'dtype') and hasattr(value, 'tolist'): # numpy scalars and arrays
+        return _fingerprint_value(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint_value(v) for v in value) + "]"
+    if isinstance(value, dict):
+        items = sorted((repr(k), _fingerprint_value(v)) for k, v in value.items())
+        return "{" + ",".join("%s:%s" % kv for kv in items) + "}"
+    if isinstance(value, Component):
+        f = value.fingerprint()
+        if f is None:
+            raise _Unhashable(value)
+        return f
+    raise _Unhashable(value)
+
+def _resolved(model):
+    return resolve_segments(model) if hasattr(model, 'children') else model
+
+def _resolving(create):
+    """Wrap a create() method to return its tree with the segment counts resolved."""
+    @functools.wraps(create)
+    def resolved_create(self, *args, **kwargs):
+        return _resolved(create(self, *args, **kwargs))
+    return resolved_create
+
+def _create(component):
+    """component.create() with its segment counts resolved, recorded by the profiler and tracer when enabled."""
+    # Component.create() resolves its own segments, other objects (assemblies with a create()) are resolved here
+    create = component.create if isinstance(component, Component) else lambda: _resolved(component.create())
+    if profiler.enabled or tracer.enabled:
+        with tracer.span(type(component).__name__, "create"):
+            if profiler.enabled:
+                return profiler.record(component, create)
+            return create()
+    return create()
+
+def _detached(model):
+    """Shallow copy of the root of a tree, without the parent it was last added to."""
+    if not hasattr(model, 'children'):
+        return model
+    root = copy_node(model, model.children)
+    root.parent = None
+    return root
+
+class ComponentCache:
+    """Bounded LRU cache of create() results, keyed on component fingerprints.
+
+    Each build() returns its own copy of the cached root node, as adding a
+    node to a parent sets its parent pointer, which SolidPython checks to
+    decide whether holes are subtracted at that node. The subtrees below the
+    root are shared and must not be modified.
+    """
+
+    def __init__(self, max_size = 512):
+        self.max_size = max_size
+        self.enabled = True
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def build(self, component):
+        """Return component.create(), reusing the tree built for an identical component."""
+        key = component.fingerprint() if self.enabled else None
+        if key is None:
+            return _create(component)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            if profiler.enabled:
+                profiler.hit(component)
+            model, state = entry
+            if state is not None:
+                component._restore_state(state)
+            return _detached(model)
+
+        self.misses += 1
+        model = _create(component)
+
+        # create() may update the component (origin, bounding_box, derived config),
+        # remember those updates so a cache hit leaves the component in the same state
+        state = None
+        if component.fingerprint() != key:
+            state = copy.deepcopy(component._state())
+
+        self.entries[key] = (model, state)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+        return _detached(model)
+
+component_cache = ComponentCache()
+
+#
+# Interference cache
+#
+# Meshes are kept per component fingerprint, and narrow phase results per
+# pair of fingerprints and their relative placement, so repeated parts
+# (the same bolt in the same kind of hole) are only checked once.
+#
+
+mesh_cache = _LRU(256)
+interference_cache = _LRU(100000)
+# fingerprint -> measured bounds of components without a declared size, False if none
+bounds_cache = _LRU(1024)
+
+def _item_fingerprint(item):
+    return item.fingerprint() if hasattr(item, 'fingerprint') else None
+
+def component_mesh(item):
+    """Mesh of a component in its own coordinates, or of its bounding box if its tree can't be meshed."""
+    from pyMDA.parts.mesh import Mesh, UnsupportedMesh, mesh_from_model
+    from pyMDA.parts.hull import hull_triangles
+    key = _item_fingerprint(item)
+    mesh = mesh_cache.get(key)
+    if mesh is None:
+        try:
+            mesh = mesh_from_model(item.build(), hull = hull_triangles)
+        except UnsupportedMesh:
+            mesh = Mesh.box(*item.get_bounds())
+        mesh_cache.put(key, mesh)
+    return mesh
+
+#
+# Bounds invalidation
+#
+# Assemblies cache their bounding box. Components and sub-assemblies keep
+# a weak set of the assemblies they were added to, and tell them when
+# their size changes, so only the affected items are measured again.
+#
+
+def _invalidate_owners(obj):
+    for owner in list(obj._owners):
+        owner._child_changed(obj)
+
+class _BoundingBox(dict):
+    """Component bounding box, changing it invalidates the bounds of the assemblies using the component."""
+
+    def __init__(self, component, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._component = component
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        _invalidate_owners(self._component)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        _invalidate_owners(self._component)
+
+    def clear(self):
+        super().clear()
+        _invalidate_owners(self._component)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
 class Component:
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # round primitives are written with segments = self.segments_count,
+        # None until the tree is resolved, so create() resolves it whether it
+        # is called directly or through build()
+        if 'create' in cls.__dict__:
+            cls.create = _resolving(cls.__dict__['create'])
+
     def __init__(self):
+        self._owners = weakref.WeakSet()
         self.config = {}
-        self.segments_count = 100
+        self.segments_count = None # None to follow the resolution, see segments_for()
         self.color = {}
         self.width = 0
         self.length = 0
         self.height = 0
         self.origin = [0, 0, 0]
         self.bounding_box = { "width": 0, "length": 0, "height": 0}
+
+    #
+    # NOTE: origin is the center of the bounding box in the component's own
+    # coordinates, e.g. [0, 0, h / 2] for a cylinder standing on z = 0
+    #
     
     def create(self):
         raise NotImplementedError("Each component must implement the create method.")
 
+    def build(self):
+        """Return create(), reusing the cached tree of an identical component."""
+        return component_cache.build(self)
+
+    @property
+    def bounding_box(self):
+        return self._bounding_box
+
+    @bounding_box.setter
+    def bounding_box(self, value):
+        self._bounding_box = _BoundingBox(self, value)
+        _invalidate_owners(self)
+
+    @property
+    def origin(self):
+        return self._origin
+
+    @origin.setter
+    def origin(self, value):
+        changed = list(value) != list(getattr(self, '_origin', value))
+        self._origin = value
+        if changed:
+            _invalidate_owners(self)
+
+    def _state(self):
+        state = {k: v for k, v in vars(self).items() if not k.startswith('_')}
+        state['bounding_box'] = self._bounding_box
+        state['origin'] = self._origin
+        return state
+
+    def _restore_state(self, state):
+        for k, v in state.items():
+            current = getattr(self, k, None)
+            if isinstance(current, dict) and isinstance(v, dict):
+                # update in place, config dicts are often shared with the caller
+                current.clear()
+                current.update(copy.deepcopy(v))
+            else:
+                setattr(self, k, copy.deepcopy(v))
+
+    def fingerprint(self):
+        """Stable hash of the class and parameters, or None if the parameters can't be hashed."""
+        cls = type(self)
+        try:
+            s = cls.__module__ + "." + cls.__qualname__ + _fingerprint_value(self._state()) + get_quality().key()
+        except _Unhashable:
+            return None
+        import hashlib
+        return hashlib.sha1(s.encode()).hexdigest()
+
     def test(self):
         if self.bounding_box["width"] <= 0 or self.bounding_box["length"] < 0 or self.bounding_box["height"] < 0:
             return False
         return True
 
     def set_segment_count(self, segments_count):
+        """Use segments_count for every round primitive, instead of following the resolution."""
         self.segments_count = segments_count
 
+    def segments_for(self, r):
+        """Segment count for a circle of radius r."""
+        return self.segments_count or get_resolution().segments(r)
+
     def set_color(self, color):
         self.color = color
 
+    def measured_bounds(self):
+        """Bounds (min, max) of a component that imports STLs but declares no size, measured from its tree.
+
+        None for components with a bounding box, or without imports. The
+        STLs' extents come from the metadata cache, so each file is only
+        measured once.
+        """
+        if any(v > 0 for v in self.bounding_box.values()) or getattr(self, '_measuring', False):
+            return None
+        key = _item_fingerprint(self)
+        bounds = bounds_cache.get(key) if key is not None else None
+        if bounds is None:
+            # create() may call back into the size getters
+            self._measuring = True
+            try:
+                model = self.build()
+            finally:
+                self._measuring = False
+            bounds = False
+            if not any(v > 0 for v in self.bounding_box.values()) and any(node.name == 'import' for node in postorder(model)):
+                from pyMDA.parts.mesh import model_bounds
+                measured = model_bounds(model)
+                if measured is not None:
+                    bounds = (tuple(measured[0].tolist()), tuple(measured[1].tolist()))
+            if key is not None:
+                bounds_cache.put(key, bounds)
+        return bounds or None
+
     def get_origin(self):
+        bounds = self.measured_bounds()
+        if bounds is not None:
+            return [(lo + hi) / 2.0 for lo, hi in zip(*bounds)]
         return self.origin
 
     def get_width(self):
-        return self.bounding_box["width"]
+        bounds = self.measured_bounds()
+        return self.bounding_box["width"] if bounds is None else bounds[1][0] - bounds[0][0]
 
     def get_length(self):
-        return self.bounding_box["length"]
+        bounds = self.measured_bounds()
+        return self.bounding_box["length"] if bounds is None else bounds[1][1] - bounds[0][1]
 
     def get_height(self):
-        return self.bounding_box["height"]
+        bounds = self.measured_bounds()
+        return self.bounding_box["height"] if bounds is None else bounds[1][2] - bounds[0][2]
+
+    def is_bounded(self):
+        """False if the component doesn't declare a size, and it can't be measured from imported STLs."""
+        return any(v > 0 for v in self.bounding_box.values()) or self.measured_bounds() is not None
+
+    def get_bounds(self):
+        """Bounding box (min, max) in the component's own coordinates."""
+        half = (self.get_width() / 2.0, self.get_length() / 2.0, self.get_height() / 2.0)
+        origin = self.get_origin()
+        return (tuple(o - h for o, h in zip(origin, half)),
+                tuple(o + h for o, h in zip(origin, half)))
 
     def add_text(self, p):
         s = "%.0fx%.0fx%.0fmm" % (self.bounding_box["width"], self.bounding_box["length"], self.bounding_box["height"])
@@ -47,168 +374,544 @@ class Component:
         txt = translate([self.origin[0], self.origin[1], self.origin[2] + self.bounding_box["height"] / 2.0])(txt)
         return union() (p, txt)
     
+#
+# Bill of materials - parts are tagged with SolidPython's @bom_part, either
+# on a function used in create() (a BOM trait in the tree) or in the class
+# docstring
+#
+
+_BOM_DOC = re.compile(r"""@bom_part\(\s*["']([^"']*)["']\s*(?:,\s*([-+0-9.eE]+))?""")
+
+def _bom_entries(item):
+    """List of (entry, count) for the BOM tags of a component."""
+    found = []
+    for name, price in _BOM_DOC.findall(type(item).__doc__ or ""):
+        found.append(({'name': name, 'Unit Price': float(price) if price else None}, 1))
+
+    # traits of every occurrence in the tree, shared subtrees included
+    counts = OrderedDict()
+    stack = [item.build()]
+    while stack:
+        node = stack.pop()
+        trait = getattr(node, 'traits', {}).get('BOM')
+        if trait:
+            key = trait['name']
+            if key not in counts:
+                counts[key] = [{'name': key, 'Unit Price': trait.get('Unit Price')}, 0]
+            counts[key][1] += 1
+        stack.extend(node.children)
+    found.extend((entry, count) for entry, count in counts.values())
+    return found
+
+def _expands(item):
+    """True for assemblies built from their items, rather than a create() of their own."""
+    return isinstance(item, Assembly) and type(item).create is Assembly.create
+
+def export_model(model, filename, use_modules = False):
+    """Write a SolidPython tree to an SCAD file the way Assembly.export_scad() does.
+
+    Nested unions are flattened, hulls resolved and render hotspots reported
+    as set up for the export, so views derived from an assembly (e.g. its
+    cross-sections) are written like the assembly itself.
+    """
+    from pyMDA.parts.hull import get_polyhedron_hulls, resolve_hulls
+    from pyMDA.parts.render_cost import get_render_budget, render_hotspots
+    model = flatten_unions(model)
+    if get_polyhedron_hulls():
+        with tracer.span("resolve_hulls", "export"):
+            model = resolve_hulls(model)
+    budget = get_render_budget()
+    if budget is not None:
+        for c in render_hotspots(model, budget, base_dir = os.path.dirname(filename)):
+            print(f"Warning: {filename}: {c.node.name} costing {c.cost} (budget {budget}), {c.path}")
+    if use_modules:
+        scad_render_modules_to_file(model, filename)
+    else:
+        scad_render_traced(model, filename)
+    return filename
+
+class AssemblyItem(dict):
+    """Item record of an Assembly, moving or replacing the item invalidates the assembly bounds."""
+
+    def __init__(self, assembly, name, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assembly = assembly
+        self._name = name
+
+    def __setitem__(self, key, value):
+        if key in ('item', 'parent') and key in self:
+            self._assembly._unlink_item(self._name, self)
+        super().__setitem__(key, value)
+        if key in ('item', 'parent'):
+            self._assembly._link_item(self._name, self)
+        self._assembly._item_changed(self._name)
+
 class Assembly:
     def __init__(self):
         self.items = {}  # Stores both components and sub-assemblies
+        self._owners = weakref.WeakSet()
+        self._names_by_item = {}
+        self._children_by_parent = {}
+        self._matrices = {}
+        self._item_bounds = {}
+        self._unbounded = set()
+        self._bounds = None
+        self._bvh = None
+        self._bvh_names = []
+        self._bvh_index = {}
+        self._bvh_moved = set()
 
     def get_origin(self):
         raise NotImplementedError("Each component must implement the test method.")
-        
+
+    #
+    # Cached transforms and bounds - each item's matrix and box is computed
+    # once and kept until the item (or one of its parents) is moved, or the
+    # item's own size changes
+    #
+
+    def _link_item(self, name, item_info):
+        item = item_info['item']
+        self._names_by_item.setdefault(id(item), set()).add(name)
+        owners = getattr(item, '_owners', None)
+        if owners is not None:
+            owners.add(self)
+        self._children_by_parent.setdefault(item_info.get('parent'), set()).add(name)
+
+    def _unlink_item(self, name, item_info):
+        item = item_info['item']
+        names = self._names_by_item.get(id(item))
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._names_by_item[id(item)]
+                owners = getattr(item, '_owners', None)
+                if owners is not None:
+                    owners.discard(self)
+        self._children_by_parent.get(item_info.get('parent'), set()).discard(name)
+
+    def _item_changed(self, name):
+        # children follow their parent, so drop their matrices and boxes too
+        stack = [name]
+        seen = set()
+        while stack:
+            n = stack.pop()
+            if n in seen:
+                continue
+            seen.add(n)
+            self._matrices.pop(n, None)
+            self._item_bounds.pop(n, None)
+            self._bvh_moved.add(n)
+            stack.extend(self._children_by_parent.get(n, ()))
+
+        # owners only hold boxes measured from valid bounds, so they were told already
+        if self._bounds is not None:
+            self._bounds = None
+            _invalidate_owners(self)
+
+    def _child_changed(self, item):
+        for name in self._names_by_item.get(id(item), ()):
+            self._item_bounds.pop(name, None)
+            self._bvh_moved.add(name)
+        if self._bounds is not None:
+            self._bounds = None
+            _invalidate_owners(self)
+
+    def invalidate(self):
+        """Drop all cached transforms and bounds, e.g. after changing items without going through add()."""
+        self._matrices.clear()
+        self._item_bounds.clear()
+        self._bounds = None
+        self._bvh = None
+        _invalidate_owners(self)
+
+    def world_matrix(self, name):
+        """4x4 transform of an item relative to the assembly, following its parent chain."""
+        return self.world_matrices([name])[name]
+
+    def world_matrices(self, names = None):
+        """Return the 4x4 transforms of items (all by default), computing each parent only once."""
+        from pyMDA.parts.transforms import transform_matrices
+        names = list(self.items if names is None else names)
+        matrices = self._matrices
+
+        # items without a cached matrix, parents before their children
+        order = []
+        pending = set()
+        for name in names:
+            chain = []
+            current = name
+            while current is not None and current not in matrices and current not in pending:
+                if current in chain:
+                    raise ValueError("Parent cycle in assembly at '%s'" % current)
+                if current not in self.items:
+                    raise ValueError("Unknown parent '%s' in assembly" % current)
+                chain.append(current)
+                current = self.items[current].get('parent')
+            pending.update(chain)
+            order.extend(reversed(chain))
+
+        if order:
+            local = transform_matrices([self.items[n]['position'] for n in order],
+                                       [self.items[n]['rotation'] for n in order])
+            for n, m in zip(order, local):
+                parent = self.items[n].get('parent')
+                matrices[n] = m if parent is None else matrices[parent] @ m
+        return {name: matrices[name] for name in names}
+
+    def _measure_items(self, names):
+        """Measure the boxes of several items at once, rotating each local box into the assembly."""
+        import numpy as np
+        from pyMDA.parts.transforms import transform_boxes
+        matrices = self.world_matrices(names)
+
+        # one row per item, or per instance of a pattern
+        rows, los, his, starts = [], [], [], []
+        offset = 0
+        for name in names:
+            item_info = self.items[name]
+            instances = item_info.get('pattern')
+            m = matrices[name][None] if instances is None else matrices[name] @ instances
+            lo, hi = item_info['item'].get_bounds()
+            starts.append(offset)
+            offset += len(m)
+            rows.append(m)
+            los.append(np.tile(lo, (len(m), 1)))
+            his.append(np.tile(hi, (len(m), 1)))
+        mins, maxs = transform_boxes(np.concatenate(rows), np.concatenate(los), np.concatenate(his))
+        mins = np.minimum.reduceat(mins, starts)
+        maxs = np.maximum.reduceat(maxs, starts)
+
+        for name, lo, hi in zip(names, mins.tolist(), maxs.tolist()):
+            self._item_bounds[name] = (tuple(lo), tuple(hi))
+            if self.items[name]['item'].is_bounded():
+                self._unbounded.discard(name)
+            else:
+                self._unbounded.add(name)
+
+    def get_item_bounds(self, name):
+        """Bounding box (min, max) of an item in the assembly, including rotation and parents."""
+        if name not in self._item_bounds:
+            self._measure_items([name])
+        return self._item_bounds[name]
+
+    def get_bounds(self):
+        """Bounding box (min, max) of the assembly, cached until an item moves or changes size."""
+        import numpy as np
+        if self._bounds is None:
+            if not self.items:
+                self._bounds = ((0, 0, 0), (0, 0, 0))
+            else:
+                missing = [name for name in self.items if name not in self._item_bounds]
+                if missing:
+                    self._measure_items(missing)
+                boxes = np.array([self._item_bounds[name] for name in self.items])
+                self._bounds = (tuple(boxes[:, 0].min(axis = 0).tolist()),
+                                tuple(boxes[:, 1].max(axis = 0).tolist()))
+        return self._bounds
+
+    def is_bounded(self):
+        """False if any item has an unknown size (and so may reach outside get_bounds())."""
+        # an assembly that draws itself in create() has no items to measure
+        if not self.items and not _expands(self):
+            return False
+        self.get_bounds()
+        return not self._unbounded
+
     def get_width(self):
         """Calculate the total width of the assembly."""
-        min_x = float('inf')
-        max_x = float('-inf')
-        for item_info in self.items.values():
-            item_width = item_info['item'].get_width()
-            horizontal_position = item_info['position'][0]  # X position
-            if horizontal_position + item_width > max_x:
-                max_x = horizontal_position + item_width
-            if horizontal_position < min_x:
-                min_x = horizontal_position
-        return max_x - min_x
+        bounds = self.get_bounds()
+        return bounds[1][0] - bounds[0][0]
 
     def get_length(self):
         """Calculate the total length of the assembly."""
-        min_y = float('inf')
-        max_y = float('-inf')
-        for item_info in self.items.values():
-            item_length = item_info['item'].get_length()
-            length_position = item_info['position'][1]  # Y position
-            if length_position + item_length > max_y:
-                max_y = length_position + item_length
-            if length_position < min_y:
-                min_y = length_position
-        return max_y - min_y
+        bounds = self.get_bounds()
+        return bounds[1][1] - bounds[0][1]
     
     def get_height(self):
         """Calculate the total height of the assembly."""
-        max_height = 0
-        for item_info in self.items.values():
-            item_height = item_info['item'].get_height()
-            vertical_position = item_info['position'][2]  # Z position
-            # Total height is the position plus the item's height
-            total_height = vertical_position + item_height
-            if total_height > max_height:
-                max_height = total_height
-        return max_height
+        bounds = self.get_bounds()
+        return bounds[1][2] - bounds[0][2]
 
     def center_assembly(self):
         """Reposition all components so the assembly is centered at the origin."""
-        width = self.get_width()
-        length = self.get_length()
-        height = self.get_height()
-    
-        x_offset = width / 2
-        y_offset = length / 2
-        z_offset = height / 2
+        bounds = self.get_bounds()
+        offset = [(lo + hi) / 2.0 for lo, hi in zip(bounds[0], bounds[1])]
 
+        # children are placed relative to their parent, so only move the roots
         for item_info in self.items.values():
-            pos = item_info['position']
-            item_info['position'] = (pos[0] - x_offset, pos[1] - y_offset, pos[2] - z_offset)
+            if item_info.get('parent') is None:
+                pos = item_info['position']
+                item_info['position'] = (pos[0] - offset[0], pos[1] - offset[1], pos[2] - offset[2])
+
+    def _stack(self, axis, margin):
+        """Place the items (other than children) one after another along an axis, margin apart."""
+        self.get_bounds() # measure all items in one batch
+        extents = {}
+        for name, item_info in self.items.items():
+            if item_info.get('parent') is None:
+                lo, hi = self._item_bounds[name]
+                p = item_info['position'][axis]
+                extents[name] = (lo[axis] - p, hi[axis] - p)
+
+        current = None
+        for name, (lo, hi) in extents.items():
+            pos = list(self.items[name]['position'])
+            if current is None:
+                pos[axis] = 0
+            else:
+                pos[axis] = current + margin - lo
+            current = pos[axis] + hi
+            self.items[name]['position'] = tuple(pos)
 
     def stack_x(self, margin):
-        current_x = 0
-        old_item = 0
-        for name, item in self.items.items():
-            try:
-                current_x += old_item.get_width() / 2.0 + margin + self.items[name]['item'].get_width() / 2
-            except:
-                current_x = 0
-            new_position = (current_x, item['position'][1], item['position'][2])
-            self.items[name]['position'] = new_position
-            old_item = self.items[name]['item']
+        self._stack(0, margin)
 
     def stack_y(self, margin):
-        current_y = 0
-        old_item = 0
-        for name, item in self.items.items():
-            try:
-                current_y += old_item.get_length() / 2.0 + margin + self.items[name]['item'].get_length() / 2
-            except:
-                current_y = 0
-            new_position = (item['position'][0], current_y, item['position'][2])
-            self.items[name]['position'] = new_position
-            old_item = self.items[name]['item']
+        self._stack(1, margin)
             
     def stack_z(self, margin):
-        current_z = 0
-        old_item = 0
-        for name, item in self.items.items():
-            try:
-                current_z += old_item.get_height() / 2.0 + margin + self.items[name]['item'].get_height() / 2
-            except:
-                current_z = 0
-            new_position = (item['position'][0], item['position'][1], current_z)
-            self.items[name]['position'] = new_position
-            old_item = self.items[name]['item']
+        self._stack(2, margin)
 
     def add(self, name, item, position=(0, 0, 0), rotation=(0, 0, 0), parent=None):
         """Add a component with optional parent for hierarchical transformations."""
-        self.items[name] = {
+        if name in self.items:
+            self._unlink_item(name, self.items[name])
+        else:
+            self._bvh = None
+        self.items[name] = AssemblyItem(self, name, {
             'item': item,
             'position': position,
             'rotation': rotation,
             'parent': parent
-        }
+        })
+        self._link_item(name, self.items[name])
+        self._item_changed(name)
 
-    def assemble(self):
-        built = {}
+    def add_pattern(self, name, item, kind = 'linear', count = 2, pitch = 10.0, angle = None, radius = 0.0,
+                    position = (0, 0, 0), rotation = (0, 0, 0), parent = None, loop = True):
+        """Add count copies of an item as a single entry, see pattern_matrices() for kind, pitch, angle and radius.
 
-        def apply_transform(name, parent_pos=(0, 0, 0), parent_rot=(0, 0, 0)):
-            item_info = self.items[name]
+        The item is built once. With loop the copies are placed by an
+        OpenSCAD for() loop over their matrices, otherwise each one is a
+        multmatrix of the same shared tree (written once with use_modules).
+        """
+        from pyMDA.parts.transforms import pattern_matrices
+        self.add(name, item, position, rotation, parent)
+        self.items[name]['loop'] = loop
+        self.items[name]['pattern'] = pattern_matrices(kind, count, pitch, angle, radius)
+
+    def get_count(self, name):
+        """Number of copies an item stands for, 1 unless it is a pattern."""
+        instances = self.items[name].get('pattern')
+        return 1 if instances is None else len(instances)
+
+    #
+    # Region queries - a BVH over the item boxes, refitted when items move
+    # and rebuilt when items are added. Items of unknown size can't be
+    # excluded, so they are always part of the result.
+    #
+
+    def _get_bvh(self):
+        import numpy as np
+        from pyMDA.parts.bvh import BVH
+        self.get_bounds()
+        if self._bvh is None or self._bvh.refit_count > len(self.items):
+            self._bvh_names = list(self.items)
+            self._bvh_index = {name: i for i, name in enumerate(self._bvh_names)}
+            boxes = np.array([self._item_bounds[name] for name in self._bvh_names], dtype = float).reshape(-1, 2, 3)
+            self._bvh = BVH(boxes[:, 0], boxes[:, 1])
+        elif self._bvh_moved:
+            moved = [name for name in self._bvh_moved if name in self._bvh_index]
+            if moved:
+                boxes = np.array([self._item_bounds[name] for name in moved], dtype = float)
+                self._bvh.refit([self._bvh_index[name] for name in moved], boxes[:, 0], boxes[:, 1])
+        self._bvh_moved.clear()
+        return self._bvh
+
+    def _query(self, hit_indices, recurse):
+        hits = set(self._bvh_names[i] for i in hit_indices) | self._unbounded
+        names = [name for name in self.items if name in hits]
+        if recurse is None:
+            return names
+        found = []
+        for name in names:
+            item = self.items[name]['item']
+            if _expands(item) and self.items[name].get('pattern') is None:
+                found.extend(name + "/" + sub for sub in recurse(item, self.world_matrix(name)))
+            else:
+                found.append(name)
+        return found
+
+    def query_box(self, box_min, box_max, recursive = False):
+        """Names of the items whose boxes overlap the box (box_min, box_max).
+
+        With recursive, items of sub-assemblies are returned as 'sub/item' paths.
+        """
+        hit = self._get_bvh().query_box(box_min, box_max)
+
+        def recurse(item, m):
+            import numpy as np
+            from pyMDA.parts.transforms import transform_boxes
+            lo, hi = transform_boxes(np.linalg.inv(m), box_min, box_max)
+            return item.query_box(lo[0], hi[0], True)
+
+        return self._query(hit, recurse if recursive else None)
+
+    def query_plane(self, axis, position, recursive = False, thickness = 0.0):
+        """Names of the items crossing a plane, given as an axis ('x', 'y', 'z' or a normal) and offset.
+
+        With thickness, items reaching into the slab of that thickness around the plane count too.
+        """
+        from pyMDA.parts.transforms import plane_normal
+        normal = plane_normal(axis)
+        hit = self._get_bvh().query_plane(normal, position, thickness)
+
+        def recurse(item, m):
+            r = m[:3, :3]
+            return item.query_plane(r.T @ normal, position - normal @ m[:3, 3], True, thickness)
+
+        return self._query(hit, recurse if recursive else None)
+
+    def leaves(self, paths = None):
+        """(path, item, matrix) of every item, looking into sub-assemblies, with matrices relative to this assembly.
+
+        Copies of a pattern are listed one by one as 'name[i]'. With paths,
+        only the leaves at or below those paths are returned.
+        """
+        import numpy as np
+        found = []
+        stack = [("", self, np.identity(4))]
+        while stack:
+            path, item, m = stack.pop()
+            if not _expands(item):
+                found.append((path, item, m))
+                continue
+            # children pushed in reverse so they come out in item order
+            prefix = path + "/" if path else ""
+            matrices = item.world_matrices()
+            for name in reversed(list(item.items)):
+                item_info = item.items[name]
+                world = m @ matrices[name]
+                instances = item_info.get('pattern')
+                if instances is None:
+                    stack.append((prefix + name, item_info['item'], world))
+                else:
+                    for i in reversed(range(len(instances))):
+                        stack.append(("%s%s[%d]" % (prefix, name, i), item_info['item'], world @ instances[i]))
+
+        if paths is not None:
+            paths = set(paths)
+            below = tuple(p + "/" for p in paths) + tuple(p + "[" for p in paths)
+            found = [leaf for leaf in found if leaf[0] in paths or leaf[0].startswith(below)]
+        return found
+
+    def resolve_path(self, path):
+        """Return the item at an 'sub/item' path and its 4x4 transform relative to this assembly.
+
+        A copy of a pattern is given as 'name[i]', a bare pattern name gives the pattern's own transform.
+        """
+        import numpy as np
+        assembly = self
+        m = np.identity(4)
+        names = path.split("/")
+        for i, name in enumerate(names):
+            index = None
+            if name.endswith("]") and "[" in name:
+                name, _, index = name[:-1].partition("[")
+            if not isinstance(assembly, Assembly) or name not in assembly.items:
+                raise KeyError("No item '%s' in assembly" % "/".join(names[:i + 1]))
+            m = m @ assembly.world_matrix(name)
+            if index is not None:
+                m = m @ assembly.items[name]['pattern'][int(index)]
+            assembly = assembly.items[name]['item']
+        return assembly, m
+
+    def assemble(self, only = None):
+        """Build and place the items, or with only, just the listed items or 'sub/item' paths."""
+        if profiler.enabled or tracer.enabled:
+            with tracer.span("assemble", "assemble", items = len(self.items)):
+                if profiler.enabled:
+                    return profiler.record(self, lambda: self._assemble(only))
+                return self._assemble(only)
+        return self._assemble(only)
+
+    def _assemble(self, only):
+        from pyMDA.parts.transforms import apply_matrix, place_instances
+        selected = None
+        if only is not None:
+            # name -> sub paths, None to build the whole item
+            selected = {}
+            for path in only:
+                name, _, sub = path.partition("/")
+                if not sub:
+                    selected[name] = None
+                elif selected.get(name, []) is not None:
+                    selected.setdefault(name, []).append(sub)
+
+        matrices = self.world_matrices()
+
+        models = []
+        for name, item_info in self.items.items():
             item = item_info['item']
-            local_pos = item_info['position']
-            local_rot = item_info['rotation']
-            parent = item_info.get('parent')
-
-            # Compose transformations
-            def rotate_vector(vec, rot):
-                x, y, z = vec
-                rx, ry, rz = [math.radians(r) for r in rot]
-
-                # Apply Z
-                cz, sz = math.cos(rz), math.sin(rz)
-                x, y = x * cz - y * sz, x * sz + y * cz
-
-                # Apply Y
-                cy, sy = math.cos(ry), math.sin(ry)
-                x, z = x * cy + z * sy, -x * sy + z * cy
-                
-                # Apply X
-                cx, sx = math.cos(rx), math.sin(rx)
-                y, z = y * cx - z * sx, y * sx + z * cx
-                
-                return [x, y, z]
-
-            # Recursively build parent transform if needed
-            if parent:
-                parent_pos, parent_rot = built[parent]['abs_pos'], built[parent]['abs_rot']
-
-            abs_pos = [a + b for a, b in zip(parent_pos, rotate_vector(local_pos, parent_rot))]
-            abs_rot = [a + b for a, b in zip(parent_rot, local_rot)]
-
-            model = item.create()
-            model = rotate(local_rot)(model)
-            model = translate(local_pos)(model)
-            model = rotate(parent_rot)(model)
-            model = translate(parent_pos)(model)
-            
-            built[name] = {
-                'model': model,
-                'abs_pos': abs_pos,
-                'abs_rot': abs_rot
-            }
+            if selected is not None and name not in selected:
+                continue
+            profiled = profiler.enabled
+            if profiled:
+                profiler.enter(name)
+            placed = None
+            try:
+                if selected is not None and selected[name] is not None and _expands(item) and item_info.get('pattern') is None:
+                    model = item.assemble(selected[name])
+                else:
+                    model = item.build()
+                if item_info.get('pattern') is not None:
+                    model = place_instances(item_info['pattern'], model, item_info.get('loop', True))
+                placed = apply_matrix(matrices[name], model)
+            finally:
+                # also when the item fails, so later items aren't timed under its path
+                if profiled:
+                    profiler.leave(placed)
+            models.append(placed)
 
-            return model
+        if not models:
+            return cube(0)
+        if len(models) == 1:
+            return models[0]
+        return union()(*models)
 
-        full_model = None
-        for name in self.items:
-            if name not in built:
-                model = apply_transform(name)
-                full_model = union()(full_model, model) if full_model else model
+    def bom(self):
+        """Bill of materials as {name: {'name', 'Count', 'Unit Price'}}, counting the copies of patterns."""
+        entries = OrderedDict()
+        stack = [(self, 1)]
+        while stack:
+            item, n = stack.pop()
+            if _expands(item):
+                for name in reversed(list(item.items)):
+                    stack.append((item.items[name]['item'], n * item.get_count(name)))
+                continue
+            for entry, count in _bom_entries(item):
+                if entry['name'] not in entries:
+                    entries[entry['name']] = dict(entry, Count = 0)
+                entries[entry['name']]['Count'] += n * count
+        return entries
 
-        return full_model if full_model else cube(0)
-        
+    def bill_of_materials(self, csv = False):
+        """The bom() as a text table, or as CSV."""
+        rows = [("Description", "Count", "Unit Price", "Total")]
+        total = 0.0
+        for entry in self.bom().values():
+            price = entry['Unit Price']
+            cost = None if price is None else price * entry['Count']
+            total += cost or 0.0
+            rows.append((entry['name'], str(entry['Count']),
+                         "" if price is None else "%.2f" % price,
+                         "" if cost is None else "%.2f" % cost))
+        rows.append(("Total", "", "", "%.2f" % total))
+        if csv:
+            return "\n".join(",".join('"%s"' % c if "," in c else c for c in row) for row in rows)
+        width = max(len(row[0]) for row in rows)
+        return "\n".join("%-*s %6s %10s %10s" % ((width,) + row) for row in rows)
 
     def test_assembly(self):
         """Test the complete assembly, including any sub-assemblies."""
@@ -217,22 +920,140 @@ class Assembly:
             print(f"Testing {name}")
             item_info['item'].test()
 
-    def export_scad(self, filename):
-        """Export the assembly to an SCAD file."""
-        model = self.assemble()
-        scad_render_to_file(model, filename)
+    def export_scad(self, filename, use_modules = False):
+        """Export the assembly to an SCAD file, optionally writing repeated subtrees as modules."""
+        with tracer.span("export_scad", "export", file = filename):
+            export_model(self.assemble(), filename, use_modules)
         print(f"Exported {filename}")
 
     def create(self):
         """Allow Assembly to be used interchangeably with Components."""
         return self.assemble()
 
-    def cross_section_view(self, axis, position):
-        """Generate a cross-sectional view of the assembly."""
-        model = self.assemble()
-        # Assuming axis='x' and position=0 for simplicity
-        cross_section = intersection()(
-            model,
-            translate([position - 1, -100, -100])(cube([2, 200, 200]))
-        )
-        return cross_section
+    def build(self):
+        if _expands(self):
+            return self.create()
+        return _create(self)
+
+    #
+    # Cross sections - only the items whose boxes reach the cut are built,
+    # everything else (e.g. a COTS STL far from the plane) is skipped
+    #
+
+    def cross_section_view(self, axis, position, thickness = 2.0, margin = 1.0):
+        """Cut a slab of thickness around a plane (axis 'x', 'y', 'z' or a normal) out of the assembly.
+
+        The slab covers the assembly bounds plus margin, items of unknown
+        size may need a larger margin.
+        """
+        import numpy as np
+        from pyMDA.parts.transforms import apply_matrix, plane_basis, plane_normal, transform_boxes
+        normal = plane_normal(axis)
+        paths = self.query_plane(normal, position, True, thickness)
+        model = self.assemble(paths)
+
+        # extents of the assembly bounds within the plane
+        u, v = plane_basis(normal)
+        lo, hi = self.get_bounds()
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+        slab_min = np.array([(corners @ u).min() - margin, (corners @ v).min() - margin, position - thickness / 2.0])
+        slab_max = np.array([(corners @ u).max() + margin, (corners @ v).max() + margin, position + thickness / 2.0])
+
+        basis = np.identity(4)
+        basis[:3, :3] = np.column_stack([u, v, normal])
+        if np.count_nonzero(np.abs(normal) > 1e-12) == 1:
+            # axis planes: write the slab as a plain box in assembly coordinates
+            slab_min, slab_max = transform_boxes(basis, slab_min, slab_max)
+            slab = translate(slab_min[0].tolist()) (cube((slab_max[0] - slab_min[0]).tolist()))
+        else:
+            slab = apply_matrix(basis, translate(slab_min.tolist()) (cube((slab_max - slab_min).tolist())))
+
+        return intersection() (model, slab)
+
+    def cross_section_outline(self, axis, position):
+        """2D outlines of the item boxes cut by a plane, without building any geometry.
+
+        Returns {path: [(u, v), ...]} with the points of each convex outline
+        in order, in the plane coordinates of plane_basis(). Items of unknown
+        size have no outline and are left out.
+        """
+        import numpy as np
+        from pyMDA.parts.transforms import plane_basis, plane_normal, transform_points
+        normal = plane_normal(axis)
+        u, v = plane_basis(normal)
+        edges = [(a, b) for a in range(8) for b in range(a + 1, 8) if bin(a ^ b).count("1") == 1]
+
+        outlines = {}
+        for path, item, m in self.leaves(self.query_plane(normal, position, True)):
+            if not item.is_bounded():
+                continue
+            lo, hi = item.get_bounds()
+            corners = transform_points(m, [[(lo, hi)[i >> 2 & 1][0], (lo, hi)[i >> 1 & 1][1], (lo, hi)[i & 1][2]] for i in range(8)])
+            d = corners @ normal - position
+
+            points = [corners[i] for i in range(8) if abs(d[i]) < 1e-9]
+            for a, b in edges:
+                if d[a] * d[b] < 0:
+                    t = d[a] / (d[a] - d[b])
+                    points.append(corners[a] + t * (corners[b] - corners[a]))
+            if len(points) < 3:
+                continue
+
+            # order the points around their center
+            pts = np.unique(np.round(np.array(points) @ np.column_stack([u, v]), 9), axis = 0)
+            center = pts.mean(axis = 0)
+            pts = pts[np.argsort(np.arctan2(pts[:, 1] - center[1], pts[:, 0] - center[0]))]
+            outlines[path] = [tuple(p) for p in pts.tolist()]
+        return outlines
+
+    #
+    # Interference checks - a sweep and prune over the item boxes finds the
+    # candidate pairs, their meshes then decide if the solids really overlap
+    #
+
+    def find_interferences(self, tolerance = 1e-3, workers = 1):
+        """Pairs of item paths whose solids overlap by more than tolerance.
+
+        Items of unknown size are skipped. Items whose tree can't be meshed
+        (e.g. imported STLs) are checked as their bounding box. With workers
+        > 1 the narrow phase runs in that many processes.
+        """
+        import numpy as np
+        from pyMDA.parts.transforms import transform_boxes
+        from pyMDA.parts.bvh import overlapping_pairs
+        from pyMDA.parts.mesh import interfere_task
+        leaves = [leaf for leaf in self.leaves() if leaf[1].is_bounded()]
+        if len(leaves) < 2:
+            return []
+        local = [item.get_bounds() for _, item, _ in leaves]
+        mins, maxs = transform_boxes([m for _, _, m in leaves], [b[0] for b in local], [b[1] for b in local])
+
+        results = {}
+        tasks = []
+        for i, j in overlapping_pairs(mins, maxs, tolerance):
+            (_, a, ma), (_, b, mb) = leaves[i], leaves[j]
+            rel = np.linalg.inv(ma) @ mb
+            fa, fb = _item_fingerprint(a), _item_fingerprint(b)
+            key = None
+            if fa is not None and fb is not None:
+                if fa <= fb:
+                    key = (fa, fb, (np.round(rel, 9) + 0.0).tobytes(), tolerance)
+                else:
+                    key = (fb, fa, (np.round(np.linalg.inv(rel), 9) + 0.0).tobytes(), tolerance)
+            hit = interference_cache.get(key)
+            if hit is None:
+                tasks.append(((i, j), key, (component_mesh(a), component_mesh(b), rel, tolerance)))
+            else:
+                results[(i, j)] = hit
+
+        if workers > 1 and len(tasks) > 1:
+            # imported here, multiprocessing adds to the startup of every build
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers = workers) as pool:
+                hits = list(pool.map(interfere_task, [t[2] for t in tasks], chunksize = max(1, len(tasks) // (4 * workers))))
+        else:
+            hits = [interfere_task(t[2]) for t in tasks]
+        for (pair, key, _), hit in zip(tasks, hits):
+            results[pair] = interference_cache.put(key, hit)
+
+        return [(leaves[i][0], leaves[j][0]) for (i, j), hit in sorted(results.items()) if hit]
@@ -3,6 +3,8 @@ from solid.utils import *
 
 from pyMDA.parts.core import *
 from pyMDA.parts.geometry import *
+from pyMDA.parts.rounded import *
+from pyMDA.parts.sweep import *
 
 #
 # This added fillets to 2 or 4 sides, not all 12 sides as done by
@@ -11,7 +13,7 @@ from pyMDA.parts.geometry import *
 
 class CubeCurvedSides(Component):
     
-    def __init__(self, x, y, z, corner_radius, side_count, is_center = True):
+    def __init__(self, x, y, z, corner_radius, side_count, is_center = True, use_polyhedron = False):
         super().__init__()
         self.width = x
         self.length = y
@@ -26,6 +28,7 @@ class CubeCurvedSides(Component):
         self.z = z
         self.corner_radius = corner_radius
         self.side_count = side_count
+        self.use_polyhedron = use_polyhedron # one polyhedron instead of a hull() of cylinders
         
     def create(self):
         
@@ -33,6 +36,15 @@ class CubeCurvedSides(Component):
         # TODO: support non-center option
         # using hull() still requires high segments - perhaps use rotate_extrude instead
 
+        if self.use_polyhedron:
+            n = self.segments_for(self.corner_radius)
+            if self.side_count == 4:
+                return rounded_prism([self.x, self.y, self.z], self.corner_radius, n)
+            elif self.side_count == 2:
+                # same shape as the hull below, rounded on the -y corners
+                return translate([0, self.y / 2.0 - self.corner_radius, 0]) (
+                    rounded_prism([self.x, self.corner_radius * 2.0, self.z], [0, 0, self.corner_radius, self.corner_radius], n))
+
         corner_round = translate([0, 0, -self.z / 2.0]) (cylinder(segments = self.segments_count, r = self.corner_radius, h = self.z))
 
         if self.side_count == 4:
@@ -62,7 +74,7 @@ class CubeCurvedSides(Component):
         
 class CubeCurvedEdges(Component):
     
-    def __init__(self, x, y, z, corner_radius, is_center = True):
+    def __init__(self, x, y, z, corner_radius, is_center = True, use_polyhedron = False):
         super().__init__()
         self.width = x
         self.length = y
@@ -76,12 +88,16 @@ class CubeCurvedEdges(Component):
         self.y = y
         self.z = z
         self.corner_radius = corner_radius
+        self.use_polyhedron = use_polyhedron # one polyhedron instead of a hull() of spheres
 
     def create(self):
         
     # alternative approach to minkowski, so it imports into OpenSCAD and export as STEP
     # using hull() still requires high segments - perhaps use rotate_extrude instead
     
+        if self.use_polyhedron:
+            return rounded_box([self.x, self.y, self.z], self.corner_radius, self.segments_for(self.corner_radius), self.is_center)
+
         if self.is_center:
             return hull() (
                 translate([-self.x / 2.0 + self.corner_radius, -self.y / 2.0 + self.corner_radius, -self.z / 2.0 + self.corner_radius]) (sphere(segments = self.segments_count, r = self.corner_radius)),
@@ -114,7 +130,7 @@ class CubeCurvedEdges(Component):
         
 class BarCurvedEdges(Component):
 
-    def __init__(self, length, thickness, corner_radius):
+    def __init__(self, length, thickness, corner_radius, use_polyhedron = False):
         super().__init__()
         self.width = thickness
         self.length = length
@@ -125,9 +141,10 @@ class BarCurvedEdges(Component):
         self.origin = [0, 0, 0]
         self.thickness = thickness
         self.corner_radius = corner_radius
+        self.use_polyhedron = use_polyhedron
         
     def create(self):
-        return CubeCurvedEdges(self.thickness, self.length, self.thickness, self.corner_radius, True).create()
+        return CubeCurvedEdges(self.thickness, self.length, self.thickness, self.corner_radius, True, self.use_polyhedron).build()
 
 #
 # FIXME: only really works with ideal corner_radius and r selection
@@ -157,13 +174,13 @@ class CylinderCurvedEdges(Component):
             b_height = self.height - self.corner_radius * 2.0
         b = cylinder(segments = self.segments_count, r = self.r, h = b_height)
         
-        eb = Torus(self.r, self.corner_radius * 2, self.segments_count, 100).create()
+        eb = Torus(self.r, self.corner_radius * 2, is_center = True, is_add_text = True).build()
         bb = cylinder(segments = self.segments_count, r = self.r - self.corner_radius, h = self.corner_radius * 2.0)
 
         p = translate([0, 0, self.corner_radius]) (b) + translate([0, 0, self.corner_radius]) (eb) + translate([0, 0, 0]) (bb)
     
         if self.both_sides:
-            et = Torus(self.r, self.corner_radius * 2, self.segments_count, 100).create()
+            et = Torus(self.r, self.corner_radius * 2, is_center = True, is_add_text = True).build()
             bt = cylinder(segments = self.segments_count, r = self.r - self.corner_radius, h = self.corner_radius * 2.0)
             p += translate([0, 0, self.height - self.corner_radius]) (et) + translate([0, 0, self.height - self.corner_radius * 2.0]) (bt)
 
@@ -179,13 +196,13 @@ class LineRoundViaHull(Component):
     
     def __init__(self, p1, p2, radius):
         super().__init__()
-        self.width = p2[0] - p1[0] + radius * 2
-        self.length = p2[1] - p1[1] + radius * 2
-        self.height = p2[2] - p1[2] + radius * 2
-        self.bounding_box["width"] = p2[0] - p1[0] + radius * 2
-        self.bounding_box["length"] = p2[1] - p1[1] + radius * 2
-        self.bounding_box["height"] = p2[2] - p1[2] + radius * 2
-        self.origin = (p2[0] - p1[0], p2[1] - p1[1], p2[2] - p1[2])
+        self.width = abs(p2[0] - p1[0]) + radius * 2
+        self.length = abs(p2[1] - p1[1]) + radius * 2
+        self.height = abs(p2[2] - p1[2]) + radius * 2
+        self.bounding_box["width"] = self.width
+        self.bounding_box["length"] = self.length
+        self.bounding_box["height"] = self.height
+        self.origin = ((p1[0] + p2[0]) / 2.0, (p1[1] + p2[1]) / 2.0, (p1[2] + p2[2]) / 2.0)
         self.p1 = p1
         self.p2 = p2
         self.radius = radius
@@ -207,20 +224,24 @@ class LineRoundViaHull(Component):
 
 class PolylineRound(Component):
 
-    def __init__(self, pts, radius, is_close = False):
+    def __init__(self, pts, radius, is_close = False, use_polyhedron = False):
         super().__init__()
         self.pts = pts
         self.radius = radius
         self.is_close = is_close
+        self.use_polyhedron = use_polyhedron # one swept tube instead of a union of hull() segments
     
     def create(self):
 
+        if self.use_polyhedron:
+            return tube(self.pts, self.radius, self.segments_for(self.radius), self.is_close)
+
+        p = []
+
         if self.is_close:
-            p = LineRoundViaHull(self.pts[len(self.pts) - 1], self.pts[0], self.radius).create()
-        else:
-            p = 0
+            p.append(LineRoundViaHull(self.pts[len(self.pts) - 1], self.pts[0], self.radius).build())
         
         for i in range(len(self.pts) - 1):
-            p += LineRoundViaHull(self.pts[i], self.pts[i + 1], self.radius).create()
+            p.append(LineRoundViaHull(self.pts[i], self.pts[i + 1], self.radius).build())
 
-        return p
+        return union() (*p)
@@ -12,7 +12,7 @@ class Boss(Component):
         self.config = config
         
     def create(self):
-        return Washer(self.config['dia'], self.config['hole_dia'], self.config['thickness']).create()
+        return Washer(self.config['dia'], self.config['hole_dia'], self.config['thickness']).build()
 
 class BossPlate(Component):
 
@@ -0,0 +1,124 @@
+from solid import *
+from solid.solidpython import OpenSCADObject, py2openscad, indent, _find_include_strings, _write_code_to_file, _get_version
+
+from pyMDA.parts.tree import *
+from pyMDA.parts.tree import _ScadName
+from pyMDA.parts.trace import *
+
+#
+# Export with OpenSCAD modules
+#
+# scad_render() writes every instance of a subtree in full, e.g. each
+# hole of a SpeakerGrill or each pin of a PCBHeader. Here structurally
+# identical subtrees are hash-consed, written once as a module, and each
+# copy is replaced by a module call. Besides smaller files, OpenSCAD can
+# then reuse the cached geometry of the module.
+#
+
+def _node_key(node, child_keys):
+    params = sorted((str('$fn' if k == 'segments' else k), py2openscad(v)) for k, v in node.params.items() if v is not None)
+    import hashlib
+    s = "%s|%s|%s|%s|%s" % (type(node).__name__, node.name, node.modifier, params, ",".join(child_keys))
+    return hashlib.sha1(s.encode()).hexdigest()
+
+def find_repeated_subtrees(obj, min_nodes = 1):
+    """Return the structural keys of subtrees that occur more than once, plus the key of each node."""
+    nodes = postorder(obj)
+
+    keys = {}
+    sizes = {}
+    children = {}
+    has_holes = set()
+    unbound = set()
+    for node in nodes:
+        child_keys = [keys[id(c)] for c in node.children]
+        key = _node_key(node, child_keys)
+        keys[id(node)] = key
+        if key not in sizes:
+            sizes[key] = 1 + sum(sizes[k] for k in child_keys)
+            children[key] = child_keys
+        # SolidPython subtracts holes at the root, they can't be moved into a module
+        if node.is_hole or node.is_part_root or any(k in has_holes for k in child_keys):
+            has_holes.add(key)
+        # a module can't see the caller's loop variables, e.g. the m of a pattern's for() loop
+        if node.name != 'for' and (any(isinstance(v, _ScadName) for v in node.params.values())
+                                   or any(k in unbound for k in child_keys)):
+            unbound.add(key)
+
+    # occurrences in the fully expanded tree, parents before children (a key
+    # is first seen after the keys of its children, so sizes is in postorder)
+    occurrences = dict.fromkeys(sizes, 0)
+    occurrences[keys[id(obj)]] = 1
+    for key in reversed(list(sizes)):
+        for k in children[key]:
+            occurrences[k] += occurrences[key]
+
+    repeated = set(k for k, n in occurrences.items()
+                   if n > 1 and sizes[k] >= min_nodes and k not in has_holes and k not in unbound)
+    return repeated, keys
+
+def scad_render_modules(obj, file_header = '', min_nodes = 1):
+    """Render obj to OpenSCAD code, writing repeated subtrees once as modules."""
+    repeated, keys = find_repeated_subtrees(obj, min_nodes)
+
+    names = {}
+    bodies = {}
+    rewritten = {}
+    for node in postorder(obj):
+        key = keys[id(node)]
+        new_children = [rewritten[id(c)] for c in node.children]
+        if any(a is not b for a, b in zip(new_children, node.children)):
+            new_node = copy_node(node, new_children)
+        else:
+            new_node = node
+
+        if key in repeated:
+            if key not in names:
+                names[key] = "%s_%d" % (node.name.strip('_'), len(names) + 1)
+                bodies[key] = new_node
+            new_node = OpenSCADObject(names[key], {})
+        rewritten[id(node)] = new_node
+
+    modules = ""
+    for key, name in names.items():
+        body = copy_node(bodies[key], bodies[key].children)
+        body.parent = None
+        modules += "\nmodule %s() {%s\n}\n" % (name, indent(body._render()))
+
+    root = rewritten[id(obj)]
+    if file_header and not file_header.endswith('\n'):
+        file_header += '\n'
+    includes = ''.join(_find_include_strings(obj)) + "\n"
+    return file_header + includes + modules + root._render()
+
+def scad_render_modules_to_file(obj, filepath, file_header = '', min_nodes = 1):
+    import datetime
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    header = "// Generated by pyMDA on %s\n" % date + file_header
+    with tracer.span("serialize", "export", modules = True):
+        rendered = scad_render_modules(obj, header, min_nodes)
+    with tracer.span("write", "io", file = filepath):
+        with open(filepath, 'w') as f:
+            f.write(rendered)
+    return filepath
+
+#
+# scad_render_to_file() split into its two steps, so they can be traced
+#
+
+def scad_render_traced(obj, filepath):
+    """scad_render_to_file() with SCAD serialization and the file write as separate spans."""
+    import datetime
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with tracer.span("serialize", "export"):
+        rendered = scad_render(obj, "// Generated by SolidPython %s on %s\n" % (_get_version(), date))
+    with tracer.span("write", "io", file = filepath):
+        # appends the calling module's source, from the same stack depth as scad_render_to_file()
+        return _write_code_to_file(rendered, filepath, None, True)
+
+def openscad_render(scad_file, output, openscad = "openscad", args = ()):
+    """Render a SCAD file with the OpenSCAD command line, e.g. to an STL or PNG."""
+    import subprocess
+    with tracer.span("openscad", "render", file = scad_file, output = output):
+        subprocess.run([openscad, "-o", output] + list(args) + [scad_file], check = True)
+    return output
@@ -3,8 +3,10 @@ from solid import *
 from solid.utils import *
 
 from pyMDA.parts.core import *
+from pyMDA.parts.cache import ScadLibrary
 
-Gears = import_scad("pyMDA/cots/gears/gears.scad")
+# parsed on the first gear built
+Gears = ScadLibrary("cots", "gears", "gears.scad")
 
 class GearSpur(Component):
     
@@ -240,8 +240,8 @@ class Torus(Component): # donut
         
     def create(self):
         """Create a ring with specified dia, thickness, and segment counts."""
-        p = rotate_extrude(convexity=10, segments=self.segments_count)(
-            translate([self.dia / 2.0, 0, 0])(circle(d=self.thickness, segments=self.segments_count))
+        p = rotate_extrude(convexity=10, segments=self.segments_for((self.dia + self.thickness) / 2.0))(
+            translate([self.dia / 2.0, 0, 0])(circle(d=self.thickness, segments=self.segments_for(self.thickness / 2.0)))
         )
 
         self.origin = [0, 0, 0]
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from solid import *
 from solid.utils import *
 
@@ -52,7 +53,9 @@ class SlotCurve(Component):
             x = self.config['radius'] * math.sin(self.config['end_angle'])
             p += translate([x, y, 0]) (hole)
             
-            for a in np.arange(self.config['start_angle'], self.config['end_angle'], self.config['step']):
+            # hole spacing, the config's 'step' or else the quality profile's curve step
+            step = self.config.get('step') or get_quality().curve_step
+            for a in np.arange(self.config['start_angle'], self.config['end_angle'], step):
                 y = self.config['radius'] * math.cos(a)
                 x = self.config['radius'] * math.sin(a)
                 #print (self.config['radius'], x, y, a)
@@ -87,10 +90,10 @@ class SlotArray(Component):
         gap = (self.config['length'] - self.config['slot_count'] * (self.config['slot_length'] + self.config['slot_width'])) / (self.config['slot_count'] + 1.0)
 
         y = - self.config['length'] / 2.0 + gap + (self.config['slot_length'] + self.config['slot_width']) / 2.0
-        p = translate([0, y, 0]) (Slot(self.config['slot_width'], self.config['slot_length'], self.config['height']).create())
+        p = translate([0, y, 0]) (Slot(self.config['slot_width'], self.config['slot_length'], self.config['height']).build())
         for i in range(self.config['slot_count'] - 1):
             y += gap + (self.config['slot_length'] + self.config['slot_width'])
-            p += translate([0, y, 0]) (Slot(self.config['slot_width'], self.config['slot_length'], self.config['height'], self.use_hull).create())
+            p += translate([0, y, 0]) (Slot(self.config['slot_width'], self.config['slot_length'], self.config['height'], self.use_hull).build())
         return p
 
 
@@ -106,7 +109,7 @@ class SpeakerGrill(Component):
         
         l = int(self.config['dia'] / 2.0 / self.config['pitch'])
         
-        p = speaker_hole
+        p = [speaker_hole]
 
         for j in range(l):
             c = 2 * math.pi * (self.config['pitch'] * j + self.config['pitch'])
@@ -117,11 +120,11 @@ class SpeakerGrill(Component):
             for i in range(num):
                 x = ((self.config['pitch'] * j) + self.config['pitch']) * math.cos(angle)
                 y = ((self.config['pitch'] * j) + self.config['pitch']) * math.sin(angle)
-                p += translate([x, y, 0]) (speaker_hole)
+                p.append(translate([x, y, 0]) (speaker_hole))
                 #print angle, x, y
                 angle += angle_diff
 
-        return p
+        return union() (*p)
 
 class Funnel(Component):
 
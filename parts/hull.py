@@ -0,0 +1,292 @@
+import numpy as np
+from solid import *
+
+from pyMDA.parts.tree import copy_node
+from pyMDA.parts.mesh import _Converter, _Shape2D, _fn, _box_triangles, UnsupportedMesh
+
+#
+# Convex hulls
+#
+# convex_hull() is QuickHull over NumPy arrays: starting from a tetrahedron
+# of extreme points, each face keeps the points outside it, and the farthest
+# of them replaces the faces it can see with a fan to their horizon. The
+# distances of the orphaned points to the new faces are computed in one
+# matrix product, so the Python loop only runs once per hull vertex.
+#
+# resolve_hulls() uses it to replace hull() nodes by the polyhedron (or
+# polygon) OpenSCAD would compute, so a render doesn't hull e.g. eight
+# 64-segment spheres for every rounded box, and the exported SCAD only uses
+# primitives FreeCAD's CSG importer can read (see old/openscad_to_step.py).
+#
+
+def _planes(points, faces):
+    """Unit normals and offsets of triangles (zero normals for degenerate ones)."""
+    tri = points[np.asarray(faces, dtype = int).reshape(-1, 3)]
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(n, axis = 1, keepdims = True)
+    n = np.divide(n, length, out = np.zeros_like(n), where = length > 0)
+    return n, np.einsum('ij,ij->i', n, tri[:, 0])
+
+def _initial_simplex(points, eps):
+    """Four indices of points spanning a tetrahedron, or None if the points are flat."""
+    extremes = np.concatenate([points.argmin(axis = 0), points.argmax(axis = 0)])
+    e = points[extremes]
+    d = np.linalg.norm(e[:, None] - e[None, :], axis = 2)
+    i, j = np.unravel_index(np.argmax(d), d.shape)
+    a, b = extremes[i], extremes[j]
+    if d[i, j] <= eps:
+        return None
+    axis = (points[b] - points[a]) / d[i, j]
+    rel = points - points[a]
+    off_line = np.linalg.norm(rel - np.outer(rel @ axis, axis), axis = 1)
+    c = int(np.argmax(off_line))
+    if off_line[c] <= eps:
+        return None
+    n = np.cross(points[b] - points[a], points[c] - points[a])
+    n /= np.linalg.norm(n)
+    off_plane = rel @ n
+    d = int(np.argmax(np.abs(off_plane)))
+    if abs(off_plane[d]) <= eps:
+        return None
+    return [int(a), int(b), c, d]
+
+def convex_hull(points, eps = None):
+    """Vertices and (m, 3) triangle faces of the convex hull of (n, 3) points.
+
+    Faces are counter-clockwise seen from outside. Returns None if the
+    points don't span a volume.
+    """
+    points = np.unique(np.asarray(points, dtype = float).reshape(-1, 3), axis = 0)
+    if len(points) < 4:
+        return None
+    if eps is None:
+        eps = 1e-9 * max(float(np.abs(points).max()), 1.0)
+    simplex = _initial_simplex(points, eps)
+    if simplex is None:
+        return None
+
+    faces = {}   # id -> (a, b, c)
+    planes = {}  # id -> (normal, offset)
+    edges = {}   # directed edge (u, v) -> id of the face it belongs to
+    outside = {} # id -> indices of the points outside the face
+    counter = [0]
+
+    def add_faces(new):
+        ids = []
+        normals, offsets = _planes(points, new)
+        for face, n, offset in zip(new, normals, offsets):
+            fid = counter[0]
+            counter[0] += 1
+            faces[fid] = face
+            planes[fid] = (n, offset)
+            for k in range(3):
+                edges[(face[k], face[(k + 1) % 3])] = fid
+            ids.append(fid)
+        return ids
+
+    def assign(candidates, new_faces):
+        if not len(candidates) or not new_faces:
+            return []
+        normals = np.array([planes[f][0] for f in new_faces])
+        offsets = np.array([planes[f][1] for f in new_faces])
+        dist = points[candidates] @ normals.T - offsets
+        best = dist.argmax(axis = 1)
+        keep = dist[np.arange(len(candidates)), best] > eps
+        pending = []
+        for k, fid in enumerate(new_faces):
+            mine = candidates[keep & (best == k)]
+            if len(mine):
+                outside[fid] = mine
+                pending.append(fid)
+        return pending
+
+    # the tetrahedron, faces turned to point away from its centroid
+    a, b, c, d = simplex
+    centroid = points[simplex].mean(axis = 0)
+    initial = [(a, b, c), (a, c, d), (a, d, b), (b, d, c)]
+    normals, offsets = _planes(points, initial)
+    initial = add_faces([(f[0], f[2], f[1]) if n @ centroid > o else f for f, n, o in zip(initial, normals, offsets)])
+    rest = np.setdiff1d(np.arange(len(points)), simplex)
+    pending = assign(rest, initial)
+
+    while pending:
+        fid = pending.pop()
+        if fid not in faces or fid not in outside:
+            continue
+        candidates = outside[fid]
+        n, offset = planes[fid]
+        eye = int(candidates[np.argmax(points[candidates] @ n)])
+        p = points[eye]
+
+        # faces seen from the eye point, and the edges around them
+        visible = {fid}
+        hidden = set()
+        horizon = []
+        queue = [fid]
+        while queue:
+            g = queue.pop()
+            face = faces[g]
+            for k in range(3):
+                u, v = face[k], face[(k + 1) % 3]
+                h = edges[(v, u)]
+                if h in visible:
+                    continue
+                if h not in hidden:
+                    hn, ho = planes[h]
+                    if hn @ p - ho > eps:
+                        visible.add(h)
+                        queue.append(h)
+                        continue
+                    hidden.add(h)
+                horizon.append((u, v))
+
+        orphans = [outside.pop(g) for g in visible if g in outside]
+        for g in visible:
+            face = faces.pop(g)
+            del planes[g]
+            for k in range(3):
+                del edges[(face[k], face[(k + 1) % 3])]
+        new_faces = add_faces([(u, v, eye) for u, v in horizon])
+        orphans = np.concatenate(orphans)
+        pending.extend(assign(orphans[orphans != eye], new_faces))
+
+    tri = np.array(list(faces.values()), dtype = int)
+    used, remap = np.unique(tri, return_inverse = True)
+    return points[used], remap.reshape(-1, 3)
+
+def convex_hull_2d(points):
+    """Corners of the convex hull of (n, 2) points, counter-clockwise (monotone chain)."""
+    pts = np.unique(np.asarray(points, dtype = float).reshape(-1, 2), axis = 0)
+    if len(pts) < 3:
+        return pts
+
+    def half(seq):
+        chain = []
+        for p in seq:
+            while len(chain) >= 2:
+                o, a = chain[-2], chain[-1]
+                if (a[0] - o[0]) * (p[1] - o[1]) - (a[1] - o[1]) * (p[0] - o[0]) > 0:
+                    break
+                chain.pop()
+            chain.append(p)
+        return chain[:-1]
+    return np.array(half(pts) + half(pts[::-1]))
+
+def hull_triangles(points):
+    """Triangles of the convex hull of points, or of their box if they are flat (for mesh_from_model)."""
+    hull = convex_hull(points)
+    if hull is None:
+        return _box_triangles(points.min(axis = 0), points.max(axis = 0))
+    vertices, faces = hull
+    return vertices[faces]
+
+#
+# Pre-resolving hull() nodes
+#
+
+_polyhedron_hulls = False
+
+def set_polyhedron_hulls(enabled):
+    """Whether export_scad() writes resolvable hulls as polyhedra."""
+    global _polyhedron_hulls
+    _polyhedron_hulls = enabled
+
+def get_polyhedron_hulls():
+    return _polyhedron_hulls
+
+# nodes a hull can be computed through: no booleans, which hull the
+# children's result rather than their points, and no imports, which the
+# mesher may replace by their box
+_HULL_3D = ('cube', 'sphere', 'cylinder', 'polyhedron')
+_HULL_2D = ('square', 'circle', 'polygon')
+_HULL_THROUGH = ('union', 'color', 'group', 'hull', 'translate', 'rotate', 'scale', 'mirror', 'multmatrix')
+
+def _hull_kind(node):
+    """'3d' or '2d' if the hull of node can be computed from its children's points, else None."""
+    kinds = set()
+    stack = list(node.children)
+    seen = set()
+    while stack:
+        n = stack.pop()
+        if id(n) in seen:
+            continue
+        seen.add(id(n))
+        if n.modifier or n.is_hole:
+            return None
+        if n.name in _HULL_3D or n.name == 'rotate_extrude':
+            kinds.add('3d')
+        elif n.name == 'linear_extrude':
+            if n.params.get('twist') or n.params.get('scale') not in (None, 1):
+                return None
+            kinds.add('3d')
+        elif n.name in _HULL_2D:
+            kinds.add('2d')
+        elif n.name not in _HULL_THROUGH:
+            return None
+        if n.name in ('linear_extrude', 'rotate_extrude'):
+            # the outline only needs to be flat and boolean free
+            if _hull_kind(n) != '2d':
+                return None
+            continue
+        stack.extend(n.children)
+    return kinds.pop() if len(kinds) == 1 else None
+
+def _hull_node(node, fn):
+    """polyhedron() or polygon() equal to the hull node, or None."""
+    kind = _hull_kind(node)
+    try:
+        if kind == '3d':
+            pts = _Converter(hull_triangles).points(node.children, np.identity(4), fn)
+            hull = convex_hull(pts) if len(pts) else None
+            if hull is None:
+                return None
+            vertices, faces = hull
+            # OpenSCAD lists the corners of a face clockwise seen from outside
+            return polyhedron(points = vertices.tolist(), faces = faces[:, ::-1].tolist())
+        if kind == '2d':
+            shape = _Shape2D().convert_children(node.children, np.identity(4), fn)
+            polys = []
+            stack = [shape] if shape is not None else []
+            while stack:
+                op, arg = stack.pop()
+                if op == 'poly':
+                    polys.append(arg)
+                else:
+                    stack.extend(e for e in arg if e is not None)
+            if not polys:
+                return None
+            corners = convex_hull_2d(np.concatenate(polys))
+            return polygon(points = corners.tolist()) if len(corners) >= 3 else None
+    except UnsupportedMesh:
+        pass
+    return None
+
+def resolve_hulls(obj):
+    """Return obj with each hull() of plain primitives replaced by the equivalent polyhedron or polygon.
+
+    Hulls over booleans, modifiers or holes are left to OpenSCAD. The
+    original nodes are not modified.
+    """
+    rewritten = {}
+    stack = [(obj, 0, False)]
+    while stack:
+        node, fn, expanded = stack.pop()
+        key = (id(node), fn)
+        if key in rewritten:
+            continue
+        child_fn = _fn(node, fn)
+        if not expanded:
+            stack.append((node, fn, True))
+            stack.extend((c, child_fn, False) for c in node.children if (id(c), child_fn) not in rewritten)
+            continue
+
+        children = [rewritten[(id(c), child_fn)] for c in node.children]
+        new_node = node
+        if any(a is not b for a, b in zip(children, node.children)):
+            new_node = copy_node(node, children)
+        if node.name == 'hull' and not node.modifier and not node.is_hole and not node.is_part_root:
+            resolved = _hull_node(new_node, child_fn)
+            if resolved is not None:
+                new_node = resolved
+        rewritten[key] = new_node
+    return rewritten[(id(obj), 0)]
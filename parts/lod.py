@@ -0,0 +1,145 @@
+import os
+import sys
+import argparse
+import numpy as np
+from solid import import_stl
+
+from pyMDA.parts.cache import cache_dir, file_hash, package_path
+from pyMDA.parts.stl import StlMesh, load_stl, resolve_stl_path, write_stl, _stl_files
+from pyMDA.parts.quality import get_quality
+
+#
+# Levels of detail for COTS meshes
+#
+# Vendor STLs carry fillets and lettering nobody needs in a draft preview.
+# decimate() reduces a mesh to a triangle budget by vertex clustering with
+# quadric placement (Lindstrom's out-of-core simplification), not by the
+# iterative quadric error edge collapse of Garland and Heckbert: vertices
+# are grouped in a grid, each group is replaced by the point that minimizes
+# the summed squared distances to the planes of its faces, and faces left
+# with fewer than three distinct corners are dropped. The grid spacing is
+# searched for the one that meets the budget. Clustering is one vectorized
+# pass per spacing, where edge collapse needs a priority queue updated one
+# edge at a time, but it doesn't adapt to the detail of the surface: flat
+# regions keep as many vertices as curved ones.
+#
+# cots_stl() is import_stl() for these assets: with a stl_lod set in the
+# quality profile it imports a reduced copy, written once per file content
+# and ratio under cache_dir("stl", "lod") next to the welded mesh cache.
+# The asset directories are never written to. A draft export refers to the
+# copies by their absolute paths, so it only renders on the machine (or
+# with the PYMDA_CACHE_DIR) it was written with.
+#
+
+# meshes reduced below this are kept as they are
+MIN_LOD_TRIANGLES = 200
+
+def _face_quadrics(vertices, faces):
+    """(m, 4, 4) area weighted plane quadrics of the faces."""
+    tris = vertices[faces]
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    area = np.linalg.norm(n, axis = 1)
+    unit = np.divide(n, area[:, None], out = np.zeros_like(n), where = area[:, None] > 0)
+    plane = np.column_stack([unit, -np.einsum('ij,ij->i', unit, tris[:, 0])])
+    return 0.5 * area[:, None, None] * plane[:, :, None] * plane[:, None, :]
+
+def _cluster(vertices, faces, quadrics, cell):
+    """Vertices and faces after merging the vertices in each grid cell of size cell."""
+    lo = vertices.min(axis = 0)
+    keys = np.floor((vertices - lo) / cell).astype(np.int64)
+    _, cluster = np.unique(keys, axis = 0, return_inverse = True)
+    cluster = cluster.ravel()
+    k = cluster.max() + 1
+
+    # quadric of each cluster, summed over the faces around its vertices
+    q = np.zeros((k, 4, 4))
+    for corner in range(3):
+        np.add.at(q, cluster[faces[:, corner]], quadrics)
+
+    count = np.bincount(cluster, minlength = k)[:, None]
+    mean = np.zeros((k, 3))
+    np.add.at(mean, cluster, vertices)
+    mean /= count
+    c_lo = np.full((k, 3), np.inf)
+    c_hi = np.full((k, 3), -np.inf)
+    np.minimum.at(c_lo, cluster, vertices)
+    np.maximum.at(c_hi, cluster, vertices)
+
+    # minimize v^T A v + 2 b^T v, falling back to the mean for flat or linear clusters
+    a = q[:, :3, :3]
+    b = q[:, :3, 3]
+    ok = np.abs(np.linalg.det(a)) > 1e-9 * np.maximum(np.einsum('kii->k', a), 1e-30) ** 3
+    points = mean.copy()
+    if np.any(ok):
+        points[ok] = np.linalg.solve(a[ok], -b[ok][:, :, None])[:, :, 0]
+    # keep each point within its cluster so thin features don't spike out
+    points = np.clip(points, c_lo, c_hi)
+
+    new_faces = cluster[faces]
+    keep = (new_faces[:, 0] != new_faces[:, 1]) & (new_faces[:, 1] != new_faces[:, 2]) & (new_faces[:, 0] != new_faces[:, 2])
+    new_faces = new_faces[keep]
+    # faces collapsed onto the same three clusters
+    _, first = np.unique(np.sort(new_faces, axis = 1), axis = 0, return_index = True)
+    new_faces = new_faces[np.sort(first)]
+
+    used, remap = np.unique(new_faces, return_inverse = True)
+    return points[used], remap.reshape(-1, 3)
+
+def decimate(mesh, ratio, iterations = 16):
+    """StlMesh reduced to about ratio of the faces of mesh, by grid vertex clustering (see the notes above)."""
+    target = max(int(len(mesh.faces) * ratio), MIN_LOD_TRIANGLES)
+    if target >= len(mesh.faces):
+        return mesh
+    vertices = mesh.vertices
+    quadrics = _face_quadrics(vertices, mesh.faces)
+    size = float((vertices.max(axis = 0) - vertices.min(axis = 0)).max())
+
+    # the face count falls as the cells grow, bisect on a log scale
+    small, large = size * 1e-4, size
+    best = None
+    for _ in range(iterations):
+        cell = (small * large) ** 0.5
+        v, f = _cluster(vertices, mesh.faces, quadrics, cell)
+        if len(f) > target:
+            small = cell
+        else:
+            large = cell
+            best = (v, f)
+        if best is not None and len(best[1]) >= 0.9 * target:
+            break
+    if best is None:
+        best = _cluster(vertices, mesh.faces, quadrics, large)
+    return StlMesh(best[0], best[1], mesh.filename)
+
+def lod_path(filename, ratio):
+    """Absolute path of the reduced copy of an STL file in the mesh cache, written if it doesn't exist yet."""
+    path = resolve_stl_path(filename)
+    name = "%s-%s-%g.stl" % (os.path.splitext(os.path.basename(path))[0], file_hash(path)[:12], ratio)
+    lod = os.path.abspath(os.path.join(cache_dir("stl", "lod"), name))
+    if not os.path.exists(lod):
+        write_stl(lod, decimate(load_stl(path), ratio))
+    return lod
+
+def cots_stl(filename):
+    """import_stl() of an asset, at the level of detail of the quality profile."""
+    ratio = get_quality().stl_lod
+    if ratio is None or not os.path.exists(resolve_stl_path(filename)):
+        return import_stl(filename)
+    return import_stl(lod_path(filename, ratio))
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Write reduced copies of the COTS STL meshes")
+    parser.add_argument('ratios', nargs='*', type=float, default=[0.1, 0.01], help='Fractions of the triangles to keep')
+    parser.add_argument('--root', help='Directory to scan for STL files (default: cots/)')
+    args = parser.parse_args(argv)
+
+    root = args.root or package_path("cots")
+    for path in _stl_files(root):
+        counts = ["%d" % len(load_stl(path).faces)]
+        for ratio in args.ratios:
+            counts.append("%d" % len(load_stl(lod_path(path, ratio)).faces))
+        print("%-60s %s" % (os.path.relpath(path, package_path()), " -> ".join(counts)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,606 @@
+import math
+import numpy as np
+from solid import *
+
+from pyMDA.parts.transforms import *
+from pyMDA.parts.tree import _ScadName
+from pyMDA.parts.stl import load_stl, stl_info
+
+#
+# Triangle meshes of SolidPython trees
+#
+# Primitives are tessellated the way OpenSCAD does it (same $fn/$fa/$fs
+# fragments), each one as a closed shell. Booleans aren't evaluated, instead
+# a Mesh keeps a CSG expression over its shells ('shell', i), ('union', [...]),
+# ('difference', [...]), ('intersection', [...]) so whether a point is in the
+# solid can still be answered exactly from the ray parity of each shell.
+#
+
+class UnsupportedMesh(Exception):
+    """The tree uses an operation that can't be meshed here."""
+    pass
+
+# OpenSCAD defaults
+DEFAULT_FA = 12.0
+DEFAULT_FS = 2.0
+
+# imported STLs with more triangles are meshed as their bounding box, as
+# interference checks go over every pair of edge and face near the overlap
+MAX_IMPORT_TRIANGLES = 20000
+
+def get_fragments(r, fn = 0, fa = DEFAULT_FA, fs = DEFAULT_FS):
+    """Number of segments OpenSCAD uses for a circle of radius r."""
+    if r < 1e-10:
+        return 3
+    if fn and fn > 0:
+        return max(int(fn), 3)
+    return int(math.ceil(max(min(360.0 / fa, r * 2 * math.pi / fs), 5)))
+
+class Mesh:
+
+    def __init__(self, triangles, shell_start, expr):
+        self.triangles = np.asarray(triangles, dtype = float).reshape(-1, 3, 3)
+        self.shell_start = np.asarray(shell_start, dtype = int)
+        self.expr = expr
+
+    def __len__(self):
+        return len(self.triangles)
+
+    @classmethod
+    def box(cls, lo, hi):
+        return cls(_box_triangles(lo, hi), [0], ('shell', 0))
+
+    def bounds(self):
+        pts = self.triangles.reshape(-1, 3)
+        return pts.min(axis = 0), pts.max(axis = 0)
+
+    def solid_bounds(self):
+        """Bounds (min, max) of the solid, leaving out shells that are only subtracted, None if empty."""
+        if self.expr is None or len(self) == 0:
+            return None
+        lo = np.minimum.reduceat(self.triangles.min(axis = 1), self.shell_start)
+        hi = np.maximum.reduceat(self.triangles.max(axis = 1), self.shell_start)
+        return _box_bounds(self.expr, lo, hi)
+
+    def transformed(self, m):
+        tris = transform_points(m, self.triangles.reshape(-1, 3)).reshape(-1, 3, 3)
+        return Mesh(tris, self.shell_start, self.expr)
+
+    def normals(self):
+        t = self.triangles
+        n = np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])
+        length = np.linalg.norm(n, axis = 1, keepdims = True)
+        return np.divide(n, length, out = np.zeros_like(n), where = length > 0)
+
+    def contains(self, points):
+        """Boolean array, True for the points inside the solid."""
+        points = np.asarray(points, dtype = float).reshape(-1, 3)
+        if len(self) == 0 or len(points) == 0:
+            return np.zeros(len(points), dtype = bool)
+        hits = np.zeros((len(points), len(self)), dtype = np.int64)
+        for lo in range(0, len(points), 64):
+            hits[lo:lo + 64] = _ray_hits(points[lo:lo + 64], self.triangles)
+        inside = np.add.reduceat(hits, self.shell_start, axis = 1) % 2 == 1
+        return _evaluate(self.expr, inside)
+
+def _evaluate(expr, inside):
+    op, arg = expr
+    if op == 'shell':
+        return inside[:, arg]
+    values = [_evaluate(e, inside) for e in arg]
+    if op == 'union':
+        return np.logical_or.reduce(values)
+    if op == 'intersection':
+        return np.logical_and.reduce(values)
+    result = values[0].copy()
+    for v in values[1:]:
+        result &= ~v
+    return result
+
+def _box_bounds(expr, lo, hi):
+    op, arg = expr
+    if op == 'shell':
+        return lo[arg], hi[arg]
+    boxes = [_box_bounds(e, lo, hi) for e in arg]
+    if op == 'difference':
+        return boxes[0]
+    if any(b is None for b in boxes):
+        return None
+    los = np.array([b[0] for b in boxes])
+    his = np.array([b[1] for b in boxes])
+    if op == 'union':
+        return los.min(axis = 0), his.max(axis = 0)
+    # intersection
+    lo_i, hi_i = los.max(axis = 0), his.min(axis = 0)
+    return None if np.any(lo_i > hi_i) else (lo_i, hi_i)
+
+# a direction unlikely to graze edges of axis aligned geometry
+_RAY = np.array([0.5773502691896258, 0.5773654021, 0.5773351356])
+
+def _ray_hits(points, triangles):
+    """(k, n) array, 1 where a ray from each point crosses each triangle."""
+    v0 = triangles[:, 0]
+    e1 = triangles[:, 1] - v0
+    e2 = triangles[:, 2] - v0
+    p = np.cross(_RAY, e2)
+    det = np.einsum('ij,ij->i', e1, p)
+    ok = np.abs(det) > 1e-14
+    inv = np.divide(1.0, det, out = np.zeros_like(det), where = ok)
+    s = points[:, None, :] - v0[None]
+    u = np.einsum('kij,ij->ki', s, p) * inv
+    q = np.cross(s, e1[None])
+    v = (q @ _RAY) * inv
+    t = np.einsum('kij,ij->ki', q, e2) * inv
+    return (ok & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)).astype(np.int64)
+
+#
+# Tessellation
+#
+
+def _box_triangles(lo, hi):
+    (x0, y0, z0), (x1, y1, z1) = lo, hi
+    c = np.array([[x0, y0, z0], [x1, y0, z0], [x1, y1, z0], [x0, y1, z0],
+                  [x0, y0, z1], [x1, y0, z1], [x1, y1, z1], [x0, y1, z1]], dtype = float)
+    faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+    return c[_fan(faces)]
+
+def _fan(faces):
+    """Triangle indices of convex faces, as a (n, 3) array."""
+    return np.array([[f[0], f[i], f[i + 1]] for f in faces for i in range(1, len(f) - 1)], dtype = int).reshape(-1, 3)
+
+def _circle(r, n):
+    a = np.radians(360.0 * np.arange(n) / n)
+    return np.column_stack([r * np.cos(a), r * np.sin(a)])
+
+def _triangulate(points):
+    """Ear clipping of a simple polygon, returns (n, 3) indices."""
+    pts = np.asarray(points, dtype = float)
+    n = len(pts)
+    if n < 3:
+        return np.zeros((0, 3), dtype = int)
+    area = np.sum(pts[:, 0] * np.roll(pts[:, 1], -1) - np.roll(pts[:, 0], -1) * pts[:, 1])
+    idx = list(range(n)) if area >= 0 else list(range(n - 1, -1, -1))
+
+    def cross(a, b, c):
+        return (pts[b][0] - pts[a][0]) * (pts[c][1] - pts[a][1]) - (pts[b][1] - pts[a][1]) * (pts[c][0] - pts[a][0])
+
+    tris = []
+    guard = 0
+    while len(idx) > 3 and guard < 2 * n * n:
+        guard += 1
+        for i in range(len(idx)):
+            a, b, c = idx[i - 1], idx[i], idx[(i + 1) % len(idx)]
+            if cross(a, b, c) <= 0:
+                continue
+            if any(cross(a, b, p) >= 0 and cross(b, c, p) >= 0 and cross(c, a, p) >= 0
+                   for p in idx if p not in (a, b, c)):
+                continue
+            tris.append((a, b, c))
+            idx.pop(i)
+            break
+        else:
+            break
+    # whatever is left (degenerate input) as a fan
+    tris.extend((idx[0], idx[i], idx[i + 1]) for i in range(1, len(idx) - 1))
+    return np.array(tris, dtype = int).reshape(-1, 3)
+
+def _sphere(r, n):
+    rings = (n + 1) // 2
+    circles = []
+    for i in range(rings):
+        phi = math.pi * (i + 0.5) / rings
+        ring = _circle(r * math.sin(phi), n)
+        circles.append(np.column_stack([ring, np.full(n, r * math.cos(phi))]))
+    pts = np.concatenate(circles)
+    faces = [list(range(n - 1, -1, -1))]
+    for i in range(rings - 1):
+        a, b = i * n, (i + 1) * n
+        faces.extend([a + j, b + j, b + (j + 1) % n, a + (j + 1) % n] for j in range(n))
+    faces.append([(rings - 1) * n + j for j in range(n)])
+    return pts[_fan(faces)]
+
+def _prism(poly, z0, z1):
+    """Closed shell of a 2D polygon extruded from z0 to z1."""
+    poly = np.asarray(poly, dtype = float)
+    n = len(poly)
+    bottom = np.column_stack([poly, np.full(n, z0)])
+    top = np.column_stack([poly, np.full(n, z1)])
+    caps = _triangulate(poly)
+    sides = [[j, (j + 1) % n, n + (j + 1) % n, n + j] for j in range(n)]
+    pts = np.concatenate([bottom, top])
+    return np.concatenate([pts[caps[:, ::-1]], pts[caps + n], pts[_fan(sides)]])
+
+def _revolve(poly, n, angle):
+    """Closed shell of a 2D polygon (x >= 0) rotated about the Z axis."""
+    poly = np.asarray(poly, dtype = float)
+    k = len(poly)
+    full = angle >= 360.0
+    steps = n if full else max(int(math.ceil(n * angle / 360.0)), 1)
+    a = np.radians(angle * np.arange(steps + (0 if full else 1)) / steps)
+    rings = [np.column_stack([poly[:, 0] * math.cos(t), poly[:, 0] * math.sin(t), poly[:, 1]]) for t in a]
+    pts = np.concatenate(rings)
+    faces = []
+    for i in range(len(rings) if full else len(rings) - 1):
+        r0, r1 = i * k, ((i + 1) % len(rings)) * k
+        faces.extend([r0 + j, r0 + (j + 1) % k, r1 + (j + 1) % k, r1 + j] for j in range(k))
+    tris = [pts[_fan(faces)]]
+    if not full:
+        caps = _triangulate(poly)
+        tris.append(pts[caps[:, ::-1]])
+        tris.append(pts[caps + (len(rings) - 1) * k])
+    return np.concatenate(tris)
+
+#
+# Tree conversion
+#
+
+def _get(params, key, default = None):
+    # SolidPython keeps unset arguments as None
+    value = params.get(key)
+    return default if value is None else value
+
+def _vector(v, n, fill):
+    return (list(v) + [fill] * n)[:n]
+
+def _node_matrix(node):
+    name, params = node.name, node.params
+    if name == 'translate':
+        return translation_matrix(_vector(_get(params, 'v', []), 3, 0))
+    if name == 'rotate':
+        a = _get(params, 'a', 0)
+        v = params.get('v')
+        if np.ndim(a) == 0:
+            if v is None:
+                return rotation_matrix([0, 0, a])
+            axis = plane_normal(v)
+            k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+            t = math.radians(a)
+            m = np.identity(4)
+            m[:3, :3] = np.identity(3) + math.sin(t) * k + (1 - math.cos(t)) * k @ k
+            return m
+        return rotation_matrix(_vector(a, 3, 0))
+    if name == 'scale':
+        v = _get(params, 'v', 1)
+        v = [v] * 3 if np.ndim(v) == 0 else _vector(v, 3, 1)
+        return np.diag(list(v) + [1.0])
+    if name == 'mirror':
+        n = plane_normal(_vector(params.get('v'), 3, 0))
+        m = np.identity(4)
+        m[:3, :3] -= 2 * np.outer(n, n)
+        return m
+    if name == 'multmatrix':
+        return _matrix(params.get('m'))
+    return None
+
+def _matrix(rows):
+    """4x4 matrix of a multmatrix() argument, which may leave out the last rows or column."""
+    m = np.identity(4)
+    rows = np.asarray(rows, dtype = float)
+    m[:rows.shape[0], :rows.shape[1]] = rows
+    return m
+
+_PASS_THROUGH = ('union', 'color', 'render', 'group')
+_TRANSFORMS = ('translate', 'rotate', 'scale', 'mirror', 'multmatrix')
+_2D = ('square', 'circle', 'polygon', 'text', 'projection', 'offset')
+
+class _Builder:
+
+    def __init__(self):
+        self.triangles = []
+        self.starts = []
+        self.count = 0
+
+    def shell(self, tris):
+        tris = np.asarray(tris, dtype = float).reshape(-1, 3, 3)
+        if len(tris) == 0:
+            return None
+        self.starts.append(self.count)
+        self.triangles.append(tris)
+        self.count += len(tris)
+        return ('shell', len(self.starts) - 1)
+
+    def mesh(self, expr):
+        if expr is None:
+            return Mesh(np.zeros((0, 3, 3)), [], None)
+        return Mesh(np.concatenate(self.triangles), self.starts, expr)
+
+def _combine(op, exprs):
+    exprs = [e for e in exprs if e is not None] if op == 'union' else exprs
+    if op == 'union':
+        if not exprs:
+            return None
+        return exprs[0] if len(exprs) == 1 else ('union', exprs)
+    if op == 'difference':
+        if exprs[0] is None:
+            return None
+        rest = [e for e in exprs[1:] if e is not None]
+        return ('difference', [exprs[0]] + rest) if rest else exprs[0]
+    # intersection
+    if any(e is None for e in exprs):
+        return None
+    return exprs[0] if len(exprs) == 1 else ('intersection', exprs)
+
+def _fn(node, fn):
+    return _get(node.params, 'segments', _get(node.params, '$fn', fn))
+
+class _Converter:
+
+    def __init__(self, fallback_hull = None, import_boxes = False):
+        self.builder = _Builder()
+        # imported STLs as their bounding box, from the metadata cache
+        self.import_boxes = import_boxes
+        self.holes = []
+        # hull(points) -> triangles, a box of the points by default
+        self.hull = fallback_hull or (lambda pts: _box_triangles(pts.min(axis = 0), pts.max(axis = 0)))
+
+    def convert(self, node, m, fn, in_hole = False):
+        if node.modifier in ('*', '%'):
+            return None
+        if node.is_hole and not in_hole:
+            # SolidPython subtracts holes at the top of the tree
+            self.holes.append(self.convert(node, m, fn, True))
+            return None
+
+        name = node.name
+        fn = _fn(node, fn)
+        children = node.children
+        if name in _PASS_THROUGH:
+            return _combine('union', [self.convert(c, m, fn, in_hole) for c in children])
+        if name in ('difference', 'intersection'):
+            return _combine(name, [self.convert(c, m, fn, in_hole) for c in children]) if children else None
+        if name in _TRANSFORMS:
+            mm = m @ _node_matrix(node)
+            return _combine('union', [self.convert(c, mm, fn, in_hole) for c in children])
+        if name == 'for':
+            return _combine('union', [self.convert(g, m @ _matrix(mm), fn, in_hole)
+                                      for mm in _get(node.params, 'm', [])
+                                      for c in children for g in self.loop_body(c)])
+        if name in ('cube', 'sphere', 'cylinder', 'polyhedron'):
+            return self.builder.shell(transform_points(m, _primitive(node, fn).reshape(-1, 3)))
+        if name == 'import':
+            return self.builder.shell(transform_points(m, _imported(node, self.import_boxes).reshape(-1, 3)))
+        if name == 'hull':
+            pts = self.points(children, m, fn)
+            return self.builder.shell(self.hull(pts)) if len(pts) else None
+        if name in ('linear_extrude', 'rotate_extrude'):
+            return self.extrude(node, m, fn)
+        if name in _2D:
+            # 2D objects in a 3D tree are ignored by OpenSCAD
+            return None
+        raise UnsupportedMesh(name)
+
+    def loop_body(self, child):
+        """Children of the multmatrix(m = m) a pattern's for() loop places its model with."""
+        if child.name != 'multmatrix' or not isinstance(child.params.get('m'), _ScadName):
+            raise UnsupportedMesh('for')
+        if child.modifier in ('*', '%'):
+            return []
+        return child.children
+
+    def points(self, children, m, fn):
+        """Vertices of the children, for hull()."""
+        sub = _Converter(self.hull, self.import_boxes)
+        exprs = [sub.convert(c, m, fn) for c in children]
+        if not sub.builder.triangles or all(e is None for e in exprs):
+            return np.zeros((0, 3))
+        return np.concatenate(sub.builder.triangles).reshape(-1, 3)
+
+    def extrude(self, node, m, fn):
+        params = node.params
+        shape = _Shape2D().convert_children(node.children, np.identity(4), fn)
+        if shape is None:
+            return None
+        if node.name == 'linear_extrude':
+            if _get(params, 'twist', 0) or np.any(np.asarray(_get(params, 'scale', 1)) != 1):
+                raise UnsupportedMesh('linear_extrude with twist or scale')
+            h = _get(params, 'height', 100)
+            z0 = -h / 2.0 if _get(params, 'center', False) else 0.0
+            make = lambda poly: _prism(poly, z0, z0 + h)
+        else:
+            angle = _get(params, 'angle', 360)
+            make = lambda poly: _revolve(poly, get_fragments(np.abs(poly[:, 0]).max(), fn), min(abs(angle), 360))
+
+        def build(expr):
+            op, arg = expr
+            if op == 'poly':
+                return self.builder.shell(transform_points(m, make(arg).reshape(-1, 3)))
+            return _combine(op, [build(e) for e in arg])
+        return build(shape)
+
+def _primitive(node, fn):
+    params = node.params
+    if node.name == 'cube':
+        size = _get(params, 'size', 1)
+        size = np.array([size] * 3 if np.ndim(size) == 0 else size, dtype = float)
+        lo = -size / 2.0 if _get(params, 'center', False) else np.zeros(3)
+        return _box_triangles(lo, lo + size)
+    if node.name == 'sphere':
+        r = _get(params, 'r', _get(params, 'd', 2) / 2.0)
+        return _sphere(r, get_fragments(r, fn))
+    if node.name == 'cylinder':
+        h = _get(params, 'h', 1)
+        r = _get(params, 'r', _get(params, 'd', 2) / 2.0)
+        r1 = _get(params, 'r1', _get(params, 'd1', 2 * r) / 2.0)
+        r2 = _get(params, 'r2', _get(params, 'd2', 2 * r) / 2.0)
+        n = get_fragments(max(r1, r2), fn)
+        z0 = -h / 2.0 if _get(params, 'center', False) else 0.0
+        pts = np.concatenate([np.column_stack([_circle(r1, n), np.full(n, z0)]),
+                              np.column_stack([_circle(r2, n), np.full(n, z0 + h)])])
+        faces = [list(range(n - 1, -1, -1)), list(range(n, 2 * n))]
+        faces.extend([j, (j + 1) % n, n + (j + 1) % n, n + j] for j in range(n))
+        return pts[_fan(faces)]
+    # polyhedron
+    pts = np.asarray(params.get('points'), dtype = float)
+    faces = _get(params, 'faces', params.get('triangles'))
+    return pts[_fan(faces)]
+
+def _imported(node, box = False):
+    filename = str(_get(node.params, 'file', ''))
+    if not filename.lower().endswith('.stl'):
+        raise UnsupportedMesh('import of %s' % filename)
+    try:
+        if box:
+            info = stl_info(filename)
+            return _box_triangles(np.array(info["min"]), np.array(info["max"]))
+        stl = load_stl(filename)
+    except OSError:
+        raise UnsupportedMesh('import of missing file %s' % filename)
+    except ValueError:
+        raise UnsupportedMesh('import of unreadable file %s' % filename)
+    if len(stl) > MAX_IMPORT_TRIANGLES:
+        return _box_triangles(*stl.bounds())
+    return stl.triangles()
+
+class _Shape2D:
+    """2D subtrees as CSG expressions over ('poly', points) leaves."""
+
+    def convert_children(self, children, m, fn):
+        return _combine('union', [self.convert(c, m, fn) for c in children])
+
+    def convert(self, node, m, fn):
+        if node.modifier in ('*', '%'):
+            return None
+        name = node.name
+        fn = _fn(node, fn)
+        params = node.params
+        if name in _PASS_THROUGH:
+            return self.convert_children(node.children, m, fn)
+        if name in ('difference', 'intersection'):
+            return _combine(name, [self.convert(c, m, fn) for c in node.children]) if node.children else None
+        if name in _TRANSFORMS:
+            return self.convert_children(node.children, m @ _node_matrix(node), fn)
+        if name == 'square':
+            size = _get(params, 'size', 1)
+            size = np.array([size] * 2 if np.ndim(size) == 0 else size, dtype = float)
+            lo = -size / 2.0 if _get(params, 'center', False) else np.zeros(2)
+            pts = np.array([lo, [lo[0] + size[0], lo[1]], lo + size, [lo[0], lo[1] + size[1]]])
+            return self.poly(m, pts)
+        if name == 'circle':
+            r = _get(params, 'r', _get(params, 'd', 2) / 2.0)
+            return self.poly(m, _circle(r, get_fragments(r, fn)))
+        if name == 'polygon':
+            pts = np.asarray(params.get('points'), dtype = float)[:, :2]
+            paths = params.get('paths')
+            if not paths:
+                return self.poly(m, pts)
+            # the first path is the outline, the others holes
+            return _combine('difference', [self.poly(m, pts[paths[0]])] + [self.poly(m, pts[p]) for p in paths[1:]])
+        raise UnsupportedMesh(name)
+
+    def poly(self, m, pts):
+        pts3 = np.column_stack([pts, np.zeros(len(pts))])
+        return ('poly', transform_points(m, pts3)[:, :2])
+
+def mesh_from_model(model, hull = None, import_boxes = False):
+    """Mesh of a SolidPython tree, raises UnsupportedMesh for operations it can't mesh."""
+    converter = _Converter(hull, import_boxes)
+    expr = converter.convert(model, np.identity(4), 0)
+    holes = [h for h in converter.holes if h is not None]
+    if holes:
+        expr = _combine('difference', [expr] + holes)
+    return converter.builder.mesh(expr)
+
+def model_bounds(model):
+    """Bounds (min, max) of a SolidPython tree, with imported STLs measured from their cached metadata.
+
+    Rotated imports are bounded by their rotated box, which is exact for
+    the quarter turns parts are usually placed with.
+    """
+    try:
+        return mesh_from_model(model, import_boxes = True).solid_bounds()
+    except UnsupportedMesh:
+        return None
+
+#
+# Interference of two meshes
+#
+
+def _segment_hits(a, b, triangles):
+    """(m, n) mask and parameters of segments a -> b crossing triangles."""
+    v0 = triangles[:, 0]
+    e1 = triangles[:, 1] - v0
+    e2 = triangles[:, 2] - v0
+    d = b - a
+    p = np.cross(d[:, None, :], e2[None])
+    det = np.einsum('mnj,nj->mn', p, e1)
+    ok = np.abs(det) > 1e-14
+    inv = np.divide(1.0, det, out = np.zeros_like(det), where = ok)
+    s = a[:, None, :] - v0[None]
+    u = np.einsum('mnj,mnj->mn', s, p) * inv
+    q = np.cross(s, e1[None])
+    v = np.einsum('mnj,mj->mn', q, d) * inv
+    t = np.einsum('mnj,nj->mn', q, e2) * inv
+    hit = ok & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)
+    return hit, t
+
+def _in_box(triangles, lo, hi):
+    return np.all((triangles.min(axis = 1) <= hi) & (triangles.max(axis = 1) >= lo), axis = 1)
+
+def _crossings(a, b, lo, hi, tolerance):
+    """Yield arrays of points (with the normals of both faces) where edges of a cross faces of b."""
+    keep_a = _in_box(a.triangles, lo, hi)
+    keep_b = _in_box(b.triangles, lo, hi)
+    tri_a = a.triangles[keep_a]
+    tri_b = b.triangles[keep_b]
+    if len(tri_a) == 0 or len(tri_b) == 0:
+        return
+    n_a = a.normals()[keep_a]
+    n_b = b.normals()[keep_b]
+
+    starts = np.concatenate([tri_a[:, 0], tri_a[:, 1], tri_a[:, 2]])
+    ends = np.concatenate([tri_a[:, 1], tri_a[:, 2], tri_a[:, 0]])
+    normals = np.concatenate([n_a, n_a, n_a])
+    chunk = max(1, 2000000 // len(tri_b))
+    for lo_i in range(0, len(starts), chunk):
+        s, e = starts[lo_i:lo_i + chunk], ends[lo_i:lo_i + chunk]
+        hit, t = _segment_hits(s, e, tri_b)
+        i, j = np.nonzero(hit)
+        if len(i):
+            pts = s[i] + t[i, j][:, None] * (e[i] - s[i])
+            yield pts, normals[lo_i:lo_i + chunk][i], n_b[j]
+
+def meshes_interfere(a, b, tolerance = 1e-3):
+    """True if the solids of two meshes overlap by more than tolerance.
+
+    Where a face of one mesh crosses a face of the other, points just off
+    the crossing are tested against both solids. A mesh lying fully inside
+    the other is found by testing points just inside its faces.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return False
+    a_lo, a_hi = a.bounds()
+    b_lo, b_hi = b.bounds()
+    lo = np.maximum(a_lo, b_lo) - tolerance
+    hi = np.minimum(a_hi, b_hi) + tolerance
+    if np.any(lo > hi):
+        return False
+
+    def overlap(points):
+        return bool(np.any(a.contains(points) & b.contains(points)))
+
+    for first, second in ((a, b), (b, a)):
+        for pts, n1, n2 in _crossings(first, second, lo, hi, tolerance):
+            # one point in each quarter around the crossing
+            offsets = [n1 + n2, n1 - n2, n2 - n1, -n1 - n2]
+            probes = np.concatenate([pts + tolerance * o for o in offsets])
+            for k in range(0, len(probes), 256):
+                if overlap(probes[k:k + 256]):
+                    return True
+
+    # containment, probe just inside and outside a sample of faces
+    for inner in (a, b):
+        keep = _in_box(inner.triangles, lo, hi)
+        tris = inner.triangles[keep]
+        if len(tris) == 0:
+            continue
+        step = max(1, len(tris) // 128)
+        centers = tris[::step].mean(axis = 1)
+        normals = inner.normals()[keep][::step]
+        if overlap(np.concatenate([centers + tolerance * normals, centers - tolerance * normals])):
+            return True
+    return False
+
+def interfere_task(args):
+    """meshes_interfere() of (a, b, matrix of b in a, tolerance), for process pools."""
+    a, b, m, tolerance = args
+    return meshes_interfere(a, b.transformed(m), tolerance)
@@ -4,6 +4,7 @@ from solid.utils import *
 
 from pyMDA.parts.core import *
 from pyMDA.parts.geometry import *
+from pyMDA.parts.rounded import *
 
 class PlateWithMountingHoles(Component):
 
@@ -80,14 +81,19 @@ class PlateWithMountingHolesEdges(Component):
 
 class PlateWithFillets(Component):
 
-    def __init__(self, config):
+    def __init__(self, config, use_polyhedron = False):
         super().__init__()
         self.config = config
+        self.use_polyhedron = use_polyhedron # one polyhedron instead of a union of cubes and cylinders
     
     def create(self):
 
         # could be done with hull(), but done this way to support FreeCAD STEP exporting
 
+        if self.use_polyhedron:
+            r = self.config['fillet_radius']
+            return rounded_prism([self.config['width'], self.config['length'], self.config['thickness']], r, self.segments_for(r))
+
         x = self.config['width'] - self.config['fillet_radius'] * 2.0
         y = self.config['length'] - self.config['fillet_radius'] * 2.0
 
@@ -140,7 +146,7 @@ class Pulley(Component):
         outter = cylinder(d = self.config["od"], h = self.config["thickness"], center = True, segments = self.segments_count)
         mount = cylinder(d = md, h=self.config["mount_thickness"] + 1.0, segments = self.segments_count)
         inner = cylinder(d = self.config["id"], h = self.config["thickness"] + self.config['mount_thickness'] + 2, center = True, segments = self.segments_count)
-        t = Torus(self.config["od"], self.config["edge_dia"]).create()
+        t = Torus(self.config["od"], self.config["edge_dia"]).build()
 
         h = rotate(90, [1, 0, 0]) (cylinder(d = self.config["grub_screw_dia"], h = md / 2.0, center = True, segments = self.segments_count))
         
@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+
+from pyMDA.parts.tree import *
+
+#
+# Build profiler
+#
+# Opt-in: with profiler.enabled set, every create() and every item placed by
+# Assembly.assemble() is timed, and the tree it produced is measured (node
+# count, depth and the operations that make OpenSCAD slow). Results are
+# totalled per component class and per assembly path.
+#
+
+_OPS = ('union', 'difference', 'hull', 'import')
+
+def tree_stats(obj):
+    """Node count, maximum depth and counts of the expensive operations of a tree (shared subtrees once)."""
+    nodes = postorder(obj)
+    depth = {}
+    ops = dict.fromkeys(_OPS, 0)
+    for node in nodes:
+        depth[id(node)] = 1 + max([depth[id(c)] for c in node.children] or [0])
+        if node.name in ops:
+            ops[node.name] += 1
+    return {"nodes": len(nodes), "depth": depth[id(obj)], "ops": ops}
+
+def _new_entry():
+    return {"calls": 0, "hits": 0, "time": 0.0, "self_time": 0.0, "nodes": 0, "depth": 0, "ops": dict.fromkeys(_OPS, 0)}
+
+def _add(entry, elapsed, self_time, stats):
+    entry["calls"] += 1
+    entry["time"] += elapsed
+    entry["self_time"] += self_time
+    entry["nodes"] += stats["nodes"]
+    entry["depth"] = max(entry["depth"], stats["depth"])
+    for op, n in stats["ops"].items():
+        entry["ops"][op] += n
+
+class Profiler:
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.classes = OrderedDict()
+        self.paths = OrderedDict()
+        self._path = []
+        self._timers = [] # [start, time spent in nested timers]
+
+    def _start(self):
+        self._timers.append([time.perf_counter(), 0.0])
+
+    def _stop(self):
+        start, nested = self._timers.pop()
+        elapsed = time.perf_counter() - start
+        if self._timers:
+            self._timers[-1][1] += elapsed
+        return elapsed, elapsed - nested
+
+    def record(self, obj, build):
+        """Call build(), a create() or assemble(), and record it under the class of obj."""
+        self._start()
+        try:
+            model = build()
+        finally:
+            # also when build() raises, so the timers of its callers stay in step
+            elapsed, self_time = self._stop()
+        name = type(obj).__name__
+        _add(self.classes.setdefault(name, _new_entry()), elapsed, self_time, tree_stats(model))
+        return model
+
+    def hit(self, component):
+        """Count a create() answered from the component cache."""
+        self.classes.setdefault(type(component).__name__, _new_entry())["hits"] += 1
+
+    def enter(self, name):
+        """Start timing an assembly item, nested under the items being assembled."""
+        self._path.append(name)
+        self._start()
+
+    def leave(self, model):
+        """Stop timing the item entered last, recording the tree it was placed as, or nothing if that failed (None)."""
+        elapsed, self_time = self._stop()
+        path = "/".join(self._path)
+        self._path.pop()
+        if model is None:
+            return
+        # like the time, the nodes of a sub-assembly include its items
+        _add(self.paths.setdefault(path, _new_entry()), elapsed, self_time, tree_stats(model))
+
+    def to_dict(self):
+        return {"classes": self.classes, "paths": self.paths}
+
+    def write_json(self, filename):
+        import json
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent = 2)
+
+    def report(self, sort = "time", limit = 20):
+        """Text report of the slowest classes and assembly paths."""
+        lines = []
+        for title, entries in (("Components", self.classes), ("Assembly paths", self.paths)):
+            rows = sorted(entries.items(), key = lambda kv: kv[1][sort], reverse = True)[:limit]
+            width = max([len(title)] + [len(k) for k, _ in rows])
+            lines.append("%-*s %6s %6s %9s %9s %8s %5s %6s %6s %5s %6s" %
+                         (width, title, "calls", "hits", "time", "self", "nodes", "depth",
+                          "union", "diff", "hull", "import"))
+            for key, e in rows:
+                ops = e["ops"]
+                lines.append("%-*s %6d %6d %9.4f %9.4f %8d %5d %6d %6d %5d %6d" %
+                             (width, key, e["calls"], e["hits"], e["time"], e["self_time"], e["nodes"], e["depth"],
+                              ops.get("union", 0), ops.get("difference", 0), ops.get("hull", 0), ops.get("import", 0)))
+            lines.append("")
+        return "\n".join(lines)
+
+profiler = Profiler()
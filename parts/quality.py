@@ -0,0 +1,232 @@
+import math
+import weakref
+import contextlib
+import contextvars
+from solid import *
+
+from pyMDA.parts.tree import *
+
+#
+# Resolution
+#
+# Instead of one segments_count for every circle, each round primitive gets
+# the fewest segments that keep its facets within chord_tolerance (mm) of
+# the true circle, clamped to [min_segments, max_segments]. A 0.64 mm pin
+# then needs a handful of segments while a 200 mm pulley still looks round.
+#
+
+class Resolution:
+
+    def __init__(self, chord_tolerance = 0.05, min_segments = 12, max_segments = 100):
+        self.chord_tolerance = chord_tolerance
+        self.min_segments = min_segments
+        self.max_segments = max_segments
+
+    def __repr__(self):
+        return "Resolution(%r, %r, %r)" % (self.chord_tolerance, self.min_segments, self.max_segments)
+
+    def key(self):
+        return "%r/%r/%r" % (self.chord_tolerance, self.min_segments, self.max_segments)
+
+    def segments(self, r):
+        """Segments for a circle of radius r, a multiple of 4 so the circle keeps its extents on X and Y."""
+        r = abs(r)
+        if r <= self.chord_tolerance:
+            n = self.min_segments
+        else:
+            # the chord deviates r * (1 - cos(pi / n)) from the circle
+            n = math.ceil(math.pi / math.acos(1.0 - self.chord_tolerance / r))
+        n = min(max(n, self.min_segments), self.max_segments)
+        return int(math.ceil(n / 4.0) * 4)
+
+RESOLUTIONS = {
+    "draft": Resolution(0.2, 8, 32),
+    "preview": Resolution(0.05, 12, 100),
+    "export": Resolution(0.01, 16, 360),
+}
+
+#
+# Quality profiles
+#
+# A profile bundles the resolution with the step sizes of sampled curves
+# (Bezier t steps, cam and slot angle steps) and the level of detail of
+# imported COTS meshes (the fraction of their triangles kept, None for the
+# original files). The current profile lives in a
+# context variable, so a build can be wrapped in quality("draft") without
+# touching any part code, and threads or tasks can each use their own.
+#
+
+class Quality:
+
+    def __init__(self, name, resolution, bezier_step, curve_step, stl_lod = None):
+        self.name = name
+        self.resolution = resolution
+        self.bezier_step = bezier_step
+        self.curve_step = curve_step # radians
+        self.stl_lod = stl_lod
+
+    def __repr__(self):
+        return "Quality(%r, %r, %r, %r, %r)" % (self.name, self.resolution, self.bezier_step, self.curve_step, self.stl_lod)
+
+    def key(self):
+        return "%s/%r/%r/%r" % (self.resolution.key(), self.bezier_step, self.curve_step, self.stl_lod)
+
+QUALITIES = {
+    "draft": Quality("draft", RESOLUTIONS["draft"], 0.1, 0.05, 0.01),
+    "preview": Quality("preview", RESOLUTIONS["preview"], 0.05, 0.01),
+    "export": Quality("export", RESOLUTIONS["export"], 0.01, 0.005),
+}
+
+_quality = contextvars.ContextVar("pyMDA_quality", default = QUALITIES["preview"])
+
+def _as_quality(profile):
+    return QUALITIES[profile] if isinstance(profile, str) else profile
+
+@contextlib.contextmanager
+def quality(profile):
+    """Build with a quality profile, a Quality or one of "draft", "preview" and "export"."""
+    token = _quality.set(_as_quality(profile))
+    try:
+        yield _quality.get()
+    finally:
+        _quality.reset(token)
+
+def set_quality(profile):
+    """Set the quality profile outside of a quality() block."""
+    _quality.set(_as_quality(profile))
+
+def get_quality():
+    return _quality.get()
+
+def set_resolution(resolution):
+    """Set the resolution of the current profile, a Resolution or the name of a preset."""
+    if isinstance(resolution, str):
+        resolution = RESOLUTIONS[resolution]
+    q = get_quality()
+    _quality.set(Quality(q.name, resolution, q.bezier_step, q.curve_step, q.stl_lod))
+
+def get_resolution():
+    return get_quality().resolution
+
+#
+# Applying the resolution to a tree
+#
+
+_ROUND = ('circle', 'sphere', 'cylinder', 'rotate_extrude')
+
+def _param(params, *keys):
+    for key in keys:
+        if params.get(key) is not None:
+            return params[key]
+    return None
+
+def _profile_radius(node):
+    """Furthest x of the 2D profile of a rotate_extrude (at most), None if its operations can't tell.
+
+    Read from the parameters of the profile's primitives, translations and
+    scales, so sizing a revolved part doesn't need the mesher (and NumPy).
+    """
+    r = None
+    stack = [(c, 0.0, 1.0) for c in node.children]
+    while stack:
+        n, dx, sx = stack.pop()
+        if n.modifier in ('*', '%'):
+            continue
+        params = n.params
+        children = [c for c in n.children if c.modifier not in ('*', '%')]
+        if n.name in ('difference', 'intersection'):
+            # the result lies within the first child
+            stack.extend((c, dx, sx) for c in children[:1])
+            continue
+        if n.name in ('union', 'color', 'render', 'group'):
+            stack.extend((c, dx, sx) for c in children)
+            continue
+        if n.name == 'translate':
+            v = _param(params, 'v') or [0]
+            stack.extend((c, dx + sx * v[0], sx) for c in children)
+            continue
+        if n.name == 'scale':
+            v = _param(params, 'v')
+            v = 1.0 if v is None else v if isinstance(v, (int, float)) else v[0]
+            stack.extend((c, dx, sx * v) for c in children)
+            continue
+        if n.name == 'circle':
+            rr = _param(params, 'r')
+            if rr is None:
+                rr = (_param(params, 'd') or 2) / 2.0
+            xs = [-rr, rr]
+        elif n.name == 'square':
+            size = _param(params, 'size') or 1
+            w = size if isinstance(size, (int, float)) else size[0]
+            xs = [-w / 2.0, w / 2.0] if _param(params, 'center') else [0, w]
+        elif n.name == 'polygon':
+            xs = [pt[0] for pt in _param(params, 'points') or []]
+        else:
+            return None
+        r = max([r or 0.0] + [abs(dx + sx * x) for x in xs])
+    return r
+
+def _radius(node):
+    params = node.params
+    if node.name == 'rotate_extrude':
+        # the profile's furthest point from the axis
+        return _profile_radius(node)
+
+    radii = [_param(params, 'r'), _param(params, 'r1'), _param(params, 'r2')]
+    radii += [d / 2.0 for d in (_param(params, 'd'), _param(params, 'd1'), _param(params, 'd2')) if d is not None]
+    radii = [r for r in radii if r is not None]
+    return max(radii) if radii else 1.0
+
+def _has_segments(node):
+    return _param(node.params, 'segments', '$fn') is not None
+
+# roots returned by resolve_segments(), by the resolution they were resolved
+# at and their children then, so a tree built from resolved parts (each
+# create() resolves its own) doesn't walk the parts' subtrees again. The
+# children are compared as add() changes a node in place.
+_resolved_roots = weakref.WeakKeyDictionary()
+
+def _is_resolved(node, key):
+    mark = _resolved_roots.get(node)
+    return mark is not None and mark[0] == key and len(mark[1]) == len(node.children) and \
+        all(a is b for a, b in zip(mark[1], node.children))
+
+def resolve_segments(obj, resolution = None):
+    """Return obj with a segment count on each round primitive that has none.
+
+    Primitives below a node with an explicit count are left alone, as in
+    OpenSCAD they inherit it. The original nodes are not modified.
+    """
+    resolution = resolution or get_resolution()
+    resolution_key = resolution.key()
+    rewritten = {}
+    stack = [(obj, False, False)]
+    while stack:
+        node, inherited, expanded = stack.pop()
+        key = (id(node), inherited)
+        if key in rewritten:
+            continue
+        if _is_resolved(node, resolution_key):
+            # nothing below it changes, with or without an inherited count
+            rewritten[key] = node
+            continue
+        child_inherited = inherited or _has_segments(node)
+        if not expanded:
+            stack.append((node, inherited, True))
+            stack.extend((c, child_inherited, False) for c in node.children if (id(c), child_inherited) not in rewritten)
+            continue
+
+        children = [rewritten[(id(c), child_inherited)] for c in node.children]
+        new_node = node
+        if any(a is not b for a, b in zip(children, node.children)):
+            new_node = copy_node(node, children)
+        if node.name in _ROUND and not child_inherited:
+            r = _radius(node)
+            if r is not None:
+                if new_node is node:
+                    new_node = copy_node(node, children)
+                new_node.params = dict(node.params, segments = resolution.segments(r))
+        rewritten[key] = new_node
+    root = rewritten[(id(obj), False)]
+    _resolved_roots[root] = (resolution_key, list(root.children))
+    return root
@@ -0,0 +1,207 @@
+import os
+import math
+
+from pyMDA.parts.mesh import get_fragments, _get, _fn
+from pyMDA.parts.stl import resolve_stl_path, stl_info
+from pyMDA.parts.quality import _radius
+
+#
+# Render cost estimation
+#
+# A static look at a SolidPython tree before OpenSCAD renders it. Each node
+# gets an estimated facet count (from the segments of its primitives and the
+# triangle counts of imported STLs) and each 3D boolean a cost, as CGAL
+# time grows with the facets going into the operation:
+#
+#   union / difference / intersection of k children: children are merged one
+#   at a time, so sum over i of (accumulated facets + facets of child i)
+#   minkowski: product of the children's facets
+#   hull: sum of the children's facets (hulls are cheap)
+#
+# Implicit unions (a transform or color with several children, or the copies
+# of a for() loop) are booleans too. 2D booleans are left out, OpenSCAD does
+# them with Clipper and they seldom matter. Costs are in facet operations,
+# only useful to compare.
+#
+
+_3D = ('cube', 'sphere', 'cylinder', 'polyhedron', 'import', 'surface')
+_BOOLEANS = ('union', 'difference', 'intersection')
+
+_render_budget = None
+
+def set_render_budget(budget):
+    """Boolean cost above which export_scad() warns about a subtree, None to turn the check off."""
+    global _render_budget
+    _render_budget = budget
+
+def get_render_budget():
+    return _render_budget
+
+def stl_triangle_count(filename, base_dir = ''):
+    """Triangles in an imported STL file, 0 if it can't be found or read.
+
+    The file is looked up next to the SCAD file (base_dir) as OpenSCAD
+    would, then as import_stl() paths relative to the pyMDA package are.
+    The count comes from the STL metadata cache.
+    """
+    path = os.path.join(base_dir, filename)
+    if not os.path.exists(path):
+        path = resolve_stl_path(filename)
+    if not filename.lower().endswith('.stl') or not os.path.isfile(path):
+        return 0
+    try:
+        return stl_info(path)["triangles"]
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _edges_2d(node, fn):
+    """Outline edges of a 2D primitive."""
+    params = node.params
+    if node.name == 'square':
+        return 4
+    if node.name == 'circle':
+        return get_fragments(_get(params, 'r', _get(params, 'd', 2) / 2.0), fn)
+    if node.name == 'polygon':
+        return len(params.get('points') or [])
+    if node.name == 'text':
+        # a rough guess per glyph
+        return 40 * len(str(_get(params, 'text', '')))
+    return 0
+
+def _facets_3d(node, fn, base_dir):
+    """Facets of a 3D primitive."""
+    params = node.params
+    if node.name == 'cube':
+        return 6
+    if node.name == 'sphere':
+        n = get_fragments(_get(params, 'r', _get(params, 'd', 2) / 2.0), fn)
+        rings = (n + 1) // 2
+        return rings * n + 2
+    if node.name == 'cylinder':
+        r = _get(params, 'r', _get(params, 'd', 2) / 2.0)
+        r1 = _get(params, 'r1', _get(params, 'd1', 2 * r) / 2.0)
+        r2 = _get(params, 'r2', _get(params, 'd2', 2 * r) / 2.0)
+        return get_fragments(max(r1, r2), fn) + 2
+    if node.name == 'polyhedron':
+        return len(_get(params, 'faces', params.get('triangles')) or [])
+    if node.name == 'import':
+        return stl_triangle_count(str(_get(params, 'file', '')), base_dir)
+    return 0
+
+def _boolean(name, facets):
+    """(facets, cost) of a boolean over children with the given facet counts."""
+    if not facets:
+        return 0, 0
+    if len(facets) == 1:
+        return facets[0], 0
+    if name == 'minkowski':
+        return math.prod(facets), math.prod(facets)
+    if name == 'hull':
+        return sum(facets), sum(facets)
+    acc = facets[0]
+    cost = 0
+    for f in facets[1:]:
+        cost += acc + f
+        # a difference keeps the first child's facets plus the faces the cut leaves on it
+        acc = min(acc, f) if name == 'intersection' else acc + f
+    return acc, cost
+
+class NodeCost:
+    """Estimate for one node: its facets, the cost of its own boolean and of its whole subtree."""
+
+    def __init__(self, node, path, facets, is_2d, cost, total):
+        self.node = node
+        self.path = path
+        self.facets = facets
+        self.is_2d = is_2d
+        self.cost = cost
+        self.total = total
+
+    def __repr__(self):
+        return "NodeCost(%r, facets=%d, cost=%d, total=%d)" % (self.path, self.facets, self.cost, self.total)
+
+def estimate_render_cost(obj, base_dir = ''):
+    """NodeCost of every node of obj, children before their parents, so the root's is last.
+
+    Shared subtrees are estimated once, as OpenSCAD caches their geometry,
+    and their cost is counted once in the total of each subtree holding them.
+    Imported files are looked up relative to base_dir, the directory of
+    the SCAD file.
+    """
+    costs = {}
+    # keys of the nodes with a boolean cost in each subtree, shared between
+    # nodes where they are the same, so shared subtrees are only summed once
+    booleans = {}
+    stack = [(obj, 0, obj.name, False)]
+    while stack:
+        node, fn, path, expanded = stack.pop()
+        key = (id(node), fn)
+        if key in costs:
+            continue
+        child_fn = _fn(node, fn)
+        if not expanded:
+            stack.append((node, fn, path, True))
+            stack.extend((c, child_fn, "%s/%s[%d]" % (path, c.name, i), False)
+                         for i, c in enumerate(node.children) if (id(c), child_fn) not in costs)
+            continue
+
+        child_keys = [(id(c), child_fn) for c in node.children if c.modifier not in ('*', '%')]
+        children = [costs[k] for k in child_keys]
+        name = node.name
+        is_2d = False
+        cost = 0
+        if name in _3D:
+            facets = _facets_3d(node, child_fn, base_dir)
+        elif name in ('linear_extrude', 'rotate_extrude'):
+            edges = sum(c.facets for c in children)
+            if name == 'linear_extrude':
+                twist = _get(node.params, 'twist', 0)
+                slices = _get(node.params, 'slices', max(1, int(abs(twist) / 5)) if twist else 1)
+                facets = edges * slices + 2
+            else:
+                r = _radius(node) or 1.0
+                facets = edges * get_fragments(r, child_fn)
+        elif not node.children:
+            # a 2D primitive
+            facets = _edges_2d(node, child_fn)
+            is_2d = True
+        elif name == 'for':
+            # a pattern's loop (see place_instances()), an implicit union of a copy per matrix
+            copies = len(_get(node.params, 'm', []))
+            is_2d = bool(children) and all(c.is_2d for c in children)
+            if is_2d:
+                facets = copies * sum(c.facets for c in children)
+            else:
+                facets, cost = _boolean('union', [c.facets for c in children if not c.is_2d] * copies)
+        elif children and all(c.is_2d for c in children):
+            facets = sum(c.facets for c in children)
+            is_2d = True
+        else:
+            op = name if name in _BOOLEANS + ('minkowski', 'hull') else 'union'
+            facets, cost = _boolean(op, [c.facets for c in children if not c.is_2d])
+        below = [booleans[k] for k in child_keys if booleans[k]]
+        keys = below[0] if len(below) == 1 else frozenset().union(*below)
+        total = cost + sum(costs[k].cost for k in keys)
+        booleans[key] = keys | {key} if cost else keys
+        costs[key] = NodeCost(node, path, facets, is_2d, cost, total)
+    return list(costs.values())
+
+def _hotspots(costs, budget, limit):
+    entries = sorted([c for c in costs if c.cost > budget], key = lambda c: c.cost, reverse = True)
+    return entries[:limit]
+
+def render_hotspots(obj, budget = 0, limit = 20, base_dir = ''):
+    """Nodes whose own boolean costs more than budget, most expensive first."""
+    return _hotspots(estimate_render_cost(obj, base_dir), budget, limit)
+
+def render_cost_report(obj, budget = 0, limit = 20, base_dir = ''):
+    """Text report of the most expensive booleans of obj."""
+    costs = estimate_render_cost(obj, base_dir)
+    root = costs[-1]
+    lines = ["Estimated facets %d, boolean cost %d" % (root.facets, root.total)]
+    entries = _hotspots(costs, budget, limit)
+    if entries:
+        lines.append("%12s %10s %12s  %s" % ("cost", "facets", "subtree", "node"))
+        for c in entries:
+            lines.append("%12d %10d %12d  %s" % (c.cost, c.facets, c.total, c.path))
+    return "\n".join(lines)
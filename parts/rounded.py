@@ -0,0 +1,111 @@
+import numpy as np
+from solid import *
+
+#
+# Rounded boxes and plates as polyhedra
+#
+# The curved parts build their fillets from hulls and unions of spheres and
+# cylinders, which OpenSCAD has to evaluate with CGAL. These generate the same
+# solids directly as one closed polyhedron: a rounded box is a sphere split
+# into octants, each moved out to its corner of the box, and a filleted
+# plate is a rounded rectangle extruded. Arcs have segments / 4 steps per
+# quarter turn, so they meet the flat faces at the box's exact extents.
+#
+# Faces are listed clockwise seen from outside, as OpenSCAD expects.
+#
+
+def _quarter_arcs(segments):
+    """Cosines and sines of the angles of four quarter turns, endpoints included, as (4, k + 1) arrays."""
+    k = max(int(segments) // 4, 1)
+    a = np.radians(90.0 * (np.arange(4)[:, None] + np.arange(k + 1)[None, :] / float(k)))
+    c, s = np.cos(a), np.sin(a)
+    # exact zeros at the quarter turns, so coinciding points are welded
+    c[np.abs(c) < 1e-12] = 0.0
+    s[np.abs(s) < 1e-12] = 0.0
+    return c, s
+
+def _weld(points, faces):
+    """Points without duplicates, and faces with repeated corners and collapsed faces removed."""
+    points, inverse = np.unique(np.round(points, 12) + 0.0, axis = 0, return_inverse = True)
+    inverse = inverse.ravel()
+    welded = []
+    for face in faces:
+        f = [int(inverse[i]) for i in face]
+        f = [v for j, v in enumerate(f) if v != f[j - 1]]
+        if len(set(f)) >= 3:
+            welded.append(f)
+    return points, welded
+
+def _polyhedron(points, faces):
+    points, faces = _weld(points, faces)
+    return polyhedron(points = points.tolist(), faces = faces)
+
+def rounded_box(size, r, segments, center = True):
+    """polyhedron() of a box with all 12 edges rounded to radius r (the hull of a sphere in each corner)."""
+    size = np.asarray(size, dtype = float)
+    r = min(r, *(size / 2.0))
+    if r <= 0:
+        return cube(size.tolist(), center = center)
+    half = size / 2.0 - r
+    c, s = _quarter_arcs(segments)
+    k = c.shape[1] - 1
+
+    # latitudes from the bottom pole to the top one, the equator twice (bottom and top half)
+    lat = np.radians(np.concatenate([np.linspace(-90.0, 0.0, k + 1), np.linspace(0.0, 90.0, k + 1)]))
+    cl, sl = np.cos(lat), np.sin(lat)
+    cl[np.abs(cl) < 1e-12] = 0.0
+    sz = np.repeat([-1.0, 1.0], k + 1)
+
+    # columns go around the quarter turns, each moved to its corner
+    cc, sc = c.ravel(), s.ravel()
+    sx = np.repeat([1.0, -1.0, -1.0, 1.0], k + 1)
+    sy = np.repeat([1.0, 1.0, -1.0, -1.0], k + 1)
+    x = sx[None, :] * half[0] + r * cl[:, None] * cc[None, :]
+    y = sy[None, :] * half[1] + r * cl[:, None] * sc[None, :]
+    z = (sz * half[2] + r * sl)[:, None] * np.ones_like(cc)[None, :]
+    points = np.stack([x, y, z], axis = 2).reshape(-1, 3)
+    if not center:
+        points += size / 2.0
+
+    rows, cols = len(lat), len(cc)
+    index = lambda i, j: i * cols + j % cols
+    faces = [[index(i, j), index(i + 1, j), index(i + 1, j + 1), index(i, j + 1)] for i in range(rows - 1) for j in range(cols)]
+    # flat bottom and top, both poles are rows of the four corners
+    faces.append([index(0, j) for j in range(cols)])
+    faces.append([index(rows - 1, j) for j in reversed(range(cols))])
+    return _polyhedron(points, faces)
+
+def rounded_rectangle(size, radii, segments, center = True):
+    """(n, 2) outline, counter-clockwise, of a rectangle with rounded corners.
+
+    radii is one radius, or four for the corners (+x +y, -x +y, -x -y, +x -y).
+    """
+    size = np.asarray(size[:2], dtype = float)
+    radii = np.broadcast_to(np.asarray(radii, dtype = float), (4,))
+    radii = np.clip(radii, 0.0, size.min() / 2.0)
+    c, s = _quarter_arcs(segments)
+    lo = -size / 2.0 if center else np.zeros(2)
+    hi = lo + size
+    corners = [(hi[0], hi[1], -1, -1), (lo[0], hi[1], 1, -1), (lo[0], lo[1], 1, 1), (hi[0], lo[1], -1, 1)]
+    outline = []
+    for q, (cx, cy, dx, dy) in enumerate(corners):
+        if radii[q] <= 0:
+            outline.append([[cx, cy]])
+            continue
+        r = radii[q]
+        outline.append(np.column_stack([cx + dx * r + r * c[q], cy + dy * r + r * s[q]]))
+    pts = np.concatenate(outline)
+    # drop repeated points, where arcs meet without a straight part
+    keep = np.any(np.abs(pts - np.roll(pts, 1, axis = 0)) > 1e-12, axis = 1)
+    return pts[keep]
+
+def rounded_prism(size, radii, segments, center = True):
+    """polyhedron() of a box whose vertical edges are rounded, radii as for rounded_rectangle()."""
+    outline = rounded_rectangle(size, radii, segments, center)
+    n = len(outline)
+    z0 = -size[2] / 2.0 if center else 0.0
+    points = np.concatenate([np.column_stack([outline, np.full(n, z0)]),
+                             np.column_stack([outline, np.full(n, z0 + size[2])])])
+    faces = [list(range(n)), list(range(2 * n - 1, n - 1, -1))]
+    faces.extend([n + j, n + (j + 1) % n, (j + 1) % n, j] for j in range(n))
+    return _polyhedron(points, faces)
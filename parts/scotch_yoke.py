@@ -57,8 +57,8 @@ class ScotchYoke(Component):
                                  }
         x = self.config['stroke_length'] / 2.0 + self.config['pin_dia'] / 2.0 + self.config["sleeve"]["width"] / 2.0 + 0.4 + sliding_rod_thickness + 0.4 + self.config['clearance']
 
-        p += translate([x, 0, 0]) (PlummerBlock(self.config['sleeve']).create())
-        p += translate([-x, 0, 0]) (PlummerBlock(self.config['sleeve']).create())
+        p += translate([x, 0, 0]) (PlummerBlock(self.config['sleeve']).build())
+        p += translate([-x, 0, 0]) (PlummerBlock(self.config['sleeve']).build())
         
         
         p = color(self.color) (p)
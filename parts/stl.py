@@ -0,0 +1,287 @@
+import os
+import re
+import sys
+import mmap
+import json
+import argparse
+import numpy as np
+
+from pyMDA.parts.cache import package_path, file_hash, cached_json, cache_dir, flush_file_hashes, _new_hashes, _write_json, _LRU
+
+#
+# STL files
+#
+# The COTS parts are import_stl() references to files under cots/. These are
+# loaded into NumPy arrays of unique vertices and of faces (three vertex
+# indices each), for bounds, mass properties and collision checks. Binary
+# files are memory-mapped and read as one structured array, ASCII files are
+# tokenized in one pass.
+#
+# The welded arrays are stored as .npz files (float32 vertices, uint32
+# faces) in cache_dir("stl"), named after the STL's SHA-256, so a file is
+# only parsed once per content and then loads in milliseconds. Within a
+# process, the most recently used meshes are kept while the file's size and
+# mtime don't change.
+#
+
+_BINARY_TRIANGLE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+
+# the start of an ASCII file: a solid line, then its first facet (or its end)
+_ASCII_START = re.compile(rb'\s*solid[^\n]*\n\s*(facet|endsolid)', re.IGNORECASE)
+
+class StlMesh:
+
+    def __init__(self, vertices, faces, filename = None):
+        self.vertices = vertices # (n, 3) float
+        self.faces = faces # (m, 3) int
+        self.filename = filename
+
+    def __len__(self):
+        return len(self.faces)
+
+    def __repr__(self):
+        return "StlMesh(%r, %d vertices, %d faces)" % (self.filename, len(self.vertices), len(self.faces))
+
+    def triangles(self):
+        """(m, 3, 3) array of the corners of each face."""
+        return self.vertices[self.faces]
+
+    def bounds(self):
+        if len(self.vertices) == 0:
+            return np.zeros(3), np.zeros(3)
+        return self.vertices.min(axis = 0), self.vertices.max(axis = 0)
+
+def resolve_stl_path(filename):
+    """Path of an import_stl() file: as given if it exists, else relative to the pyMDA package."""
+    if os.path.isabs(filename) or os.path.exists(filename):
+        return filename
+    return package_path(filename)
+
+def _read_binary(f, count):
+    # the mapping is released with the temporary record array, once the vertices are copied out
+    m = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    return np.frombuffer(m, dtype = _BINARY_TRIANGLE, count = count, offset = 84)['vertices'].astype(np.float64)
+
+def _read_ascii(data):
+    # keywords in any case, and 1E+01 reads as 1e+01 just the same
+    tokens = np.array(data.lower().split())
+    index = np.flatnonzero(tokens == b'vertex')
+    coords = tokens[index[:, None] + np.arange(1, 4)].astype(np.float64)
+    return coords.reshape(-1, 3, 3)
+
+def _binary_count(head, size):
+    # binary files are 84 bytes of header and triangle count, then 50 bytes
+    # per triangle. Some of them start with "solid" too, so a file of exactly
+    # that size is binary. Some exporters append bytes after the triangles,
+    # so a larger file is binary as well unless it starts like an ASCII one.
+    if len(head) < 84:
+        return None
+    count = int(np.frombuffer(head[80:84], dtype = '<u4')[0])
+    if size == 84 + 50 * count:
+        return count
+    if size > 84 + 50 * count and not _ASCII_START.match(head):
+        return count
+    return None
+
+def read_stl_triangles(filename):
+    """(m, 3, 3) array of the triangles of an STL file, binary or ASCII.
+
+    Raises ValueError for a file without triangles, rather than giving an
+    empty mesh to be cached for a file that couldn't be read.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        count = _binary_count(f.read(1024), size)
+        if count:
+            return _read_binary(f, count)
+        triangles = None
+        if count is None:
+            f.seek(0)
+            triangles = _read_ascii(f.read())
+    if triangles is None or len(triangles) == 0:
+        raise ValueError("No triangles in STL file %s" % filename)
+    return triangles
+
+def write_stl(filename, mesh):
+    """Write an StlMesh as a binary STL file."""
+    tris = mesh.triangles()
+    records = np.zeros(len(tris), dtype = _BINARY_TRIANGLE)
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(n, axis = 1, keepdims = True)
+    records['normal'] = np.divide(n, length, out = np.zeros_like(n), where = length > 0)
+    records['vertices'] = tris
+    tmp = "%s.%d.tmp" % (filename, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(b'pyMDA'.ljust(80, b' '))
+        f.write(np.array([len(tris)], dtype = '<u4').tobytes())
+        f.write(records.tobytes())
+    os.replace(tmp, filename)
+    return filename
+
+def weld_vertices(triangles):
+    """Unique vertices and (m, 3) faces indexing them, for an (m, 3, 3) array of triangles."""
+    points = np.ascontiguousarray(triangles.reshape(-1, 3), dtype = np.float64) + 0.0 # -0.0 -> 0.0
+    # rows as single opaque values, so unique() sorts 1D instead of lexsorting
+    rows = points.view(np.dtype((np.void, points.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(rows, return_index = True, return_inverse = True)
+    return points[first], inverse.reshape(-1, 3)
+
+# meshes loaded in this process, the largest COTS assets take a few MB each
+MAX_LOADED_MESHES = 64
+_meshes = _LRU(MAX_LOADED_MESHES)
+
+def _npz_path(digest):
+    return os.path.join(cache_dir("stl"), digest + ".npz")
+
+def _load_cached(path):
+    """StlMesh of path from the .npz cache, parsing the STL and filling the cache on a miss."""
+    npz = _npz_path(file_hash(path))
+    try:
+        with np.load(npz) as data:
+            return StlMesh(data['vertices'].astype(np.float64), data['faces'].astype(np.intp), path)
+    except (OSError, KeyError, ValueError):
+        pass
+    triangles = read_stl_triangles(path)
+    vertices, faces = weld_vertices(triangles)
+    vertices = vertices.astype(np.float32)
+    _, volume, _ = mesh_properties(triangles)
+    tmp = "%s.%d.tmp" % (npz, os.getpid())
+    with open(tmp, 'wb') as f:
+        np.savez(f, vertices = vertices, faces = faces.astype(np.uint32),
+                 min = vertices.min(axis = 0) if len(vertices) else np.zeros(3, np.float32),
+                 max = vertices.max(axis = 0) if len(vertices) else np.zeros(3, np.float32),
+                 volume = volume, triangles = len(faces))
+    os.replace(tmp, npz)
+    # as a cache hit would return it
+    return StlMesh(vertices.astype(np.float64), faces, path)
+
+def load_stl(filename, cached = True):
+    """StlMesh of an STL file, from the on-disk cache unless cached is False."""
+    path = os.path.abspath(resolve_stl_path(filename))
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, cached)
+    mesh = _meshes.get(path)
+    if mesh is None or mesh[0] != key:
+        if cached:
+            stl = _load_cached(path)
+        else:
+            stl = StlMesh(*weld_vertices(read_stl_triangles(path)), path)
+        mesh = _meshes.put(path, (key, stl))
+    return mesh[1]
+
+def clear_stl_cache():
+    _meshes.clear()
+
+#
+# Metadata - what assemblies need to know about an STL without its triangles,
+# cached on disk by content hash so each asset is only measured once
+#
+
+def mesh_properties(triangles):
+    """Surface area, volume and centroid of a closed triangle mesh (divergence theorem)."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    area = 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis = 1).sum()
+    # signed volumes of the tetrahedra from the origin to each face
+    v = np.einsum('ij,ij->i', a, np.cross(b, c)) / 6.0
+    volume = v.sum()
+    if abs(volume) < 1e-12:
+        centroid = triangles.reshape(-1, 3).mean(axis = 0) if len(triangles) else np.zeros(3)
+    else:
+        centroid = (v[:, None] * (a + b + c)).sum(axis = 0) / (4.0 * volume)
+    return float(area), float(abs(volume)), centroid
+
+def stl_info(filename):
+    """Bounds, counts, area, volume and centroid of an STL file, as a dict."""
+    path = resolve_stl_path(filename)
+
+    def measure():
+        stl = load_stl(path)
+        lo, hi = stl.bounds()
+        area, volume, centroid = mesh_properties(stl.triangles())
+        return {
+            "triangles": len(stl.faces),
+            "vertices": len(stl.vertices),
+            "min": lo.tolist(),
+            "max": hi.tolist(),
+            "area": area,
+            "volume": volume,
+            "centroid": centroid.tolist()
+        }
+    return cached_json("stl", file_hash(path), measure)
+
+#
+# Asset manifest - metadata of every STL under cots/, to list assets
+# without loading any mesh
+#
+
+def _manifest_path():
+    return os.path.join(cache_dir("stl"), "manifest.json")
+
+def _is_stl(filename):
+    return filename.lower().endswith('.stl')
+
+def _stl_files(root):
+    """Sorted paths of the STL files under root, skipping hidden directories."""
+    paths = []
+    for d, dirs, files in os.walk(root):
+        dirs[:] = [n for n in dirs if not n.startswith('.')]
+        paths.extend(os.path.join(d, f) for f in files if _is_stl(f))
+    return sorted(paths)
+
+def _asset_entry(path):
+    entry = dict(stl_info(path))
+    entry["path"] = os.path.relpath(path, package_path())
+    entry["hash"] = file_hash(path)
+    entry["size"] = os.path.getsize(path)
+    return entry
+
+def _asset_worker(path):
+    # pool workers exit without writing their file hashes, they are sent back
+    # with the entry and written once by the parent
+    entry = _asset_entry(path)
+    hashes = dict(_new_hashes)
+    _new_hashes.clear()
+    return entry, hashes
+
+def build_stl_cache(root = None, workers = 1):
+    """Parse, measure and cache every STL under root (cots/ by default), and write the manifest."""
+    root = root or package_path("cots")
+    paths = _stl_files(root)
+    if workers > 1 and len(paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            entries = []
+            for entry, hashes in pool.map(_asset_worker, paths):
+                entries.append(entry)
+                _new_hashes.update(hashes)
+    else:
+        entries = [_asset_entry(p) for p in paths]
+    flush_file_hashes()
+    manifest = {"assets": {e["path"]: e for e in entries}}
+    _write_json(_manifest_path(), manifest)
+    return manifest
+
+def stl_manifest():
+    """The manifest written by build_stl_cache(), empty if it hasn't run."""
+    try:
+        with open(_manifest_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"assets": {}}
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Build or list the cache of the COTS STL meshes")
+    parser.add_argument('command', choices=['build', 'list'])
+    parser.add_argument('--root', help='Directory to scan for STL files (default: cots/)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processes used to build the cache')
+    args = parser.parse_args(argv)
+
+    manifest = build_stl_cache(args.root, args.workers) if args.command == 'build' else stl_manifest()
+    for path, e in sorted(manifest["assets"].items()):
+        size = [hi - lo for lo, hi in zip(e["min"], e["max"])]
+        print("%-60s %8d tris %8.1fx%.1fx%.1f mm %12.1f mm3" % (path, e["triangles"], size[0], size[1], size[2], e["volume"]))
+    print("%d assets in %s" % (len(manifest["assets"]), cache_dir("stl")))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from solid import *
 from solid.utils import *
 
 from pyMDA.parts.core import *
+from pyMDA.parts.lod import cots_stl
 
 class ShaftKey(Component):
 
@@ -32,7 +33,7 @@ class MotorDC(Component):
         m = cylinder(d = self.config['dia'], h = self.config['length'], segments = self.segments_count)
         m = color(Aluminum) (m)
 
-        s = ShaftKey(self.config['shaft']).create()
+        s = ShaftKey(self.config['shaft']).build()
         
         p = m + translate([0, 0, self.config['length']]) (s)
         p = translate([0, 0, -self.config['length']]) (p)
@@ -50,7 +51,7 @@ class GearboxWorm(Component):
 
         b = color(Aluminum) (b)
         
-        s = ShaftKey(self.config['shaft']).create()
+        s = ShaftKey(self.config['shaft']).build()
 
         m3_tap_hole_size = 2.5
         h = cylinder(d = m3_tap_hole_size, h = self.config['height'] / 2.0, segments = self.segments_count)
@@ -78,9 +79,9 @@ class MotorDCwGearboxWorm(Assembly):
         self.gearbox_config = gearbox_config
         
     def create(self):
-        m = MotorDC(self.motor_config).create()
+        m = MotorDC(self.motor_config).build()
     
-        g = GearboxWorm(self.gearbox_config).create()
+        g = GearboxWorm(self.gearbox_config).build()
         
         p = g + translate([-self.motor_config['shaft_dia'] / 2.0,
                            self.gearbox_config['length'] - self.gearbox_config['shaft_pos'],
@@ -105,17 +106,17 @@ class ServoRDS3225(Component):
 
     def create(self):
 
-        b = color(Aluminum) (import_stl("cots/servo/RDS3225-bracket.stl"))
+        b = color(Aluminum) (cots_stl("cots/servo/RDS3225-bracket.stl"))
 
         b = rotate(180, [1, 0, 0]) (b)
         b = rotate(90, [0, 0, 1]) (b)
         
         b = translate([-self.config['width'] / 2.0, -self.config['axle_pos'], 0]) (b)
         
-        s = color(BlackPaint) (import_stl("cots/servo/RDS3225-servo.stl"))
+        s = color(BlackPaint) (cots_stl("cots/servo/RDS3225-servo.stl"))
         
         if self.include_support_bracket:
-            s += color(Aluminum) (import_stl("cots/servo/RDS3225-bracket-support.stl"))
+            s += color(Aluminum) (cots_stl("cots/servo/RDS3225-bracket-support.stl"))
 
         s = rotate(180, [1, 0, 0]) (s)
         s = rotate(90, [0, 0, 1]) (s)
@@ -197,7 +198,7 @@ class TeethedPulley(Component):
         return rotate(self.angle, [1, 0, 0]) (
             translate([0, -7, -7]) (
                 color(Aluminum) (
-                    import_stl("cots/stepper/GT2_16T.STL")
+                    cots_stl("cots/stepper/GT2_16T.STL")
                 )
             )
         )
@@ -219,10 +220,10 @@ class StepperAndTeethedPulley(Component):
             self.assembly_config['gap'] += 15.5
         
         return union()(
-            Stepper(self.stepper_config).create(),
+            Stepper(self.stepper_config).build(),
             translate([0, self.assembly_config['gap'], 0]) (
                 rotate(rot, [0, 0, 1]) (
-                    TeethedPulley(self.pulley_config, self.angle).create()
+                    TeethedPulley(self.pulley_config, self.angle).build()
                 )
             )
         )
@@ -245,25 +246,25 @@ class LinearActuatorPA14P(Component):
     def create(self):
         inch_to_mm = 25.4
         self.config['size'] += self.stroke
-        p = import_stl("cots/linear_actuators/PA-14P-2.stl")
+        p = cots_stl("cots/linear_actuators/PA-14P-2.stl")
         if self.config['size'] == 4.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-4.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-4.stl")
         if self.config['size'] == 6.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-6.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-6.stl")
         if self.config['size'] == 8.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-8.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-8.stl")
         if self.config['size'] == 10.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-10.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-10.stl")
         if self.config['size'] == 12.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-12.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-12.stl")
         if self.config['size'] == 18.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-18.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-18.stl")
         if self.config['size'] == 24.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-24.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-24.stl")
         if self.config['size'] == 30.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-30.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-30.stl")
         if self.config['size'] == 40.0 * inch_to_mm:
-            p = import_stl("cots/linear_actuators/PA-14P-40.stl")
+            p = cots_stl("cots/linear_actuators/PA-14P-40.stl")
         return color(BlackPaint) (translate([-self.config['dist_to_mount'], self.config['dist_to_mount2'], self.config['width'] / 2.0]) (p))
 
 class LinearActuatorMountingBracketBRK14(Component):
@@ -274,7 +275,7 @@ class LinearActuatorMountingBracketBRK14(Component):
         self.config = config
 
     def create(self):
-        return color(BlackPaint) (rotate(-90, [0, 0, 1]) (rotate(90, [0, 1, 0]) (translate([15.62 - self.config['width'] / 2.0, 11.899 - self.config['height_to_axle'], self.config['length'] - self.config['length_to_axle']]) (import_stl("cots/linear_actuators/BRK-14.stl")))))
+        return color(BlackPaint) (rotate(-90, [0, 0, 1]) (rotate(90, [0, 1, 0]) (translate([15.62 - self.config['width'] / 2.0, 11.899 - self.config['height_to_axle'], self.config['length'] - self.config['length_to_axle']]) (cots_stl("cots/linear_actuators/BRK-14.stl")))))
     
 class LinearActuatorMountingBracketBRK03(Component):
     # waiting on revised 3D model
@@ -286,7 +287,7 @@ class LinearActuatorMountingBracketBRK03(Component):
         
     def create(self):
         inch_to_mm = 25.4
-        return color(BlackPaint) (translate([10.0, (0.79 + 0.75 / 2.0 + 5.16 + 0.11) * inch_to_mm + 1, 0]) (rotate(90, [1, 0, 0]) (rotate(90, [0, 0, 1]) (scale(20.066/50.8386) (import_stl("cots/linear_actuators/BRK-03.stl"))))))
+        return color(BlackPaint) (translate([10.0, (0.79 + 0.75 / 2.0 + 5.16 + 0.11) * inch_to_mm + 1, 0]) (rotate(90, [1, 0, 0]) (rotate(90, [0, 0, 1]) (scale(20.066/50.8386) (cots_stl("cots/linear_actuators/BRK-03.stl"))))))
     
 class LinearActuatorPA12T(Component):
     # waiting on revised 3D model
@@ -297,7 +298,7 @@ class LinearActuatorPA12T(Component):
         self.config = config
 
     def create(self):
-        return color(BlackPaint) (translate([0, -self.config['dist_to_mount'], 0]) (rotate(-90, [0, 0, 1]) (rotate(-90, [1, 0, 0]) (import_stl("cots/linear_actuators/PA-12-1.06.stl")))))
+        return color(BlackPaint) (translate([0, -self.config['dist_to_mount'], 0]) (rotate(-90, [0, 0, 1]) (rotate(-90, [1, 0, 0]) (cots_stl("cots/linear_actuators/PA-12-1.06.stl")))))
 
 class LinearActuatorAndBracket(Component):
 
@@ -308,4 +309,4 @@ class LinearActuatorAndBracket(Component):
         self.config = config
         
     def create(self):
-        return rotate(self.config['angle'], [0, 0, 1]) (LinearActuatorPA14P(self.actuator_config, self.config['stroke']).create()) + translate([0, -self.config['explode_dist'], 0]) (LinearActuatorMountingBracketBRK14(self.bracket_config).create())
+        return rotate(self.config['angle'], [0, 0, 1]) (LinearActuatorPA14P(self.actuator_config, self.config['stroke']).build()) + translate([0, -self.config['explode_dist'], 0]) (LinearActuatorMountingBracketBRK14(self.bracket_config).build())
@@ -0,0 +1,120 @@
+import numpy as np
+from solid import *
+
+from pyMDA.parts.rounded import _polyhedron
+
+#
+# Tubes swept along a path
+#
+# A round tube along a polyline is one polyhedron: a ring of vertices at
+# each point, perpendicular to the mean of the directions in and out of it
+# and stretched across the bend so the wall keeps its thickness (a mitre
+# joint), closed by half spheres at the ends. The rings are turned with
+# parallel transport frames (double reflection, Wang et al. 2008), which
+# don't twist around the path the way Frenet frames do where it straightens
+# out. On a closed path any twist left where the ends meet is spread along
+# the whole tube.
+#
+# The radius should be smaller than the path's radius of curvature, else
+# the inside of the bends folds over itself.
+#
+
+# limit of the stretch of a ring at a sharp bend
+MAX_MITRE = 4.0
+
+def _unit(v):
+    length = np.linalg.norm(v, axis = -1, keepdims = True)
+    return np.divide(v, length, out = np.zeros_like(v), where = length > 0)
+
+def _perpendicular(t):
+    # the axis least aligned with t, made perpendicular to it
+    axis = np.zeros(3)
+    axis[np.argmin(np.abs(t))] = 1.0
+    return _unit(axis - (axis @ t) * t)
+
+def path_directions(points, closed = False):
+    """Unit directions of the segments in and out of each point ((n, 3) each, copies at open ends)."""
+    d = _unit(np.roll(points, -1, axis = 0) - points)
+    if closed:
+        return np.roll(d, 1, axis = 0), d
+    d = d[:-1]
+    return np.concatenate([d[:1], d]), np.concatenate([d, d[-1:]])
+
+def transport_frames(points, tangents, closed = False):
+    """(n, 3) normals along a path, parallel transported from a normal of the first tangent."""
+    n = len(points)
+    normals = np.zeros((n, 3))
+    normals[0] = _perpendicular(tangents[0])
+    steps = n if closed else n - 1
+    for i in range(steps):
+        j = (i + 1) % n
+        # reflect in the plane between the points, then in the one between the tangents
+        v1 = points[j] - points[i]
+        c1 = v1 @ v1
+        r, t = normals[i], tangents[i]
+        if c1 > 0:
+            r = r - (2.0 / c1) * (v1 @ r) * v1
+            t = t - (2.0 / c1) * (v1 @ t) * v1
+        v2 = tangents[j] - t
+        c2 = v2 @ v2
+        if c2 > 0:
+            r = r - (2.0 / c2) * (v2 @ r) * v2
+        r = _unit(r - (r @ tangents[j]) * tangents[j])
+        if j == 0:
+            # back at the start, undo the twist in equal steps
+            b0 = np.cross(tangents[0], normals[0])
+            twist = np.arctan2(r @ b0, r @ normals[0])
+            a = -twist * np.arange(n) / n
+            b = np.cross(tangents, normals)
+            normals = np.cos(a)[:, None] * normals + np.sin(a)[:, None] * b
+        else:
+            normals[j] = r
+    return normals
+
+def tube(points, radius, segments, closed = False):
+    """polyhedron() of a tube of radius along points, with round ends unless closed."""
+    pts = np.asarray(points, dtype = float).reshape(-1, 3)
+    # repeated points have no direction
+    keep = np.concatenate([[True], np.any(np.abs(np.diff(pts, axis = 0)) > 1e-12, axis = 1)])
+    pts = pts[keep]
+    if closed and len(pts) > 1 and np.allclose(pts[0], pts[-1]):
+        pts = pts[:-1]
+    if len(pts) < 2 or (closed and len(pts) < 3):
+        return translate(pts[0].tolist()) (sphere(r = radius, segments = segments))
+
+    d_in, d_out = path_directions(pts, closed)
+    tangents = _unit(d_in + d_out)
+    # a reversal leaves no mean direction, keep the incoming one
+    flat = np.linalg.norm(tangents, axis = 1) == 0
+    tangents[flat] = d_in[flat]
+    normals = transport_frames(pts, tangents, closed)
+    binormals = np.cross(tangents, normals)
+
+    n = max(int(segments) // 4 * 4, 4)
+    a = 2.0 * np.pi * np.arange(n) / n
+    ring = np.cos(a)[None, :, None] * normals[:, None, :] + np.sin(a)[None, :, None] * binormals[:, None, :]
+
+    # mitre: stretch along the bend by 1 / cos(half the bend angle)
+    bend = _unit(d_out - d_in)
+    half_cos = np.linalg.norm(d_in + d_out, axis = 1) / 2.0
+    stretch = np.minimum(np.divide(1.0, half_cos, out = np.full_like(half_cos, MAX_MITRE), where = half_cos > 0), MAX_MITRE) - 1.0
+    along = np.einsum('ijk,ik->ij', ring, bend)
+    ring = ring + (stretch[:, None] * along)[:, :, None] * bend[:, None, :]
+    rings = [pts[:, None, :] + radius * ring]
+
+    if not closed:
+        # half spheres of quarter circles of latitude, down to a single point
+        k = n // 4
+        phi = np.radians(90.0 * np.arange(1, k + 1) / k)
+        cos_phi = np.cos(phi)
+        cos_phi[-1] = 0.0
+        start = [pts[0] - radius * np.sin(p) * tangents[0] + c * radius * ring[0] for p, c in zip(phi, cos_phi)]
+        end = [pts[-1] + radius * np.sin(p) * tangents[-1] + c * radius * ring[-1] for p, c in zip(phi, cos_phi)]
+        rings = [np.array(start[::-1])] + rings + [np.array(end)]
+    rings = np.concatenate(rings)
+
+    count = len(rings)
+    index = lambda i, j: (i % count) * n + j % n
+    last = count if closed else count - 1
+    faces = [[index(i, j), index(i + 1, j), index(i + 1, j + 1), index(i, j + 1)] for i in range(last) for j in range(n)]
+    return _polyhedron(rings.reshape(-1, 3), faces)
@@ -0,0 +1,71 @@
+import os
+import time
+import functools
+import contextlib
+
+#
+# Build tracing
+#
+# Nested spans (build_* functions, create(), assemble(), SCAD serialization,
+# file writes, OpenSCAD runs) written in the Chrome trace event format, to be
+# opened in chrome://tracing or https://ui.perfetto.dev. Each span carries
+# its process and thread id so parallel builds get their own tracks.
+#
+
+class Tracer:
+
+    def __init__(self):
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        self.events = []
+        self.threads = {}
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, category = "pyMDA", **args):
+        """Record the time spent in the with block as a span."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            import threading
+            tid = threading.get_ident()
+            self.threads.setdefault((os.getpid(), tid), threading.current_thread().name)
+            self.events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": args
+            })
+
+    def to_dict(self):
+        names = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for (pid, tid), name in self.threads.items()]
+        return {"traceEvents": names + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, filename):
+        import json
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+tracer = Tracer()
+
+def traced(func):
+    """Decorator recording each call of func as a span named after it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        with tracer.span(func.__name__, "build"):
+            return func(*args, **kwargs)
+    return wrapper
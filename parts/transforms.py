@@ -0,0 +1,157 @@
+import math
+import numpy as np
+from solid import *
+from solid.solidpython import OpenSCADObject
+
+from pyMDA.parts.tree import _ScadName
+
+#
+# Homogeneous 4x4 transforms
+#
+# Rotations follow OpenSCAD's rotate([x, y, z]): about X first, then Y,
+# then Z, i.e. R = Rz * Ry * Rx.
+#
+
+def translation_matrix(v):
+    m = np.identity(4)
+    m[:3, 3] = v
+    return m
+
+def rotation_matrix(r):
+    rx, ry, rz = [math.radians(a) for a in r]
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    m = np.identity(4)
+    m[:3, :3] = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]]) @ \
+        np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]]) @ \
+        np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    return m
+
+def transform_matrix(position = (0, 0, 0), rotation = (0, 0, 0)):
+    """Matrix of translate(position) (rotate(rotation) (...))."""
+    return translation_matrix(position) @ rotation_matrix(rotation)
+
+def transform_matrices(positions, rotations):
+    """Vectorized transform_matrix() for k positions and rotations, as a (k, 4, 4) array."""
+    positions = np.asarray(positions, dtype = float).reshape(-1, 3)
+    rx, ry, rz = np.radians(np.asarray(rotations, dtype = float).reshape(-1, 3)).T
+    cx, sx = np.cos(rx), np.sin(rx)
+    cy, sy = np.cos(ry), np.sin(ry)
+    cz, sz = np.cos(rz), np.sin(rz)
+    m = np.zeros((len(positions), 4, 4))
+    # Rz * Ry * Rx written out
+    m[:, 0, 0] = cz * cy
+    m[:, 0, 1] = cz * sy * sx - sz * cx
+    m[:, 0, 2] = cz * sy * cx + sz * sx
+    m[:, 1, 0] = sz * cy
+    m[:, 1, 1] = sz * sy * sx + cz * cx
+    m[:, 1, 2] = sz * sy * cx - cz * sx
+    m[:, 2, 0] = -sy
+    m[:, 2, 1] = cy * sx
+    m[:, 2, 2] = cy * cx
+    m[:, :3, 3] = positions
+    m[:, 3, 3] = 1.0
+    return m
+
+def plane_normal(axis):
+    """Unit normal for an axis name ('x', 'y', 'z'), an axis index or a normal vector."""
+    if isinstance(axis, str):
+        axis = "xyz".index(axis.lower())
+    if isinstance(axis, (int, np.integer)):
+        n = np.zeros(3)
+        n[axis] = 1.0
+        return n
+    n = np.asarray(axis, dtype = float)
+    return n / np.linalg.norm(n)
+
+def plane_basis(normal):
+    """Two unit vectors (u, v) spanning the plane with the given normal.
+
+    For the axis planes these are the remaining axes in order, e.g. (y, z)
+    for a cut along x, so 2D coordinates read like a drawing view.
+    """
+    normal = plane_normal(normal)
+    axes = np.flatnonzero(np.abs(normal) > 1e-12)
+    if len(axes) == 1:
+        u, v = [np.identity(3)[i] for i in range(3) if i != axes[0]]
+        return u, v
+    # least aligned axis as a helper for the first vector
+    helper = np.identity(3)[int(np.argmin(np.abs(normal)))]
+    u = np.cross(helper, normal)
+    u = u / np.linalg.norm(u)
+    return u, np.cross(normal, u)
+
+def transform_points(m, pts):
+    """Apply a 4x4 matrix to an (n, 3) array of points."""
+    pts = np.asarray(pts, dtype = float)
+    return pts @ m[:3, :3].T + m[:3, 3]
+
+def is_identity(m):
+    return np.allclose(m, np.identity(4), rtol = 0, atol = 1e-12)
+
+def apply_matrix(m, model):
+    """Wrap model in a single multmatrix, or return it untouched for the identity."""
+    if is_identity(m):
+        return model
+    # drop float noise such as cos(90) = 6e-17 so the SCAD output stays readable
+    m = np.round(m, 12) + 0.0
+    return multmatrix(m = m.tolist()) (model)
+
+def transform_boxes(matrices, mins, maxs):
+    """Axis aligned boxes (mins, maxs) of k boxes under k matrices, as (k, 3) arrays.
+
+    Gives the same result as transforming the 8 corners of each box, but
+    works on the box center and half extents instead.
+    """
+    matrices = np.asarray(matrices, dtype = float).reshape(-1, 4, 4)
+    mins = np.asarray(mins, dtype = float).reshape(-1, 3)
+    maxs = np.asarray(maxs, dtype = float).reshape(-1, 3)
+    centers = (mins + maxs) / 2.0
+    half = (maxs - mins) / 2.0
+    r = matrices[:, :3, :3]
+    c = np.einsum('kij,kj->ki', r, centers) + matrices[:, :3, 3]
+    h = np.einsum('kij,kj->ki', np.abs(r), half)
+    return c - h, c + h
+
+#
+# Patterns - copies of one item, kept as a (k, 4, 4) array of transforms
+#
+
+def pattern_matrices(kind = 'linear', count = 2, pitch = 10.0, angle = None, radius = 0.0):
+    """Transforms of the copies of a pattern, as a (k, 4, 4) array.
+
+    linear:   count copies, pitch apart along X (or along a pitch vector)
+    grid:     count (nx, ny[, nz]) copies, pitch (or per axis pitches) apart
+    circular: count copies, angle degrees apart about Z (360 / count by
+              default), radius from the axis and turned to face outwards
+    """
+    if kind == 'linear':
+        step = np.array([pitch, 0, 0] if np.ndim(pitch) == 0 else pitch, dtype = float)
+        positions = np.arange(count)[:, None] * step
+        rotations = np.zeros((count, 3))
+    elif kind == 'grid':
+        counts = list(count) + [1] * (3 - len(count))
+        pitches = np.broadcast_to(np.asarray(pitch, dtype = float), (len(count),)).tolist() + [0.0] * (3 - len(count))
+        index = np.indices(counts).reshape(3, -1).T
+        positions = index * np.array(pitches)
+        rotations = np.zeros((len(positions), 3))
+    elif kind == 'circular':
+        step = 360.0 / count if angle is None else angle
+        a = step * np.arange(count)
+        positions = np.column_stack([radius * np.cos(np.radians(a)), radius * np.sin(np.radians(a)), np.zeros(count)])
+        rotations = np.column_stack([np.zeros(count), np.zeros(count), a])
+    else:
+        raise ValueError("Unknown pattern kind '%s'" % kind)
+    if len(positions) == 0:
+        raise ValueError("A pattern needs at least one copy")
+    return transform_matrices(positions, rotations)
+
+def place_instances(matrices, model, loop = True):
+    """Place model by each of the matrices, with one for() loop or a union of multmatrix calls."""
+    matrices = np.round(np.asarray(matrices, dtype = float), 12) + 0.0
+    if len(matrices) == 1:
+        return apply_matrix(matrices[0], model)
+    if loop:
+        return OpenSCADObject('for', {'m': matrices.tolist()}) (multmatrix(m = _ScadName('m')) (model))
+    return union() (*[multmatrix(m = m.tolist()) (model) for m in matrices])
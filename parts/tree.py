@@ -0,0 +1,66 @@
+from solid import *
+from solid.solidpython import OpenSCADObject
+
+#
+# Helpers for walking and rewriting SolidPython trees
+#
+# Trees built from cached components share subtrees, so the helpers
+# visit each node object once and never recurse (large assemblies are
+# deeper than Python's recursion limit).
+#
+
+class _ScadName:
+    """A bare OpenSCAD identifier as a parameter value, e.g. a loop variable."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+def postorder(obj):
+    """Return the unique nodes under obj, children before their parents."""
+    order = []
+    seen = set()
+    stack = [(obj, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        for child in reversed(node.children):
+            if id(child) not in seen:
+                stack.append((child, False))
+    return order
+
+def copy_node(node, children):
+    """Shallow copy of node with a new list of children (the original node is left untouched)."""
+    other = object.__new__(type(node))
+    other.__dict__.update(node.__dict__)
+    other.children = list(children)
+    return other
+
+def _is_plain_union(node):
+    return node.name == 'union' and not node.modifier and not node.is_hole and not node.is_part_root
+
+def flatten_unions(obj):
+    """Return obj with nested unions merged into their parent union, e.g. union(union(a, b), c) -> union(a, b, c)."""
+    rewritten = {}
+    for node in postorder(obj):
+        children = []
+        for child in node.children:
+            new_child = rewritten[id(child)]
+            if _is_plain_union(node) and _is_plain_union(new_child):
+                children.extend(new_child.children)
+            else:
+                children.append(new_child)
+
+        if len(children) != len(node.children) or any(a is not b for a, b in zip(children, node.children)):
+            rewritten[id(node)] = copy_node(node, children)
+        else:
+            rewritten[id(node)] = node
+    return rewritten[id(obj)]
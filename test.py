@@ -1,29 +1,31 @@
 import argparse
-from solid import *
-from solid.utils import *
-
-from pyMDA.parts.core import *
-from pyMDA.parts.geometry import *
-from pyMDA.parts.curved import *
-from pyMDA.parts.bezier_curve import *
-from pyMDA.parts.plates import *
-from pyMDA.parts.gears import *
-
-from pyMDA.parts.stock_materials import *
-from pyMDA.parts.stock_magnets import *
-from pyMDA.parts.stock_motors import *
-from pyMDA.parts.stock_bearings import *
-from pyMDA.parts.stock_fixtures import *
-from pyMDA.parts.stock_electronics import *
-from pyMDA.parts.stock_robots import *
-
-from pyMDA.parts.collar import *
-from pyMDA.parts.cam_profile import *
-from pyMDA.parts.scotch_yoke import *
-
-from pyMDA.parts.enclosures import *
-
-from pyMDA.parts.holes import *
+import math
+import os
+from solid import polygon, union
+
+from pyMDA.parts.core import QUALITIES, quality, profiler, tracer, traced, openscad_render, export_model
+from pyMDA.parts.render_cost import render_cost_report, set_render_budget
+from pyMDA.parts.hull import set_polyhedron_hulls
+
+# parts are looked up in the pyMDA.parts registry, which imports their modules on first use
+from pyMDA.parts import (
+    Assembly,
+    Cube, Cylinder, Sphere, Pyramid, Cone, Tetrahedron, Torus, TriangularPrism, HexagonalPrism,
+    CubeCurvedSides, BarCurvedEdges, CylinderCurvedEdges, LineRoundViaHull, PolylineRound,
+    BezierCurve,
+    PlateWithMountingHoles, PlateWithMountingHolesEdges, PlateWithFillets, Pulley,
+    Slot, SlotCurve, SpeakerGrill,
+    GearSpur, GearHerringbone,
+    Collar, CamProfile, ScotchYoke,
+    Boss, BossPlate, BossPlateDual, RubberButton, LightpipeStraight,
+    SHS, CS, LS, SB, Rod, Sheet,
+    MagnetCoin,
+    MotorDC, GearboxWorm, ServoRDS3225, StepperDriver, Stepper, LinearActuatorPA14P,
+    Bearing, BearingPillowBlockUCP201, BearingPillowBlockUCP204,
+    FixtureCounterSunk, FixtureSocket, Washer,
+    PCBHeader, PCBHeaderDual, POTSide, FuseMini, FuseHolderMini, RPI, RPIDisplay, NVidiaJetsonNano, PCBCamera,
+    RobotCartesianGantryThreeAxis,
+)
 
 #
 # NOTES:
@@ -42,6 +44,7 @@ from pyMDA.parts.holes import *
 # * stock_motors could perhaps be more advanced OO of motor models for example
 #
 
+@traced
 def build_geometry(config):
     assembly = Assembly()
     assembly.add('cube', Cube(10, 10, 10), position=([1, 2, 3]))
@@ -57,6 +60,7 @@ def build_geometry(config):
     return assembly
 
 
+@traced
 def build_curved(config):
     assembly = Assembly()
     assembly.add('cube_curved_sides', CubeCurvedSides(20, 20, 20, 5, 4))
@@ -66,6 +70,7 @@ def build_curved(config):
     assembly.stack_y(10)
     return assembly
 
+@traced
 def build_pts(config):
     assembly = Assembly()
 
@@ -78,7 +83,7 @@ def build_pts(config):
     p1 = (0, 0, 100)
     p2 = (0, 100, 0)
     p3 = (100, 100, 100)
-    pts = BezierCurve(0.05, p0, p1, p2, p3).create()
+    pts = BezierCurve(None, p0, p1, p2, p3).create()
     for i in pts:
         print (i)
     assembly.add('bezier_curve', PolylineRound(pts, 5))
@@ -87,6 +92,7 @@ def build_pts(config):
 
     return assembly
 
+@traced
 def build_plates(config):
 
     assembly = Assembly()
@@ -124,6 +130,7 @@ def build_plates(config):
     
     return assembly
 
+@traced
 def build_holes(config):
 
     assembly = Assembly()
@@ -166,6 +173,7 @@ def build_holes(config):
     
     return assembly
 
+@traced
 def build_gears(config):
 
     assembly = Assembly()
@@ -198,6 +206,7 @@ def build_gears(config):
 
     return assembly
 
+@traced
 def build_features(config):
     
     assembly = Assembly()
@@ -254,7 +263,6 @@ def build_features(config):
         "start_angle": math.radians(180.0),
         "end_radius": 10.0 / 2.0 + config['collar']['connection_gap'],
         "end_angle": math.radians(360.0),
-        "increment": 0.01,
         "is_center": True
     }
     assembly.add('cam_profile', CamProfile(config["cam_profile"]))
@@ -263,6 +271,7 @@ def build_features(config):
     
     return assembly
 
+@traced
 def build_enclosures(config):
     
     assembly = Assembly()
@@ -319,6 +328,7 @@ def build_enclosures(config):
     
     return assembly
     
+@traced
 def build_stock_materials(config):
     
     assembly = Assembly()
@@ -336,12 +346,14 @@ def build_stock_materials(config):
     
     return assembly
 
+@traced
 def build_stock_magnets(config):
     assembly = Assembly()
     assembly.add('coin_magnet', MagnetCoin(20, 1.0))
     assembly.stack_y(10)
     return assembly
 
+@traced
 def build_stock_motors(config):    
 
     assembly = Assembly()
@@ -448,6 +460,7 @@ def build_stock_motors(config):
         
     return assembly
 
+@traced
 def build_stock_bearings(config):
     
     assembly = Assembly()
@@ -466,6 +479,7 @@ def build_stock_bearings(config):
 
     return assembly
 
+@traced
 def build_stock_fixtures(config):
     
     assembly = Assembly()
@@ -478,6 +492,7 @@ def build_stock_fixtures(config):
     
     return assembly
 
+@traced
 def build_stock_electronics(config):
     
     assembly = Assembly()
@@ -570,6 +585,7 @@ def build_stock_electronics(config):
     
     return assembly
 
+@traced
 def build_stock_robots(config):
     
     assembly = Assembly()
@@ -656,27 +672,71 @@ def build(config):
 
 def main():
     parser = argparse.ArgumentParser(description="Controls for 3D printer component assemblies")
+    parser.add_argument('--quality', choices=sorted(QUALITIES), default='preview', help='Render quality profile')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE', help='Profile the build, print a report or write it to a JSON file')
     parser.add_argument('--test', action='store_true', help='Run tests on the assembly')
     parser.add_argument('--export', type=str, help='Export assembly to SCAD file', metavar='FILENAME')
+    parser.add_argument('--modules', action='store_true', help='Write repeated subtrees as OpenSCAD modules when exporting')
     parser.add_argument('--cross-section', nargs=2, metavar=('AXIS', 'POSITION'), help='Generate a cross-sectional view of the assembly')
+    parser.add_argument('--bom', action='store_true', help='Print the bill of materials of the assembly')
+    parser.add_argument('--interference', action='store_true', help='List the parts of the assembly that collide')
+    parser.add_argument('--outline', action='store_true', help='With --cross-section, also export the 2D outlines of the cut items')
+    parser.add_argument('--render-budget', type=float, metavar='COST', help='Rank the booleans of the assembly by estimated render cost and warn on exports above COST')
+    parser.add_argument('--polyhedron-hulls', action='store_true', help='Export hulls of primitives as the polyhedra they evaluate to')
+    parser.add_argument('--trace', type=str, metavar='FILE', help='Write a Chrome/Perfetto trace of the build to FILE')
+    parser.add_argument('--render', type=str, metavar='OUTPUT', help='With --export, render the SCAD file with OpenSCAD to OUTPUT (e.g. an STL)')
 
     args = parser.parse_args()
 
-    config = {}
-
-    assembly = build(config)
-
-    if args.test:
-        assembly.test_assembly()
-
-    if args.export:
-        assembly.export_scad(args.export)
-
-    if args.cross_section:
-        axis, position = args.cross_section
-        cross_section = assembly.cross_section_view(axis, float(position))
-        scad_render_to_file(cross_section, f'{args.export}_cross_section.scad')
-        print(f"Cross-sectional view exported as {args.export}_cross_section.scad")
+    profiler.enabled = args.profile is not None
+    tracer.enabled = args.trace is not None
+    set_render_budget(args.render_budget)
+    set_polyhedron_hulls(args.polyhedron_hulls)
+
+    with quality(args.quality):
+        config = {}
+
+        assembly = build(config)
+
+        if args.profile == '-':
+            print(profiler.report())
+        elif args.profile:
+            profiler.write_json(args.profile)
+            print(f"Profile written to {args.profile}")
+
+        if args.test:
+            assembly.test_assembly()
+
+        if args.bom:
+            print(assembly.bill_of_materials())
+
+        if args.render_budget is not None:
+            print(render_cost_report(assembly.assemble(), args.render_budget))
+
+        if args.interference:
+            pairs = assembly.find_interferences(workers=os.cpu_count() or 1)
+            for a, b in pairs:
+                print(f"Interference: {a} <-> {b}")
+            print(f"{len(pairs)} interferences found")
+
+        if args.export:
+            assembly.export_scad(args.export, use_modules=args.modules)
+            if args.render:
+                openscad_render(args.export, args.render)
+
+        if args.cross_section:
+            axis, position = args.cross_section
+            cross_section = assembly.cross_section_view(axis, float(position))
+            export_model(cross_section, f'{args.export}_cross_section.scad')
+            print(f"Cross-sectional view exported as {args.export}_cross_section.scad")
+            if args.outline:
+                outline = assembly.cross_section_outline(axis, float(position))
+                export_model(union()(*[polygon(points) for points in outline.values()]), f'{args.export}_outline.scad')
+                print(f"Cross-section outline exported as {args.export}_outline.scad")
+
+    if args.trace:
+        tracer.write(args.trace)
+        print(f"Trace written to {args.trace}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,32 @@
+import numpy as np
+from collections import Counter
+
+#
+# Checks of generated meshes
+#
+
+def open_edges(faces):
+    """Directed edges without exactly one opposite edge, empty for a closed, consistently oriented mesh."""
+    edges = Counter((f[k], f[(k + 1) % len(f)]) for f in faces for k in range(len(f)))
+    return [e for e, n in edges.items() if n != 1 or edges.get(e[::-1]) != 1]
+
+def signed_volume(points, faces):
+    """Volume of a closed mesh, positive if its faces are counter-clockwise seen from outside."""
+    points = np.asarray(points, dtype = float)
+    volume = 0.0
+    for f in faces:
+        # fan of triangles from the first corner
+        a = points[f[0]]
+        for b, c in zip(points[f[1:-1]], points[f[2:]]):
+            volume += a @ np.cross(b, c) / 6.0
+    return volume
+
+def polyhedron_mesh(node):
+    """Points and faces of a polyhedron() node."""
+    assert node.name == 'polyhedron'
+    return np.asarray(node.params['points'], dtype = float), [list(f) for f in node.params['faces']]
+
+def sphere_points(n, radius = 10.0, seed = 0):
+    """n random points on a sphere."""
+    p = np.random.default_rng(seed).normal(size = (n, 3))
+    return radius * p / np.linalg.norm(p, axis = 1, keepdims = True)
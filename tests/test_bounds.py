@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Assembly
+
+#
+# Cached assembly bounds
+#
+
+@pytest.fixture
+def measured(monkeypatch):
+    """Names passed to Assembly._measure_items, to see what is measured again."""
+    names = []
+    measure = Assembly._measure_items
+    def counting(self, items):
+        names.extend(items)
+        return measure(self, items)
+    monkeypatch.setattr(Assembly, '_measure_items', counting)
+    return names
+
+def test_bounds_are_cached(measured):
+    a = Assembly()
+    a.add('a', Cube(2, 2, 2))
+    a.add('b', Cube(2, 2, 2), position = (10, 0, 0))
+    assert a.get_bounds() == ((-1, -1, -1), (11, 1, 1))
+    assert sorted(measured) == ['a', 'b']
+    a.get_bounds()
+    a.get_width()
+    assert len(measured) == 2
+
+def test_moving_an_item(measured):
+    a = Assembly()
+    a.add('a', Cube(2, 2, 2))
+    a.add('b', Cube(2, 2, 2))
+    a.get_bounds()
+    del measured[:]
+    a.items['b']['position'] = (0, 0, 5)
+    assert a.get_bounds() == ((-1, -1, -1), (1, 1, 6))
+    assert measured == ['b']
+
+def test_moving_a_parent(measured):
+    a = Assembly()
+    a.add('base', Cube(2, 2, 2))
+    a.add('arm', Cube(2, 2, 2), position = (4, 0, 0), parent = 'base')
+    a.add('other', Cube(2, 2, 2), position = (-4, 0, 0))
+    a.get_bounds()
+    del measured[:]
+    a.items['base']['position'] = (0, 3, 0)
+    assert a.get_item_bounds('arm') == ((3, 2, -1), (5, 4, 1))
+    a.get_bounds()
+    assert sorted(measured) == ['arm', 'base']
+
+def test_resizing_a_component(measured):
+    part = Cube(2, 2, 2)
+    inner = Assembly()
+    inner.add('part', part)
+    outer = Assembly()
+    outer.add('inner', inner, position = (0, 0, 10))
+    outer.add('other', Cube(2, 2, 2))
+    assert outer.get_height() == 12
+    del measured[:]
+    # the change reaches the assemblies using the part, however deep
+    part.bounding_box['height'] = 6
+    assert inner.get_height() == 6
+    assert outer.get_bounds() == ((-1, -1, -1), (1, 1, 13))
+    assert 'other' not in measured
+
+def test_shared_component():
+    part = Cube(2, 2, 2)
+    a = Assembly()
+    a.add('left', part, position = (-5, 0, 0))
+    a.add('right', part, position = (5, 0, 0))
+    assert a.get_width() == 12
+    part.bounding_box['width'] = 4
+    assert a.get_width() == 14
+    # replacing the item stops following the old one
+    a.add('right', Cube(2, 2, 2), position = (5, 0, 0))
+    part.bounding_box['width'] = 8
+    assert a.get_bounds()[1][0] == 6
+
+def test_stack_and_center():
+    a = Assembly()
+    a.add('a', Cube(2, 2, 2))
+    a.add('b', Cube(4, 4, 4))
+    a.add('c', Cube(6, 6, 6))
+    a.stack_x(1)
+    assert [a.items[n]['position'][0] for n in 'abc'] == [0, 4, 10]
+    assert a.get_bounds()[0][0] == -1 and a.get_bounds()[1][0] == 13
+    a.center_assembly()
+    lo, hi = a.get_bounds()
+    assert lo[0] == -hi[0] and lo[2] == -hi[2]
+
+#
+# Rotation-aware bounds
+#
+
+def test_rotated_item():
+    a = Assembly()
+    a.add('bar', Cube(10, 2, 2), rotation = (0, 0, 90))
+    assert np.allclose(a.get_bounds(), ((-1, -5, -1), (1, 5, 1)))
+    a.items['bar']['rotation'] = (0, 0, 45)
+    lo, hi = a.get_bounds()
+    assert hi[0] == pytest.approx(12 / 2 ** 0.5 / 2) and lo[0] == pytest.approx(-hi[0])
+
+def test_off_center_origin():
+    # a part standing on z = 0, laid on its side
+    part = Cube(2, 2, 10)
+    part.origin = [0, 0, 5]
+    a = Assembly()
+    a.add('part', part, rotation = (0, 90, 0))
+    assert np.allclose(a.get_bounds(), ((0, -1, -1), (10, 1, 1)))
+
+def test_rotated_parent_chain():
+    a = Assembly()
+    a.add('base', Cube(2, 2, 2), rotation = (0, 0, 90))
+    a.add('arm', Cube(10, 2, 2), position = (6, 0, 0), parent = 'base')
+    assert np.allclose(a.get_item_bounds('arm'), ((-1, 1, -1), (1, 11, 1)))
+    a.items['base']['rotation'] = (0, 0, 180)
+    assert np.allclose(a.get_item_bounds('arm'), ((-11, -1, -1), (-1, 1, 1)))
+
+def test_rotated_sub_assembly():
+    inner = Assembly()
+    inner.add('bar', Cube(10, 2, 2), position = (5, 0, 0))
+    outer = Assembly()
+    outer.add('inner', inner, position = (0, 0, 3), rotation = (0, -90, 0))
+    assert np.allclose(outer.get_bounds(), ((-1, -1, 3), (1, 1, 13)))
@@ -0,0 +1,104 @@
+import numpy as np
+
+from solid import cube
+
+from pyMDA.parts import Cube
+from pyMDA.parts.bvh import BVH
+from pyMDA.parts.core import Component, Assembly
+
+#
+# BVH over boxes
+#
+
+def random_boxes(n, seed = 0):
+    rng = np.random.default_rng(seed)
+    mins = rng.uniform(-100, 100, (n, 3))
+    return mins, mins + rng.uniform(0.5, 10, (n, 3))
+
+def brute_box(mins, maxs, lo, hi):
+    return [i for i in range(len(mins)) if np.all(mins[i] <= hi) and np.all(maxs[i] >= lo)]
+
+def test_query_box():
+    mins, maxs = random_boxes(500)
+    bvh = BVH(mins, maxs)
+    for lo, hi in (((-10, -10, -10), (10, 10, 10)), ((50, -100, 0), (60, 100, 5)), ((200, 200, 200), (300, 300, 300))):
+        assert bvh.query_box(lo, hi) == brute_box(mins, maxs, np.array(lo), np.array(hi))
+
+def test_query_plane():
+    mins, maxs = random_boxes(500, seed = 1)
+    bvh = BVH(mins, maxs)
+    assert bvh.query_plane((1, 0, 0), 20.0) == [i for i in range(500) if mins[i, 0] <= 20 <= maxs[i, 0]]
+    # a slab finds the boxes ending just short of the plane
+    slab = bvh.query_plane((0, 0, 1), -5.0, thickness = 4.0)
+    assert slab == [i for i in range(500) if mins[i, 2] <= -3 and maxs[i, 2] >= -7]
+    # an oblique plane, tested against the box corners
+    normal = np.array([1.0, 1.0, 0.0]) / 2 ** 0.5
+    expected = []
+    for i in range(500):
+        corners = np.array([[x, y, z] for x in (mins[i, 0], maxs[i, 0]) for y in (mins[i, 1], maxs[i, 1]) for z in (mins[i, 2], maxs[i, 2])]) @ normal
+        if corners.min() <= 10 <= corners.max():
+            expected.append(i)
+    assert bvh.query_plane(normal, 10.0) == expected
+
+def test_refit():
+    mins, maxs = random_boxes(300, seed = 2)
+    bvh = BVH(mins, maxs)
+    moved = [3, 50, 299]
+    mins[moved] += 500
+    maxs[moved] += 500
+    bvh.refit(moved, mins[moved], maxs[moved])
+    assert bvh.refit_count == 3
+    assert bvh.query_box((300, 300, 300), (700, 700, 700)) == moved
+    assert not set(moved) & set(bvh.query_box((-100, -100, -100), (100, 100, 100)))
+
+def test_empty():
+    bvh = BVH(np.zeros((0, 3)), np.zeros((0, 3)))
+    assert bvh.query_box((0, 0, 0), (1, 1, 1)) == []
+
+#
+# Assembly region queries
+#
+
+class Unsized(Component):
+    """Declares no size, so it can't be ruled out of any query."""
+
+    def create(self):
+        return cube(1)
+
+def row(n = 20):
+    a = Assembly()
+    for i in range(n):
+        a.add('c%d' % i, Cube(2, 2, 2), position = (10 * i, 0, 0))
+    return a
+
+def test_assembly_queries():
+    a = row()
+    assert a.query_box((15, -1, -1), (31, 1, 1)) == ['c2', 'c3']
+    assert a.query_plane('x', 40) == ['c4']
+    assert a.query_plane('y', 5) == []
+    assert a.query_plane('x', 45, thickness = 12) == ['c4', 'c5']
+
+def test_queries_follow_moves():
+    a = row()
+    a.query_box((0, 0, 0), (1, 1, 1))
+    a.items['c7']['position'] = (0, 0, 50)
+    assert a.query_plane('z', 50) == ['c7']
+    assert a.query_plane('x', 70) == []
+    a.add('extra', Cube(2, 2, 2), position = (0, 0, 50))
+    assert a.query_plane('z', 50) == ['c7', 'extra']
+
+def test_unsized_items_are_always_found():
+    a = row(3)
+    a.add('unknown', Unsized(), position = (1000, 0, 0))
+    assert a.query_box((-1, -1, -1), (1, 1, 1)) == ['c0', 'unknown']
+
+def test_recursive_queries():
+    inner = row(3)
+    outer = Assembly()
+    outer.add('lying', inner, rotation = (0, 0, 90))
+    outer.add('cube', Cube(2, 2, 2), position = (50, 0, 0))
+    # the row now runs along y
+    assert outer.query_box((-1, 9, -1), (1, 11, 1)) == ['lying']
+    assert outer.query_box((-1, 9, -1), (1, 11, 1), recursive = True) == ['lying/c1']
+    assert outer.query_plane('y', 20, recursive = True) == ['lying/c2']
+    assert outer.query_plane('x', 0, recursive = True) == ['lying/c0', 'lying/c1', 'lying/c2']
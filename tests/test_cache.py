@@ -0,0 +1,94 @@
+from solid import cube, translate
+
+from pyMDA.parts import Cube, Cylinder
+from pyMDA.parts.core import Component, component_cache, quality
+
+#
+# Component cache (see ComponentCache)
+#
+
+class Sized(Component):
+    """Sets its size and config in create(), as many parts do."""
+
+    def __init__(self, size):
+        super().__init__()
+        self.config = {'size': size}
+
+    def create(self):
+        self.config['half'] = self.config['size'] / 2.0
+        self.bounding_box = {'width': self.config['size'], 'length': 1, 'height': 1}
+        self.origin = [self.config['half'], 0, 0]
+        return cube([self.config['size'], 1, 1])
+
+class Holder(Component):
+    """Builds its sub-components through build(), like the composite parts."""
+
+    def create(self):
+        return translate([0, 0, 5])(Cube(1, 2, 3).build()) + Cylinder(2, 4).build()
+
+def test_hits_and_misses():
+    component_cache.clear()
+    a = Cube(1, 2, 3).build()
+    b = Cube(1, 2, 3).build()
+    Cube(1, 2, 4).build()
+    assert component_cache.stats()['hits'] == 1 and component_cache.stats()['misses'] == 2
+    # each build gets its own root, the subtree below it is shared
+    assert a is not b and a.parent is None and b.parent is None
+    assert a.children[0] is b.children[0]
+
+def test_nested_builds_hit():
+    component_cache.clear()
+    Holder().build()
+    misses = component_cache.misses
+    Cube(1, 2, 3).build()
+    Cylinder(2, 4).build()
+    assert component_cache.misses == misses and component_cache.hits == 2
+
+def test_state_restored_on_hit():
+    component_cache.clear()
+    first = Sized(4)
+    first.build()
+    second = Sized(4)
+    assert second.fingerprint() == Sized(4).fingerprint()
+    second.build()
+    assert component_cache.hits == 1
+    assert second.config == {'size': 4, 'half': 2.0}
+    assert second.bounding_box == {'width': 4, 'length': 1, 'height': 1}
+    assert list(second.origin) == [2.0, 0, 0]
+    # the restored state is a copy, not the cached one
+    second.config['half'] = 0
+    third = Sized(4)
+    third.build()
+    assert third.config['half'] == 2.0
+
+def test_lru_eviction(monkeypatch):
+    component_cache.clear()
+    monkeypatch.setattr(component_cache, 'max_size', 2)
+    for w in (1, 2, 3):
+        Cube(w, 1, 1).build()
+    assert component_cache.stats()['size'] == 2 and component_cache.evictions == 1
+    # the least recently used entry went
+    Cube(1, 1, 1).build()
+    assert component_cache.misses == 4
+    Cube(3, 1, 1).build()
+    assert component_cache.hits == 1
+
+def test_key_includes_quality_and_params():
+    component_cache.clear()
+    part = Cylinder(10, 5)
+    with quality('draft'):
+        draft = part.fingerprint()
+    with quality('export'):
+        export = part.fingerprint()
+    assert draft != export
+    other = Cylinder(10, 5)
+    other.set_color([1, 0, 0])
+    assert other.fingerprint() != part.fingerprint()
+
+def test_unhashable_params_are_not_cached():
+    component_cache.clear()
+    part = Sized(2)
+    part.config['callback'] = lambda: None
+    assert part.fingerprint() is None
+    part.build()
+    assert component_cache.stats()['size'] == 0
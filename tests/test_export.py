@@ -0,0 +1,53 @@
+import re
+
+from solid import cube, cylinder, translate, union, difference, hole, scad_render
+
+from pyMDA.parts import SpeakerGrill
+from pyMDA.parts.export import find_repeated_subtrees, scad_render_modules
+
+#
+# Export with OpenSCAD modules
+#
+
+def modules(scad):
+    return dict(re.findall(r"module (\w+)\(\) \{(.*?)\n\}", scad, re.S))
+
+def test_repeated_subtrees_written_once():
+    pin = cylinder(r = 1, h = 5, segments = 12)
+    model = union()(*[translate([3 * i, 0, 0])(pin) for i in range(10)], cube(2))
+    scad = scad_render_modules(model)
+    bodies = modules(scad)
+    assert list(bodies) == ['cylinder_1']
+    assert scad.count("cylinder(") == 1
+    assert scad.count("cylinder_1();") == 10
+
+def test_identical_copies_are_merged():
+    # structurally equal subtrees built separately are one module too
+    model = union()(*[translate([i, 0, 0])(difference()(cube(4), cylinder(r = 1, h = 10, segments = 12))) for i in range(3)])
+    repeated, keys = find_repeated_subtrees(model)
+    assert len({keys[id(c.children[0])] for c in model.children}) == 1
+    scad = scad_render_modules(model)
+    name = next(n for n, body in modules(scad).items() if 'difference' in body)
+    assert scad.count(name + "();") == 3
+
+def test_min_nodes():
+    model = union()(translate([1, 0, 0])(cube(1)), translate([2, 0, 0])(cube(1)))
+    assert modules(scad_render_modules(model))
+    assert not modules(scad_render_modules(model, min_nodes = 2))
+
+def test_holes_stay_inline():
+    bolt = hole()(cylinder(r = 1, h = 10, segments = 12))
+    model = union()(translate([0, 0, 0])(cube(5), bolt), translate([10, 0, 0])(cube(5), bolt))
+    scad = scad_render_modules(model)
+    # the hole itself isn't moved into a module, so it is still subtracted at the root as scad_render() does
+    assert "Holes Below" in scad and "Holes Below" not in "".join(modules(scad).values())
+    holes = scad.split("Holes Below")[1]
+    assert holes.count("cylinder_") == 2
+
+def test_speaker_grill():
+    grill = SpeakerGrill({'dia': 50, 'pitch': 5, 'hole_dia': 3, 'wall_thickness': 2}).build()
+    scad = scad_render_modules(grill)
+    plain = scad_render(grill)
+    assert len(scad) < len(plain)
+    name = next(n for n, body in modules(scad).items() if 'cylinder' in body)
+    assert scad.count(name + "();") == plain.count("cylinder(")
@@ -0,0 +1,71 @@
+import itertools
+import numpy as np
+from solid import hull, cube, sphere, circle, square, translate, union
+
+from pyMDA.parts.hull import convex_hull, convex_hull_2d, resolve_hulls
+from pyMDA.tests.meshes import open_edges, signed_volume, polyhedron_mesh, sphere_points
+
+#
+# Convex hulls
+#
+
+def check_hull(points):
+    vertices, faces = convex_hull(points)
+    faces = faces.tolist()
+    assert not open_edges(faces)
+    volume = signed_volume(vertices, faces)
+    assert volume > 0
+    # every point is inside or on every face
+    tri = vertices[np.asarray(faces)]
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    n /= np.linalg.norm(n, axis = 1, keepdims = True)
+    dist = points @ n.T - np.einsum('ij,ij->i', n, tri[:, 0])
+    assert dist.max() <= 1e-7 * np.abs(points).max()
+    return vertices, volume
+
+def test_random_points():
+    rng = np.random.default_rng(1)
+    for seed in range(20):
+        check_hull(rng.normal(size = (int(rng.integers(4, 2000)), 3)) * rng.uniform(0.01, 100))
+
+def test_points_on_sphere():
+    vertices, volume = check_hull(sphere_points(3000))
+    assert len(vertices) == 3000
+    assert 0.95 * 4.0 / 3.0 * np.pi * 1000 < volume < 4.0 / 3.0 * np.pi * 1000
+
+def test_coplanar_points():
+    # a grid of points on the faces and inside of a cube, the hull is its 8 corners
+    grid = np.array(list(itertools.product(np.linspace(0, 10, 6), repeat = 3)))
+    vertices, volume = check_hull(grid)
+    assert len(vertices) == 8
+    assert abs(volume - 1000.0) < 1e-6
+
+def test_flat_points():
+    assert convex_hull(np.column_stack([np.random.default_rng(2).random((50, 2)), np.zeros(50)])) is None
+    assert convex_hull([[0, 0, 0], [1, 1, 1], [2, 2, 2], [3, 3, 3]]) is None
+
+def test_hull_2d():
+    pts = np.array(list(itertools.product(range(5), repeat = 2)), dtype = float)
+    assert sorted(map(tuple, convex_hull_2d(pts).tolist())) == [(0, 0), (0, 4), (4, 0), (4, 4)]
+
+def test_resolve_hulls():
+    model = union()(
+        hull()(*[translate(list(c))(sphere(r = 2, segments = 16)) for c in itertools.product((0, 10), repeat = 3)]),
+        hull()(circle(r = 3, segments = 12), translate([20, 0])(square(4))))
+    resolved = resolve_hulls(model)
+    solid, flat = resolved.children
+    points, faces = polyhedron_mesh(solid)
+    assert not open_edges(faces)
+    # OpenSCAD's faces are clockwise seen from outside
+    assert signed_volume(points, faces) < 0
+    # OpenSCAD's spheres are polyhedra inside the true sphere
+    lo, hi = points.min(axis = 0), points.max(axis = 0)
+    assert np.all((lo >= -2) & (lo < -1.9)) and np.all((hi <= 12) & (hi > 11.9))
+    assert flat.name == 'polygon'
+    # the original tree is left as it was
+    assert [c.name for c in model.children] == ['hull', 'hull']
+
+def test_unresolved_hulls():
+    # hulls of booleans are left to OpenSCAD
+    model = hull()(cube(5) - sphere(r = 3), translate([10, 0, 0])(cube(1)))
+    assert resolve_hulls(model) is model
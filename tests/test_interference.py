@@ -0,0 +1,87 @@
+import numpy as np
+
+from solid import cube, cylinder
+
+from pyMDA.parts import Cube, Cylinder, Sphere
+from pyMDA.parts.bvh import overlapping_pairs
+from pyMDA.parts.core import Component, Assembly, interference_cache, mesh_cache
+
+#
+# Interference checks
+#
+
+class Plate(Component):
+    """A 20 x 20 x 4 mm plate with a 6 mm hole in the middle."""
+
+    def __init__(self):
+        super().__init__()
+        self.bounding_box = {'width': 20, 'length': 20, 'height': 4}
+
+    def create(self):
+        return cube([20, 20, 4], center = True) - cylinder(d = 6, h = 10, center = True, segments = 32)
+
+def test_overlapping_pairs():
+    rng = np.random.default_rng(4)
+    mins = rng.uniform(0, 100, (300, 3))
+    maxs = mins + rng.uniform(1, 8, (300, 3))
+    expected = [(i, j) for i in range(300) for j in range(i + 1, 300)
+                if np.all(mins[i] <= maxs[j]) and np.all(mins[j] <= maxs[i])]
+    assert overlapping_pairs(mins, maxs) == expected
+
+def test_overlap_and_contact():
+    a = Assembly()
+    a.add('a', Cube(10, 10, 10))
+    a.add('overlapping', Cube(10, 10, 10), position = (9, 0, 0))
+    a.add('touching', Cube(10, 10, 10), position = (-10, 0, 0))
+    a.add('inside', Cube(2, 2, 2), position = (-10, 0, 0))
+    assert a.find_interferences() == [('a', 'overlapping'), ('touching', 'inside')]
+
+def test_boxes_overlap_but_solids_dont():
+    a = Assembly()
+    a.add('ball', Sphere(10))
+    # the corner of the ball's box, clear of the ball itself
+    a.add('cube', Cube(2, 2, 2), position = (5, 5, 5))
+    assert a.find_interferences() == []
+    a.items['cube']['position'] = (3, 3, 3)
+    assert a.find_interferences() == [('ball', 'cube')]
+
+def test_pin_through_hole():
+    a = Assembly()
+    a.add('plate', Plate())
+    a.add('pin', Cylinder(4, 20))
+    assert a.find_interferences() == []
+    a.add('pin', Cylinder(8, 20))
+    assert a.find_interferences() == [('plate', 'pin')]
+
+def test_rotated_and_nested():
+    bar = Assembly()
+    bar.add('bar', Cube(20, 2, 2))
+    a = Assembly()
+    a.add('left', bar, position = (0, -5, 0))
+    a.add('right', bar, position = (0, 5, 0))
+    assert a.find_interferences() == []
+    a.items['right']['rotation'] = (0, 0, 90)
+    a.items['right']['position'] = (0, 0, 0)
+    assert a.find_interferences() == [('left/bar', 'right/bar')]
+
+def test_results_are_cached():
+    interference_cache.clear()
+    mesh_cache.clear()
+    a = Assembly()
+    for i in range(5):
+        a.add('plate%d' % i, Plate(), position = (30 * i, 0, 0))
+        a.add('pin%d' % i, Cylinder(4, 20), position = (30 * i, 0, 0))
+    assert a.find_interferences() == []
+    # one mesh per kind of part, one narrow phase check per placement
+    assert len(mesh_cache) == 2 and len(interference_cache) == 1
+
+def test_workers():
+    interference_cache.clear()
+    a = Assembly()
+    for i in range(4):
+        a.add('a%d' % i, Cube(10, 10, 10), position = (20 * i, 0, 0))
+        a.add('b%d' % i, Cylinder(4 + 2 * i, 10), position = (20 * i + 7.5, 0, 0))
+    expected = a.find_interferences()
+    assert expected == [('a1', 'b1'), ('a2', 'b2'), ('a3', 'b3')]
+    interference_cache.clear()
+    assert a.find_interferences(workers = 2) == expected
@@ -0,0 +1,41 @@
+import os
+import numpy as np
+
+from pyMDA.parts.hull import convex_hull
+from pyMDA.parts.lod import decimate, lod_path, MIN_LOD_TRIANGLES
+from pyMDA.parts.stl import StlMesh, write_stl, load_stl
+from pyMDA.tests.meshes import sphere_points
+
+#
+# Levels of detail of COTS meshes
+#
+
+def sphere_mesh(n = 4000):
+    vertices, faces = convex_hull(sphere_points(n))
+    return StlMesh(vertices, faces)
+
+def test_decimate_meets_budget():
+    mesh = sphere_mesh()
+    for ratio in (0.5, 0.1, 0.05):
+        reduced = decimate(mesh, ratio)
+        target = max(int(len(mesh.faces) * ratio), MIN_LOD_TRIANGLES)
+        assert 0 < len(reduced.faces) <= target
+        lo, hi = mesh.bounds()
+        r_lo, r_hi = reduced.bounds()
+        assert np.all(r_lo >= lo - 1e-9) and np.all(r_hi <= hi + 1e-9)
+
+def test_decimate_keeps_small_meshes():
+    mesh = sphere_mesh(60)
+    assert decimate(mesh, 0.1) is mesh
+
+def test_lod_in_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cots").mkdir()
+    write_stl(str(tmp_path / "cots" / "ball.stl"), sphere_mesh())
+    path = lod_path("cots/ball.stl", 0.1)
+    assert os.path.isabs(path) and path.startswith(str(tmp_path / "cache" / "stl" / "lod"))
+    # nothing is written next to the asset
+    assert os.listdir(tmp_path / "cots") == ["ball.stl"]
+    assert len(load_stl(path).faces) <= max(int(len(load_stl("cots/ball.stl").faces) * 0.1), MIN_LOD_TRIANGLES)
+    assert lod_path("cots/ball.stl", 0.1) == path
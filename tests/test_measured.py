@@ -0,0 +1,85 @@
+import numpy as np
+
+from solid import import_stl, translate, rotate, cube
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Component, Assembly, bounds_cache, component_cache
+from pyMDA.parts.stl import StlMesh, write_stl
+
+#
+# Bounds of STL-based parts
+#
+
+def write_box(path, size):
+    """An STL of a box from the origin to size."""
+    corners = np.array([[x, y, z] for x in (0, size[0]) for y in (0, size[1]) for z in (0, size[2])], dtype = float)
+    faces = [[0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+             [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]]
+    write_stl(str(path), StlMesh(corners, np.array(faces)))
+    return str(path)
+
+class Stock(Component):
+    """A COTS part placed from its STL, declaring no size like the stock parts."""
+
+    creates = 0
+
+    def __init__(self, filename, position = (0, 0, 0), rotation = (0, 0, 0)):
+        super().__init__()
+        self.config = {'file': filename, 'position': position, 'rotation': rotation}
+
+    def create(self):
+        Stock.creates += 1
+        return translate(self.config['position']) (rotate(self.config['rotation']) (import_stl(self.config['file'])))
+
+def test_measured_from_the_import(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    part = Stock(write_box(tmp_path / "box.stl", (10, 20, 30)), position = (5, 0, 0))
+    assert part.is_bounded()
+    assert np.allclose(part.measured_bounds(), ((5, 0, 0), (15, 20, 30)))
+    assert (part.get_width(), part.get_length(), part.get_height()) == (10, 20, 30)
+    assert np.allclose(part.get_origin(), (10, 10, 15))
+
+def test_quarter_turns(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    part = Stock(write_box(tmp_path / "box.stl", (10, 20, 30)), rotation = (90, 0, 0))
+    assert np.allclose(part.measured_bounds(), ((0, -30, 0), (10, 0, 20)))
+
+def test_measured_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    bounds_cache.clear()
+    component_cache.clear()
+    filename = write_box(tmp_path / "box.stl", (10, 10, 10))
+    Stock.creates = 0
+    part = Stock(filename)
+    part.get_width()
+    part.get_length()
+    Stock(filename).get_bounds()
+    assert Stock.creates == 1
+
+def test_declared_sizes_win(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    part = Stock(write_box(tmp_path / "box.stl", (10, 10, 10)))
+    part.bounding_box = {'width': 1, 'length': 2, 'height': 3}
+    assert part.measured_bounds() is None
+    assert part.get_width() == 1
+
+def test_unmeasurable_parts(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    missing = Stock(str(tmp_path / "missing.stl"))
+    assert missing.measured_bounds() is None and not missing.is_bounded()
+    # a part without imports is left alone too
+    class Plain(Component):
+        def create(self):
+            return cube(5)
+    assert Plain().measured_bounds() is None and not Plain().is_bounded()
+
+def test_stacking_stock_parts(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    a = Assembly()
+    a.add('motor', Stock(write_box(tmp_path / "motor.stl", (40, 40, 60))))
+    a.add('board', Stock(write_box(tmp_path / "board.stl", (50, 30, 2))))
+    a.add('cube', Cube(10, 10, 10))
+    a.stack_x(5)
+    assert a.get_item_bounds('board')[0][0] == 45
+    assert a.get_item_bounds('cube')[0][0] == 100
+    assert a.find_interferences() == []
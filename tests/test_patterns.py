@@ -0,0 +1,57 @@
+import re
+
+from pyMDA.parts import Cylinder
+from pyMDA.parts.core import Assembly
+from pyMDA.parts.export import scad_render_modules
+
+#
+# Instanced patterns (see Assembly.add_pattern())
+#
+
+def two_patterns():
+    a = Assembly()
+    pin = Cylinder(1, 5)
+    a.add_pattern('row1', pin, 'linear', 10, pitch = (3, 0, 0))
+    a.add_pattern('row2', pin, 'linear', 10, pitch = (4, 0, 0), position = (0, 20, 0))
+    return a
+
+def test_modules_bind_no_loop_variables():
+    scad = scad_render_modules(two_patterns().assemble())
+    modules = re.findall(r"module \w+\(\) \{(.*?)\n\}", scad, re.S)
+    assert modules
+    assert not any(re.search(r"\bm\b", body) for body in modules)
+    # the copies are still placed by the loop variable at the call site
+    assert scad.count("multmatrix(m = m)") == 2
+
+def test_render_cost_counts_copies():
+    from solid import cylinder
+    from pyMDA.parts.render_cost import estimate_render_cost
+    from pyMDA.parts.transforms import pattern_matrices, place_instances
+
+    pin = cylinder(r = 5, h = 10, segments = 64)
+    def root(count, loop = True):
+        return estimate_render_cost(place_instances(pattern_matrices('linear', count, (20, 0, 0)), pin, loop))[-1]
+
+    one, two, many = root(1), root(2), root(100)
+    assert (one.facets, one.total) == (66, 0)
+    assert two.facets == 2 * 66 and two.total > 0
+    assert many.facets == 100 * 66 and many.total > 50 * two.total
+    # the same estimate as a union of the copies
+    union_of_copies = root(100, loop = False)
+    assert (many.facets, many.total) == (union_of_copies.facets, union_of_copies.total)
+
+def test_mesh_of_loop():
+    import numpy as np
+    from pyMDA.parts.mesh import mesh_from_model, model_bounds
+
+    model = two_patterns().assemble()
+    lo, hi = model_bounds(model)
+    assert np.allclose(lo, [-0.5, -0.5, -2.5]) and np.allclose(hi, [36.5, 20.5, 2.5])
+
+    unrolled = Assembly()
+    unrolled.add_pattern('row', Cylinder(1, 5), 'linear', 10, pitch = (3, 0, 0), loop = False)
+    looped = Assembly()
+    looped.add_pattern('row', Cylinder(1, 5), 'linear', 10, pitch = (3, 0, 0))
+    a, b = mesh_from_model(unrolled.assemble()), mesh_from_model(looped.assemble())
+    assert len(a) == len(b) == 10 * len(mesh_from_model(Cylinder(1, 5).build()))
+    assert np.allclose(a.triangles, b.triangles)
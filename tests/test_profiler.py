@@ -0,0 +1,54 @@
+import pytest
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Component, Assembly, component_cache
+from pyMDA.parts.profiler import profiler, tree_stats
+
+#
+# Build profiler
+#
+
+class Broken(Component):
+
+    def create(self):
+        raise RuntimeError("broken part")
+
+@pytest.fixture
+def profiling():
+    component_cache.clear()
+    profiler.reset()
+    profiler.enabled = True
+    yield profiler
+    profiler.enabled = False
+    profiler.reset()
+
+def test_records_classes_and_paths(profiling):
+    inner = Assembly()
+    inner.add('cube', Cube(1, 2, 3))
+    outer = Assembly()
+    outer.add('inner', inner)
+    outer.add('cube', Cube(4, 5, 6))
+    model = outer.assemble()
+    assert set(profiling.paths) == {'inner', 'inner/cube', 'cube'}
+    assert profiling.classes['Cube']['calls'] == 2
+    assert profiling.classes['Assembly']['calls'] == 2
+    assert profiling.paths['inner']['nodes'] < tree_stats(model)['nodes']
+    # a sub-assembly's time includes its items'
+    assert profiling.paths['inner']['time'] >= profiling.paths['inner/cube']['time']
+
+def test_failing_create(profiling):
+    a = Assembly()
+    a.add('cube', Cube(1, 1, 1))
+    a.add('broken', Broken())
+    with pytest.raises(RuntimeError):
+        a.assemble()
+    assert profiling._timers == [] and profiling._path == []
+    assert 'broken' not in profiling.paths
+
+    # later builds are timed under their own paths
+    b = Assembly()
+    b.add('other', Cube(2, 2, 2))
+    b.assemble()
+    assert 'other' in profiling.paths
+    assert not any(p.startswith('broken/') for p in profiling.paths)
+    assert profiling._timers == [] and profiling._path == []
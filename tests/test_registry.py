@@ -0,0 +1,52 @@
+import os
+import sys
+import inspect
+import subprocess
+import importlib
+import pytest
+
+import pyMDA.parts as parts
+from pyMDA.parts.core import Component, Assembly
+
+#
+# Parts registry (pyMDA.parts.PARTS)
+#
+
+def test_parts_resolve():
+    for name, module in parts.PARTS.items():
+        cls = getattr(parts, name)
+        # a few parts (BezierCurve, CamProfile) only have the create() of a Component
+        assert inspect.isclass(cls) and callable(getattr(cls, 'create', None)), name
+        assert cls.__module__ == "pyMDA.parts." + module, name
+
+def test_parts_complete():
+    # every part class defined in the registered modules is listed
+    for module in set(parts.PARTS.values()):
+        m = importlib.import_module("pyMDA.parts." + module)
+        for name, cls in vars(m).items():
+            if inspect.isclass(cls) and cls.__module__ == m.__name__ and not name.startswith('_') and issubclass(cls, (Component, Assembly)):
+                assert parts.PARTS.get(name) == module, "%s.%s is not in PARTS" % (module, name)
+
+def test_unknown_part():
+    with pytest.raises(AttributeError):
+        parts.NoSuchPart
+
+#
+# Import time - see own_import_time() in benchmark.py
+#
+
+def test_import_skips_heavy_modules():
+    code = ("import sys, solid, solid.utils; before = set(sys.modules); "
+            "import pyMDA.parts; pyMDA.parts.Cube; print(' '.join(set(sys.modules) - before))")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+    loaded = set(subprocess.run([sys.executable, "-c", code], capture_output = True, text = True,
+                                check = True, env = env).stdout.split())
+    assert "pyMDA.parts.geometry" in loaded
+    for name in ("numpy", "hashlib", "json", "subprocess", "pyMDA.parts.mesh", "pyMDA.parts.gears"):
+        assert name not in loaded, name
+
+def test_import_time():
+    from pyMDA.benchmark import own_import_time
+    # a few ms, the budget leaves room for slow machines
+    assert own_import_time(repeat = 7) < 0.015
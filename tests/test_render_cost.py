@@ -0,0 +1,28 @@
+from solid import cube, sphere, cylinder, union, difference, translate
+
+from pyMDA.parts.render_cost import estimate_render_cost
+
+#
+# Render cost estimation
+#
+
+def test_boolean_cost():
+    costs = estimate_render_cost(difference()(cube(10), cylinder(r = 2, h = 20, segments = 16)))
+    root = costs[-1]
+    assert root.facets == 6 + 18
+    assert root.cost == root.total == 6 + 18
+
+def test_shared_subtree_counted_once():
+    shared = union()(cube(10), sphere(r = 5, segments = 16))
+    shared_cost = estimate_render_cost(shared)[-1]
+    assert shared_cost.cost > 0
+
+    root = union()(translate([20, 0, 0])(shared), translate([40, 0, 0])(shared), cube(1))
+    costs = estimate_render_cost(root)
+    assert sum(1 for c in costs if c.node is shared) == 1
+    top = costs[-1]
+    assert top.total == top.cost + shared_cost.cost
+    # each parent holding the subtree counts it, once
+    for c in costs:
+        if c.node.name == 'translate':
+            assert c.total == shared_cost.cost
@@ -0,0 +1,77 @@
+import math
+import numpy as np
+
+from pyMDA.parts import CubeCurvedEdges, CubeCurvedSides, PlateWithFillets
+from pyMDA.parts.rounded import rounded_box, rounded_rectangle, rounded_prism
+from pyMDA.parts.hull import resolve_hulls
+from pyMDA.parts.tree import postorder
+from pyMDA.tests.meshes import open_edges, signed_volume, polyhedron_mesh
+
+#
+# Rounded boxes and plates
+#
+
+def rounded_box_volume(size, r):
+    a, b, c = (s - 2.0 * r for s in size)
+    return a * b * c + 2.0 * r * (a * b + a * c + b * c) + math.pi * r * r * (a + b + c) + 4.0 / 3.0 * math.pi * r ** 3
+
+def check_polyhedron(node, lo, hi):
+    points, faces = polyhedron_mesh(node)
+    assert not open_edges(faces)
+    # clockwise seen from outside, as OpenSCAD expects
+    volume = -signed_volume(points, faces)
+    assert volume > 0
+    assert np.allclose(points.min(axis = 0), lo) and np.allclose(points.max(axis = 0), hi)
+    return volume
+
+def test_rounded_box():
+    for size, r, segments in (([10, 20, 30], 2, 32), ([10, 10, 10], 5, 16), ([40, 4, 8], 1.5, 5), ([10, 20, 30], 2, 4)):
+        half = np.array(size) / 2.0
+        volume = check_polyhedron(rounded_box(size, r, segments), -half, half)
+        assert volume <= rounded_box_volume(size, r) + 1e-9
+        if segments >= 32:
+            assert volume > 0.99 * rounded_box_volume(size, r)
+    check_polyhedron(rounded_box([10, 20, 30], 2, 16, center = False), [0, 0, 0], [10, 20, 30])
+
+def test_rounded_box_without_radius():
+    assert rounded_box([10, 20, 30], 0, 16).name == 'cube'
+
+def test_rounded_rectangle():
+    outline = rounded_rectangle([10, 20], [0, 2, 5, 1], 16)
+    x, y = outline[:, 0], outline[:, 1]
+    # counter-clockwise
+    assert 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y) > 0
+    assert np.allclose(outline.min(axis = 0), [-5, -10]) and np.allclose(outline.max(axis = 0), [5, 10])
+    # the corner without a radius is kept
+    assert [5, 10] in outline.tolist()
+
+def test_rounded_prism():
+    for radii in (2, [0, 2, 5, 1], [0, 0, 0, 0], 5):
+        outline = rounded_rectangle([10, 20], radii, 16)
+        x, y = outline[:, 0], outline[:, 1]
+        area = 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        volume = check_polyhedron(rounded_prism([10, 20, 3], radii, 16), [-5, -10, -1.5], [5, 10, 1.5])
+        assert abs(volume - 3.0 * area) < 1e-9
+
+def hull_volume(part):
+    # the hull() version, resolved to its polyhedron
+    points, faces = polyhedron_mesh(next(n for n in postorder(resolve_hulls(part.create())) if n.name == 'polyhedron'))
+    return -signed_volume(points, faces)
+
+def test_same_shape_as_hulls():
+    edges = CubeCurvedEdges(10, 20, 30, 3, use_polyhedron = True)
+    volume = check_polyhedron(edges.create(), [-5, -10, -15], [5, 10, 15])
+    assert abs(volume - hull_volume(CubeCurvedEdges(10, 20, 30, 3))) < 0.02 * volume
+    sides = CubeCurvedSides(10, 20, 30, 3, 4, use_polyhedron = True)
+    volume = check_polyhedron(sides.create(), [-5, -10, -15], [5, 10, 15])
+    assert abs(volume - hull_volume(CubeCurvedSides(10, 20, 30, 3, 4))) < 0.02 * volume
+    sides = CubeCurvedSides(10, 20, 30, 3, 2, use_polyhedron = True)
+    volume = -signed_volume(*polyhedron_mesh(sides.create().children[0]))
+    assert abs(volume - hull_volume(CubeCurvedSides(10, 20, 30, 3, 2))) < 0.02 * volume
+
+def test_plate_with_fillets():
+    config = {'width': 40, 'length': 20, 'thickness': 3, 'fillet_radius': 4}
+    plate = PlateWithFillets(config, use_polyhedron = True)
+    volume = check_polyhedron(plate.create(), [-20, -10, -1.5], [20, 10, 1.5])
+    assert abs(volume - 3.0 * (40 * 20 - (4 - math.pi) * 16)) < 0.02 * volume
+    assert PlateWithFillets(config).create().name != 'polyhedron'
@@ -0,0 +1,69 @@
+import pytest
+
+from solid import scad_render, import_scad
+
+from pyMDA.parts import cache
+from pyMDA.parts.cache import ScadLibrary, scad_callables, package_path
+
+#
+# SCAD libraries parsed on first use
+#
+
+LIBRARY = """
+module plate(w, l = 2) { cube([w, l, 1]); }
+function half(x) = x / 2;
+"""
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "lib.scad"
+    path.write_text(LIBRARY)
+    return str(path)
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Files passed to parse_scad_callables()."""
+    files = []
+    parse = cache.parse_scad_callables
+    def counting(filename):
+        files.append(filename)
+        return parse(filename)
+    monkeypatch.setattr(cache, 'parse_scad_callables', counting)
+    return files
+
+def test_parsed_on_first_use(library, parses):
+    lib = ScadLibrary(library)
+    assert parses == []
+    scad = scad_render(lib.plate(5, l = 3))
+    assert "use <%s>" % library in scad and "plate(" in scad
+    lib.plate(1)
+    assert parses == [library]
+    with pytest.raises(AttributeError):
+        lib._private
+
+def test_parse_cached_on_disk(library, parses):
+    first = scad_callables(library)
+    assert {c['name'] for c in first} == {'plate', 'half'}
+    # a new process (or library) reads the cache
+    assert ScadLibrary(library).plate
+    assert scad_callables(library) == first
+    assert len(parses) == 1
+    # an edited file is a new entry
+    with open(library, 'a') as f:
+        f.write("module disc(r) { cylinder(r = r, h = 1); }\n")
+    assert {c['name'] for c in scad_callables(library)} == {'plate', 'half', 'disc'}
+    assert len(parses) == 2
+
+def test_missing_file(tmp_path):
+    lib = ScadLibrary(str(tmp_path / "missing.scad"))
+    with pytest.raises(ValueError):
+        lib.plate
+
+def test_gears_match_import_scad(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    from pyMDA.parts.gears import Gears
+    assert Gears.path == package_path("cots", "gears", "gears.scad")
+    args = dict(modul = 1, tooth_number = 20, width = 5, bore = 3, pressure_angle = 20, helix_angle = 0, optimized = False)
+    expected = import_scad(Gears.path).spur_gear(**args)
+    assert scad_render(Gears.spur_gear(**args)) == scad_render(expected)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from solid import cube
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Component, Assembly, component_cache
+from pyMDA.parts.tree import postorder
+from pyMDA.parts.transforms import plane_basis
+
+#
+# Cross sections
+#
+
+class Counted(Component):
+    """A 2 mm cube counting its create() calls."""
+
+    built = []
+
+    def __init__(self, name):
+        super().__init__()
+        self.config = {'name': name}
+        self.bounding_box = {'width': 2, 'length': 2, 'height': 2}
+
+    def create(self):
+        Counted.built.append(self.config['name'])
+        return cube(2, center = True)
+
+def counted_row(names, spacing = 10):
+    a = Assembly()
+    for i, name in enumerate(names):
+        a.add(name, Counted(name), position = (spacing * i, 0, 0))
+    return a
+
+def test_only_crossing_items_are_built():
+    component_cache.clear()
+    Counted.built = []
+    a = counted_row(['a', 'b', 'c', 'd'])
+    model = a.cross_section_view('x', 10)
+    assert Counted.built == ['b']
+    assert model.name == 'intersection'
+    part, slab = model.children
+    # the slab is a box in assembly coordinates, covering the bounds plus the margin
+    assert slab.name == 'translate' and slab.params['v'] == [9.0, -2.0, -2.0]
+    assert slab.children[0].params['size'] == [2.0, 4.0, 4.0]
+
+def test_sub_assemblies_are_culled():
+    component_cache.clear()
+    Counted.built = []
+    outer = Assembly()
+    outer.add('near', counted_row(['n0', 'n1', 'n2']), position = (0, 0, 0))
+    outer.add('far', counted_row(['f0', 'f1', 'f2']), position = (0, 50, 0))
+    outer.cross_section_view('y', 0)
+    assert sorted(Counted.built) == ['n0', 'n1', 'n2']
+    component_cache.clear()
+    Counted.built = []
+    outer.cross_section_view('x', 20)
+    assert sorted(Counted.built) == ['f2', 'n2']
+
+def test_assemble_only():
+    component_cache.clear()
+    Counted.built = []
+    outer = Assembly()
+    outer.add('row', counted_row(['r0', 'r1']))
+    outer.add('single', Counted('s'))
+    model = outer.assemble(['row/r1'])
+    assert Counted.built == ['r1']
+    assert sum(1 for n in postorder(model) if n.name == 'cube') == 1
+
+def test_oblique_section():
+    component_cache.clear()
+    Counted.built = []
+    a = counted_row(['a', 'b', 'c'])
+    model = a.cross_section_view((1, 1, 0), 10 / 2 ** 0.5)
+    assert Counted.built == ['b']
+    # the slab is turned into the plane by a single multmatrix
+    assert model.children[1].name == 'multmatrix'
+
+def test_plane_basis():
+    assert [list(v) for v in plane_basis('y')] == [[1, 0, 0], [0, 0, 1]]
+    normal = np.array([1.0, 2.0, 3.0]) / 14 ** 0.5
+    u, v = plane_basis(normal)
+    assert np.allclose([u @ u, v @ v, u @ v, u @ normal, v @ normal], [1, 1, 0, 0, 0])
+    assert np.allclose(np.cross(u, v), normal)
+
+def test_outline():
+    a = Assembly()
+    a.add('box', Cube(4, 6, 8), position = (0, 0, 4))
+    a.add('turned', Cube(2, 2, 2), position = (10, 0, 1), rotation = (0, 0, 45))
+    a.add('above', Cube(2, 2, 2), position = (0, 0, 20))
+    outlines = a.cross_section_outline('z', 1)
+    assert set(outlines) == {'box', 'turned'}
+    assert sorted(outlines['box']) == [(-2, -3), (-2, 3), (2, -3), (2, 3)]
+    # the turned cube cuts as a diamond
+    r = 2 ** 0.5
+    assert np.allclose(sorted(outlines['turned']), [(10 - r, 0), (10, -r), (10, r), (10 + r, 0)])
+
+def test_outline_of_sub_assemblies():
+    inner = Assembly()
+    inner.add('box', Cube(2, 2, 2))
+    outer = Assembly()
+    outer.add('left', inner, position = (-5, 0, 0))
+    outer.add('right', inner, position = (5, 0, 0), rotation = (90, 0, 0))
+    outlines = outer.cross_section_outline('y', 0)
+    assert set(outlines) == {'left/box', 'right/box'}
+    # (x, z) coordinates for a cut along y
+    assert np.allclose(sorted(outlines['right/box']), [(4, -1), (4, 1), (6, -1), (6, 1)])
@@ -0,0 +1,76 @@
+import os
+import sys
+import subprocess
+from solid import cylinder, sphere, circle, square, offset, translate, rotate_extrude
+
+from pyMDA.parts import Cylinder, Sphere, CubeCurvedEdges
+from pyMDA.parts.core import Component, component_cache, quality, get_resolution
+from pyMDA.parts.tree import postorder
+from pyMDA.parts.quality import resolve_segments
+
+#
+# Segment counts of round primitives (see Component.segments_for())
+#
+
+ROUND = ('cylinder', 'sphere', 'circle')
+
+def round_nodes(model):
+    return [n for n in postorder(model) if n.name in ROUND]
+
+def test_create_resolves_segments():
+    for part in (Cylinder(10, 20), Sphere(8), CubeCurvedEdges(10, 20, 30, 2)):
+        nodes = round_nodes(part.create())
+        assert nodes
+        assert all(n.params.get('segments') is not None for n in nodes), type(part).__name__
+
+def test_build_resolves_segments():
+    component_cache.clear()
+    nodes = round_nodes(Cylinder(10, 20).build())
+    assert [n.params['segments'] for n in nodes] == [get_resolution().segments(5)]
+
+def test_segments_follow_quality():
+    counts = {}
+    for q in ('draft', 'export'):
+        with quality(q):
+            counts[q] = round_nodes(Cylinder(10, 20).create())[0].params['segments']
+    assert counts['draft'] < counts['export']
+
+def test_set_segment_count():
+    part = Sphere(8)
+    part.set_segment_count(12)
+    assert [n.params['segments'] for n in round_nodes(part.create())] == [12]
+
+def test_plain_create_is_resolved():
+    # a subclass's create() is wrapped when the class is defined
+    class Peg(Component):
+        def create(self):
+            return cylinder(r = 2, h = 10, segments = self.segments_count) + sphere(r = 3, segments = self.segments_count)
+    assert all(n.params['segments'] for n in round_nodes(Peg().create()))
+
+def test_resolved_trees_are_kept():
+    tree = Cylinder(10, 20).create()
+    assert resolve_segments(tree) is tree
+    # a part's resolved tree isn't copied again by the part holding it
+    outer = resolve_segments(translate([1, 0, 0])(tree, sphere(r = 3)))
+    assert outer.children[0] is tree
+    assert outer.children[1].params['segments'] == get_resolution().segments(3)
+    # a node added to the root afterwards is resolved
+    tree.add(sphere(r = 4))
+    again = resolve_segments(tree)
+    assert again is not tree and all(n.params.get('segments') for n in round_nodes(again))
+
+def test_rotate_extrude_radius():
+    profile = rotate_extrude()(translate([10, 0])(circle(r = 2)), translate([3, 0])(square([4, 4])))
+    assert resolve_segments(profile).params['segments'] == get_resolution().segments(12)
+    # operations the parameters can't tell are left to OpenSCAD's defaults
+    assert resolve_segments(rotate_extrude()(offset(r = 1)(circle(r = 2)))).params.get('segments') is None
+
+def test_rotate_extrude_without_numpy():
+    code = ("import sys; from solid import rotate_extrude, circle, translate; "
+            "from pyMDA.parts.quality import resolve_segments; "
+            "resolve_segments(rotate_extrude()(translate([10, 0])(circle(r = 2)))); "
+            "print('numpy' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+    out = subprocess.run([sys.executable, "-c", code], capture_output = True, text = True, check = True, env = env)
+    assert out.stdout.strip() == "False"
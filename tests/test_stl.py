@@ -0,0 +1,92 @@
+import json
+import pytest
+import numpy as np
+
+from pyMDA.parts import stl
+from pyMDA.parts.stl import StlMesh, load_stl, write_stl, stl_info, build_stl_cache
+from pyMDA.parts.cache import file_hash, flush_file_hashes, _read_hash_index
+
+#
+# STL loading and the mesh caches
+#
+
+TETRAHEDRON = StlMesh(np.array([[0.0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]]),
+                      np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]]))
+
+def write_tetrahedron(path, scale = 1.0):
+    write_stl(str(path), StlMesh(TETRAHEDRON.vertices * scale, TETRAHEDRON.faces))
+    return str(path)
+
+def test_cached_mesh_matches_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    path = write_tetrahedron(tmp_path / "t.stl")
+    parsed = load_stl(path, cached = False)
+    stl.clear_stl_cache()
+    cached = load_stl(path)
+    assert np.array_equal(np.sort(parsed.triangles(), axis = 0), np.sort(cached.triangles(), axis = 0))
+    info = stl_info(path)
+    assert info["triangles"] == 4 and info["vertices"] == 4
+    assert abs(info["volume"] - 1000.0 / 6.0) < 1e-6
+
+def test_loaded_meshes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(stl._meshes, "max_size", 3)
+    stl.clear_stl_cache()
+    for i in range(5):
+        load_stl(write_tetrahedron(tmp_path / ("t%d.stl" % i), i + 1.0))
+    assert len(stl._meshes) == 3
+
+def test_hash_index_is_merged(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    a = write_tetrahedron(tmp_path / "a.stl")
+    b = write_tetrahedron(tmp_path / "b.stl", 2.0)
+    file_hash(a)
+    flush_file_hashes()
+    # an entry written by another process in the meantime is kept
+    index = _read_hash_index()
+    index["elsewhere"] = [0, 0, "0" * 64]
+    (tmp_path / "cache" / "hashes.json").write_text(json.dumps(index))
+    file_hash(b)
+    flush_file_hashes()
+    assert {"elsewhere", str(tmp_path / "a.stl"), str(tmp_path / "b.stl")} <= set(_read_hash_index())
+
+def test_build_stl_cache_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYMDA_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "assets"
+    (root / ".hidden").mkdir(parents = True)
+    for i in range(3):
+        write_tetrahedron(root / ("t%d.stl" % i), i + 1.0)
+    write_tetrahedron(root / ".hidden" / "t0-reduced.stl")
+    manifest = build_stl_cache(str(root), workers = 2)
+    assert len(manifest["assets"]) == 3
+    assert {str(root / ("t%d.stl" % i)) for i in range(3)} <= set(_read_hash_index())
+
+def test_binary_with_trailing_bytes(tmp_path):
+    path = write_tetrahedron(tmp_path / "t.stl")
+    with open(path, 'ab') as f:
+        f.write(b'\0' * 7)
+    assert len(stl.read_stl_triangles(path)) == 4
+
+def test_binary_header_starting_with_solid(tmp_path):
+    path = write_tetrahedron(tmp_path / "t.stl")
+    data = bytearray(open(path, 'rb').read())
+    data[:11] = b'solid part\n'
+    open(path, 'wb').write(bytes(data) + b'\0' * 3)
+    assert len(stl.read_stl_triangles(path)) == 4
+
+def test_ascii_any_case(tmp_path):
+    facets = "".join("FACET NORMAL 0 0 1\n OUTER LOOP\n%s ENDLOOP\nENDFACET\n" %
+                     "".join("  VERTEX %g %g %g\n" % tuple(v) for v in TETRAHEDRON.vertices[f])
+                     for f in TETRAHEDRON.faces)
+    path = tmp_path / "t.stl"
+    path.write_text("SOLID t\n%sENDSOLID t\n" % facets.replace(" 10", " 1.0E+01"))
+    triangles = stl.read_stl_triangles(str(path))
+    assert np.array_equal(triangles, TETRAHEDRON.triangles())
+
+def test_no_triangles(tmp_path):
+    for name, data in (("ascii.stl", b"solid t\nendsolid t\n"), ("binary.stl", b"\0" * 84 + b"\0" * 10),
+                       ("garbage.stl", b"not an stl file at all")):
+        path = tmp_path / name
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            stl.read_stl_triangles(str(path))
@@ -0,0 +1,59 @@
+import math
+import numpy as np
+
+from pyMDA.parts import PolylineRound
+from pyMDA.parts.sweep import tube
+from pyMDA.parts.hull import resolve_hulls
+from pyMDA.parts.tree import postorder
+from pyMDA.tests.meshes import open_edges, signed_volume, polyhedron_mesh
+
+#
+# Tubes swept along a path
+#
+
+def check_tube(node):
+    points, faces = polyhedron_mesh(node)
+    assert not open_edges(faces)
+    # clockwise seen from outside, as OpenSCAD expects
+    volume = -signed_volume(points, faces)
+    assert volume > 0
+    return points, volume
+
+def test_straight_tube():
+    r, length = 2.0, 30.0
+    points, volume = check_tube(tube([[0, 0, 0], [0, 0, length]], r, 32))
+    # round ends out to their poles
+    assert np.isclose(points[:, 2].min(), -r) and np.isclose(points[:, 2].max(), length + r)
+    assert np.allclose(np.hypot(points[:, 0], points[:, 1]).max(), r)
+    exact = math.pi * r * r * length + 4.0 / 3.0 * math.pi * r ** 3
+    assert 0.97 * exact < volume <= exact
+
+def test_bent_tube():
+    path = [[0, 0, 0], [20, 0, 0], [20, 20, 0], [20, 20, 20], [0, 20, 20]]
+    points, volume = check_tube(tube(path, 1.5, 16))
+    assert np.allclose(points.min(axis = 0), [-1.5, -1.5, -1.5], atol = 1e-9)
+    assert np.allclose(points.max(axis = 0), [21.5, 21.5, 21.5], atol = 1e-9)
+    # the mitred rings keep the wall thickness, so the volume is about that of the straight lengths
+    assert abs(volume - math.pi * 1.5 ** 2 * 80) < 0.05 * volume
+
+def test_closed_tube():
+    square = [[0, 0, 0], [20, 0, 0], [20, 20, 0], [0, 20, 0]]
+    for path in (square, square + square[:1]):
+        _, volume = check_tube(tube(path, 1.0, 12, closed = True))
+        assert abs(volume - math.pi * 80) < 0.1 * volume
+
+def test_smooth_closed_tube():
+    a = np.linspace(0, 2 * np.pi, 64, endpoint = False)
+    # a path out of plane, where frames twist
+    path = np.column_stack([20 * np.cos(a), 20 * np.sin(a), 5 * np.sin(3 * a)])
+    check_tube(tube(path, 2.0, 16, closed = True))
+
+def test_repeated_points():
+    check_tube(tube([[0, 0, 0], [0, 0, 0], [10, 0, 0], [10, 0, 0], [10, 10, 0]], 1.0, 8))
+    assert tube([[1, 2, 3], [1, 2, 3]], 1.0, 8).name == 'translate'
+
+def test_same_shape_as_hulls():
+    pts = [[0, 0, 0], [10, 20, 5]]
+    _, volume = check_tube(PolylineRound(pts, 2.0, use_polyhedron = True).create())
+    hull = next(n for n in postorder(resolve_hulls(PolylineRound(pts, 2.0).create())) if n.name == 'polyhedron')
+    assert abs(volume + signed_volume(*polyhedron_mesh(hull))) < 0.03 * volume
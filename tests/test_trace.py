@@ -0,0 +1,91 @@
+import json
+import threading
+
+import pytest
+
+from solid import cube
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Assembly, component_cache, export_model
+from pyMDA.parts.trace import tracer, traced
+
+#
+# Build tracing
+#
+
+@pytest.fixture
+def tracing():
+    tracer.clear()
+    tracer.enabled = True
+    yield tracer
+    tracer.enabled = False
+    tracer.clear()
+
+def spans(name):
+    return [e for e in tracer.events if e['name'] == name]
+
+def test_disabled():
+    tracer.clear()
+    with tracer.span("nothing"):
+        pass
+    assert tracer.events == []
+
+def test_nested_spans(tracing):
+    with tracer.span("outer", "test", n = 1):
+        with tracer.span("inner", "test"):
+            pass
+    (inner,), (outer,) = spans("inner"), spans("outer")
+    assert outer['ph'] == 'X' and outer['cat'] == 'test' and outer['args'] == {'n': 1}
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+def test_span_of_a_failure(tracing):
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError()
+    assert len(spans("failing")) == 1
+
+def test_threads(tracing):
+    def work():
+        with tracer.span("work"):
+            pass
+    thread = threading.Thread(target = work, name = "worker")
+    thread.start()
+    thread.join()
+    with tracer.span("main"):
+        pass
+    (work_span,), (main_span,) = spans("work"), spans("main")
+    assert work_span['tid'] != main_span['tid'] and work_span['pid'] == main_span['pid']
+    names = {e['tid']: e['args']['name'] for e in tracer.to_dict()['traceEvents'] if e['ph'] == 'M'}
+    assert names[work_span['tid']] == "worker"
+
+def test_traced(tracing):
+    @traced
+    def build_thing(x):
+        return x + 1
+    assert build_thing(1) == 2
+    assert build_thing.__name__ == "build_thing"
+    assert spans("build_thing")[0]['cat'] == "build"
+    tracer.enabled = False
+    build_thing(2)
+    assert len(spans("build_thing")) == 1
+
+def test_pipeline(tracing, tmp_path):
+    component_cache.clear()
+    a = Assembly()
+    a.add('cube', Cube(1, 2, 3))
+    model = a.assemble()
+    export_model(model, str(tmp_path / "model.scad"))
+    assert len(spans("assemble")) == 1 and spans("assemble")[0]['args'] == {'items': 1}
+    assert len(spans("Cube")) == 1 and spans("Cube")[0]['cat'] == "create"
+    assert spans("write")[0]['args'] == {'file': str(tmp_path / "model.scad")}
+    assert spans("serialize")
+
+def test_write(tracing, tmp_path):
+    with tracer.span("step"):
+        cube(1)
+    filename = tmp_path / "trace.json"
+    tracer.write(str(filename))
+    with open(filename) as f:
+        data = json.load(f)
+    assert data['displayTimeUnit'] == "ms"
+    assert [e['name'] for e in data['traceEvents'] if e['ph'] == 'X'] == ["step"]
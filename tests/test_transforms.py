@@ -0,0 +1,66 @@
+import numpy as np
+
+from pyMDA.parts import Cube
+from pyMDA.parts.core import Assembly
+from pyMDA.parts.tree import postorder
+from pyMDA.parts.transforms import rotation_matrix, transform_matrix, transform_matrices, transform_points
+
+#
+# Assembly transforms as 4x4 matrices
+#
+
+def test_rotation_order():
+    # rotate([x, y, z]) turns about X first, then Y, then Z, as OpenSCAD does
+    assert np.allclose(transform_points(rotation_matrix([90, 0, 0]), [[0, 1, 0]]), [[0, 0, 1]])
+    assert np.allclose(transform_points(rotation_matrix([0, 90, 0]), [[1, 0, 0]]), [[0, 0, -1]])
+    assert np.allclose(transform_points(rotation_matrix([90, 90, 0]), [[0, 1, 0]]), [[1, 0, 0]])
+    assert np.allclose(transform_points(rotation_matrix([0, 90, 90]), [[0, 0, 1]]), [[0, 1, 0]])
+
+def test_vectorized_matrices():
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-50, 50, (20, 3))
+    rotations = rng.uniform(-180, 180, (20, 3))
+    batch = transform_matrices(positions, rotations)
+    for p, r, m in zip(positions, rotations, batch):
+        assert np.allclose(m, transform_matrix(p, r))
+
+def test_parent_chain():
+    a = Assembly()
+    a.add('base', Cube(1, 1, 1), position = (0, 5, 0), rotation = (0, 0, 90))
+    a.add('arm', Cube(1, 1, 1), position = (10, 0, 0), rotation = (90, 0, 0), parent = 'base')
+    a.add('tip', Cube(1, 1, 1), position = (0, 2, 0), parent = 'arm')
+    # arm's x runs along the base's y, tip's y along the arm's z (rotated to world -x)
+    assert np.allclose(a.world_matrix('arm')[:3, 3], [0, 15, 0])
+    assert np.allclose(a.world_matrix('tip')[:3, 3], [0, 15, 2])
+    assert np.allclose(a.world_matrix('tip'), transform_matrix((0, 5, 0), (0, 0, 90)) @ transform_matrix((10, 0, 0), (90, 0, 0)) @ transform_matrix((0, 2, 0)))
+
+def test_moving_a_parent_moves_its_children():
+    a = Assembly()
+    a.add('base', Cube(1, 1, 1))
+    a.add('arm', Cube(1, 1, 1), position = (10, 0, 0), parent = 'base')
+    assert np.allclose(a.world_matrix('arm')[:3, 3], [10, 0, 0])
+    a.items['base']['position'] = (0, 0, 7)
+    assert np.allclose(a.world_matrix('arm')[:3, 3], [10, 0, 7])
+
+def test_deep_chain():
+    a = Assembly()
+    parent = None
+    for i in range(200):
+        a.add('link%d' % i, Cube(1, 1, 1), position = (1, 0, 0), rotation = (0, 0, 1), parent = parent)
+        parent = 'link%d' % i
+    expected = np.linalg.matrix_power(transform_matrix((1, 0, 0), (0, 0, 1)), 200)
+    assert np.allclose(a.world_matrix(parent), expected)
+
+def test_one_multmatrix_per_item():
+    a = Assembly()
+    a.add('moved', Cube(1, 2, 3), position = (1, 2, 3), rotation = (10, 20, 30))
+    a.add('child', Cube(1, 2, 3), position = (4, 0, 0), parent = 'moved')
+    a.add('still', Cube(2, 2, 2))
+    moved, child, still = a.assemble().children
+    for node, name in ((moved, 'moved'), (child, 'child')):
+        assert node.name == 'multmatrix'
+        assert np.allclose(node.params['m'], a.world_matrix(name))
+        # the item's own tree directly below it
+        assert node.children[0].name == 'color'
+    assert still.name == 'color'
+    assert sum(1 for n in postorder(a.assemble()) if n.name in ('translate', 'rotate')) == 0